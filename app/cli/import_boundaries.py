@@ -0,0 +1,48 @@
+"""
+Load city / zone boundaries from a GeoJSON FeatureCollection.
+
+    python -m app.cli.import_boundaries zones.geojson --kind zone --city-id 12
+    python -m app.cli.import_boundaries cities.geojson --kind city --country-code IN
+"""
+import argparse
+import sys
+import time
+from dataclasses import asdict
+
+from app.core.database import SessionLocal
+from app.services.boundary_import_service import import_boundaries
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Import GeoJSON boundaries")
+    parser.add_argument("path", help="GeoJSON FeatureCollection file")
+    parser.add_argument("--kind", choices=["zone", "city"], required=True)
+    parser.add_argument("--city-id", type=int, help="default city for zone features")
+    parser.add_argument("--country-code", help="default country for city features")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        with open(args.path, encoding="utf-8") as fp:
+            result = import_boundaries(
+                db, fp, args.kind,
+                city_id=args.city_id,
+                country_code=args.country_code
+            )
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+
+    summary = asdict(result)
+    errors = summary.pop("errors")
+    print(f"{summary} in {time.perf_counter() - started:.1f}s")
+    for err in errors:
+        print(f"  feature {err['feature']}: {err['error']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
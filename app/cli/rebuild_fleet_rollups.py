@@ -0,0 +1,38 @@
+"""
+Backfill / rebuild the fleet analytics rollups (hourly + daily) from the
+trip and driver_shift tables, from a UTC day onwards. Completed trips
+without a driver_earning / platform_fee split get one first.
+
+    python -m app.cli.rebuild_fleet_rollups --since 2024-01-01
+    python -m app.cli.rebuild_fleet_rollups --since 2024-01-01 --fleet-id 12
+"""
+import argparse
+import sys
+import time
+from datetime import date, datetime, timezone
+
+from app.core.database import SessionLocal
+from app.services.fleet_analytics import rebuild_rollups
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Rebuild fleet analytics rollups")
+    parser.add_argument("--since", type=date.fromisoformat, required=True, help="UTC day, YYYY-MM-DD")
+    parser.add_argument("--fleet-id", type=int, help="default: all fleets")
+    args = parser.parse_args(argv)
+
+    since = datetime.combine(args.since, datetime.min.time(), tzinfo=timezone.utc)
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        written = rebuild_rollups(db, since, args.fleet_id)
+        db.commit()
+        print(f"{written} rollup rows rebuilt in {time.perf_counter() - started:.1f}s")
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,36 @@
+"""
+Backfill / rebuild the verification_queue counters from the document tables,
+then auto-approve every owner that is already fully verified.
+
+    python -m app.cli.rebuild_verification_queue
+    python -m app.cli.rebuild_verification_queue --entity-type driver
+"""
+import argparse
+import sys
+import time
+
+from app.core.database import SessionLocal
+from app.services.readiness_engine import RULES, rebuild_counters, sweep
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Rebuild the verification queue")
+    parser.add_argument("--entity-type", choices=sorted(RULES), help="default: all types")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        for entity_type in [args.entity_type] if args.entity_type else list(RULES):
+            started = time.perf_counter()
+            rebuild_counters(db, entity_type)
+            # owners whose docs were already fully approved before the queue existed
+            approved = sweep(db, entity_type)
+            db.commit()
+            print(f"{entity_type}: rebuilt in {time.perf_counter() - started:.1f}s, {len(approved)} auto-approved")
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
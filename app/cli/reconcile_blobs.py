@@ -0,0 +1,31 @@
+"""
+Recount stored_blob references from the document tables and delete the
+blobs (and their files / thumbnails) that no document points at any more,
+then remove blob files no stored_blob row claims (failed uploads).
+
+    python -m app.cli.reconcile_blobs
+"""
+import sys
+import time
+
+from app.core.database import SessionLocal
+from app.services.document_store import reconcile_blobs, remove_files, sweep_orphan_files
+
+
+def main(argv=None) -> int:
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        orphaned = reconcile_blobs(db)
+        db.commit()
+        # files go only once the rows are gone for good
+        remove_files(orphaned)
+        swept = sweep_orphan_files(db)
+        print(f"reconciled in {time.perf_counter() - started:.1f}s, {len(orphaned) + swept} files removed")
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
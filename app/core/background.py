@@ -0,0 +1,74 @@
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicWorker:
+    """
+    Daemon thread that runs `fn` every `interval_seconds`.
+    `last_heartbeat` is refreshed after every run (even failed ones),
+    so readiness checks can tell a stuck worker from a failing one.
+    """
+
+    def __init__(self, name: str, interval_seconds: float, fn: Callable[[], None]):
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self.fn = fn
+
+        self.last_heartbeat: Optional[float] = None
+        self.last_success: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"worker-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def is_alive(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.fn()
+                self.last_success = time.time()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)
+                logger.exception("Background worker %s failed", self.name)
+            self.last_heartbeat = time.time()
+            self._stop.wait(self.interval_seconds)
+
+
+_workers: dict[str, PeriodicWorker] = {}
+
+
+def register_worker(name: str, interval_seconds: float, fn: Callable[[], None]) -> PeriodicWorker:
+    worker = PeriodicWorker(name, interval_seconds, fn)
+    _workers[name] = worker
+    return worker
+
+
+def get_workers() -> dict[str, PeriodicWorker]:
+    return dict(_workers)
+
+
+def start_workers():
+    for worker in _workers.values():
+        worker.start()
+
+
+def stop_workers():
+    for worker in _workers.values():
+        worker.stop()
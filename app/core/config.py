@@ -5,8 +5,56 @@ class Settings(BaseSettings):
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    QUOTE_TOKEN_EXPIRE_MINUTES: int = 10
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30  # sliding: every refresh extends it
+
+    # stateless mode: tokens are trusted without a DB lookup, revocation
+    # comes from the in-memory set; bump the epoch to invalidate all tokens
+    AUTH_STATELESS: bool = False
+    AUTH_SESSION_EPOCH: int = 1
+    AUTH_REVOCATION_SYNC_SECONDS: int = 5
     super_admin_key: str
     UPLOAD_BASE : str = "uploads"
+    UPLOAD_MAX_BYTES: int = 10 * 1024 * 1024
+    UPLOAD_CHUNK_SIZE: int = 256 * 1024
+    THUMBNAIL_SIZE: int = 320  # px, longest side
+    THUMBNAIL_WORKERS: int = 2
+    UPLOADS_CACHE_MAX_AGE: int = 31536000  # content-addressed files only
+    # e.g. "/_protected_uploads": nginx `internal` location aliased to UPLOAD_BASE
+    UPLOADS_ACCEL_REDIRECT_PREFIX: str = ""
+
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536  # KiB
+    ARGON2_PARALLELISM: int = 4
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+
+    DEBUG: bool = False
+    QUERY_N_PLUS_ONE_THRESHOLD: int = 5  # same statement shape per request
+
+    HEALTH_CACHE_SECONDS: float = 2
+    HEALTH_DB_MAX_LATENCY_MS: float = 500
+    HEALTH_POOL_MAX_SATURATION: float = 0.9
+
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_TRUST_FORWARDED: bool = False  # only behind a trusted proxy
+
+    PRICING_CACHE_TTL_SECONDS: int = 300
+
+    ZONE_INDEX_REFRESH_SECONDS: int = 300
+    ZONE_INDEX_POLL_SECONDS: int = 15  # cheap change check between full reloads
+    BOUNDARY_IMPORT_BATCH_SIZE: int = 500
+    BOUNDARY_SIMPLIFY_TOLERANCE: float = 0.00001  # degrees, ~1 m
+    BULK_ONBOARD_BATCH_SIZE: int = 1000
+
+    SURGE_ENABLED: bool = True
+    SURGE_WINDOW_SECONDS: int = 900
+    SURGE_RECOMPUTE_SECONDS: int = 5
+    SURGE_MIN_DEMAND: int = 3
+    SURGE_SENSITIVITY: float = 0.5
+    SURGE_MAX_MULTIPLIER: float = 2.5
+
+    FLEET_LIVE_TTL_SECONDS: int = 300  # reload / evict unread fleet snapshots
 
     class Config:
         env_file = ".env"
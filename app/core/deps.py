@@ -3,10 +3,14 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from sqlalchemy import select
 from starlette import status
+import uuid
 
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.session_revocation import session_revocations
 from app.models.user_session import UserSession
-from app.utils.jwt import decode_access_token
+from app.schemas.enums import UserRoleEnum
+from app.utils.jwt import decode_access_token, is_current_epoch
 
 security = HTTPBearer()
 
@@ -27,12 +31,17 @@ def get_current_user_session(
     session_id = payload.get("session_id")
     user_id = payload.get("sub")
 
-    if not session_id or not user_id:
+    # quote / refresh tokens carry a "typ" claim and are not access tokens
+    if not session_id or not user_id or payload.get("typ"):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token payload"
         )
 
+    # ✅ Stateless fast path: signature + epoch + in-memory revocation, no DB
+    if settings.AUTH_STATELESS:
+        return _stateless_session(payload, session_id, user_id)
+
     session = db.execute(
         select(UserSession)
         .where(UserSession.session_id == session_id)
@@ -46,3 +55,24 @@ def get_current_user_session(
         )
 
     return session
+
+
+def _stateless_session(payload: dict, session_id: str, user_id: str) -> UserSession:
+    try:
+        sid = uuid.UUID(session_id)
+        role = UserRoleEnum(payload.get("role"))
+        uid = int(user_id)
+    except (TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token payload"
+        )
+
+    if not is_current_epoch(payload) or session_revocations.is_revoked(sid):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Session expired or logged out"
+        )
+
+    # transient (never added to a DB session); carries what guards read
+    return UserSession(session_id=sid, user_id=uid, active_role=role)
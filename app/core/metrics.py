@@ -0,0 +1,269 @@
+import bisect
+import threading
+import time
+from typing import Callable, Optional, Sequence
+
+from app.core.database import engine
+from app.core.rate_limit import rate_limit_stats
+from app.core.security import password_hash_queue_depth
+
+# =========================================================
+# ✅ Lock-free metrics
+# Each thread writes only to its own shard (threading.local), so the hot
+# path is a dict update with no lock. Scrapes sum the shards. Shards of
+# threads that exited (retired threadpool workers) are folded into a
+# shared base, so the shard list stays as long as the live thread count.
+# =========================================================
+_registry: list["_Metric"] = []
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_str(names: Sequence[str], values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: list[tuple[threading.Thread, dict]] = []
+        self._base: dict = {}  # folded shards of exited threads
+        self._shards_lock = threading.Lock()  # once per thread + per scrape
+        _registry.append(self)
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._shards_lock:
+                self._fold_retired()
+                self._shards.append((threading.current_thread(), shard))
+            return shard
+
+    def _merge(self, base: dict, shard: dict):
+        for labels, v in shard.items():
+            base[labels] = base.get(labels, 0) + v
+
+    def _fold_retired(self):
+        # caller holds _shards_lock; an exited thread never writes again,
+        # so its shard can be merged without racing a writer
+        live = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                live.append((thread, shard))
+            else:
+                self._merge(self._base, shard)
+        self._shards = live
+
+    def _snapshots(self) -> list[dict]:
+        with self._shards_lock:
+            self._fold_retired()
+            base = dict(self._base)
+            shards = [shard for _, shard in self._shards]
+        # dict() copies in C under the GIL, safe against concurrent writers
+        return [base] + [dict(s) for s in shards]
+
+    def render(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._fn: Optional[Callable[[], dict]] = None
+
+    def set_function(self, fn: Callable[[], dict]):
+        """
+        Read the value at scrape time instead (state owned elsewhere).
+        fn() returns {label_values_tuple: value}; () for unlabelled.
+        """
+        self._fn = fn
+
+    def inc(self, *labels, amount: float = 1):
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def value(self, *labels) -> float:
+        return sum(s.get(labels, 0) for s in self._snapshots())
+
+    def _totals(self) -> dict:
+        totals: dict = {}
+        for shard in self._snapshots():
+            for labels, v in shard.items():
+                totals[labels] = totals.get(labels, 0) + v
+        return totals
+
+    def render(self) -> list[str]:
+        values = self._fn() if self._fn else self._totals()
+        return [
+            f"{self.name}{_label_str(self.labelnames, labels)} {v}"
+            for labels, v in values.items()
+        ]
+
+
+class Gauge(Counter):
+    """
+    inc()/dec() are sharded like counters; set_function() computes the
+    value at scrape time (pool size, queue depth, ...).
+    """
+    kind = "gauge"
+
+    def dec(self, *labels, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labels):
+        shard = self._shard()
+        entry = shard.get(labels)
+        if entry is None:
+            # per-bucket (non-cumulative) counts + [sum, count]
+            entry = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+        entry[bisect.bisect_left(self.buckets, value)] += 1
+        entry[-2] += value
+        entry[-1] += 1
+
+    def _merge(self, base: dict, shard: dict):
+        # new lists, never in place: scrapes read base entries unlocked
+        for labels, entry in shard.items():
+            acc = base.get(labels)
+            base[labels] = list(entry) if acc is None else [a + b for a, b in zip(acc, entry)]
+
+    def render(self) -> list[str]:
+        n = len(self.buckets) + 3
+        totals: dict = {}
+        for shard in self._snapshots():
+            for labels, entry in shard.items():
+                acc = totals.setdefault(labels, [0] * n)
+                for i, v in enumerate(list(entry)):
+                    acc[i] += v
+
+        lines = []
+        for labels, acc in totals.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), acc):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                bucket_labels = _label_str(self.labelnames, labels, 'le="%s"' % le)
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_label_str(self.labelnames, labels)} {acc[-2]}")
+            lines.append(f"{self.name}_count{_label_str(self.labelnames, labels)} {acc[-1]}")
+        return lines
+
+
+def render_prometheus() -> str:
+    out = []
+    for metric in _registry:
+        out.append(f"# HELP {metric.name} {metric.documentation}")
+        out.append(f"# TYPE {metric.name} {metric.kind}")
+        out.extend(metric.render())
+    return "\n".join(out) + "\n"
+
+
+# =========================================================
+# ✅ Application metrics
+# =========================================================
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "Request latency by route", ("method", "route", "status")
+)
+http_requests_in_flight = Gauge(
+    "http_requests_in_flight", "Requests currently being handled"
+)
+
+dispatch_offers = Counter(
+    "dispatch_offers_total", "Driver offers by outcome (sent, accepted, rejected, timed_out)", ("outcome",)
+)
+dispatch_time_to_assign = Histogram(
+    "dispatch_time_to_assign_seconds", "Trip requested -> driver assigned",
+    buckets=(5, 10, 20, 30, 60, 120, 300, 600)
+)
+
+location_updates = Counter(
+    "driver_location_updates_total", "Driver location pings ingested"
+)
+
+db_pool_connections = Gauge(
+    "db_pool_connections", "SQLAlchemy pool connections by state", ("state",)
+)
+db_pool_connections.set_function(lambda: {
+    ("size",): engine.pool.size(),
+    ("checked_out",): engine.pool.checkedout(),
+    ("idle",): engine.pool.checkedin(),
+    ("overflow",): engine.pool.overflow(),
+})
+
+password_hash_queue = Gauge(
+    "password_hash_queue_depth", "Password hash/verify jobs running or queued"
+)
+password_hash_queue.set_function(lambda: {(): password_hash_queue_depth()})
+
+rate_limit_requests = Counter(
+    "rate_limit_requests_total", "Rate-limited routes by policy and decision", ("policy", "decision")
+)
+rate_limit_requests.set_function(lambda: {
+    (policy, decision): count
+    for policy, counts in rate_limit_stats().items()
+    for decision, count in counts.items()
+})
+
+
+# =========================================================
+# ✅ Route latency middleware (pure ASGI)
+# =========================================================
+class MetricsMiddleware:
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_requests_in_flight.dec()
+            route = scope.get("route")
+            http_request_duration.observe(
+                time.perf_counter() - start,
+                scope["method"],
+                getattr(route, "path", None) or "<unmatched>",
+                str(status_code)
+            )
@@ -0,0 +1,165 @@
+import logging
+import re
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.database import engine
+
+logger = logging.getLogger(__name__)
+
+# "IN (%(id_1_1)s, %(id_1_2)s, ...)" -> "IN (?)" so list sizes share a shape
+_PARAM_LIST = re.compile(r"\(\s*%\([^)]+\)s(?:\s*,\s*%\([^)]+\)s)*\s*\)")
+
+
+def _shape(statement: str) -> str:
+    return _PARAM_LIST.sub("(?)", statement)
+
+
+class RequestQueryStats:
+    __slots__ = ("count", "db_time", "shapes")
+
+    def __init__(self):
+        self.count = 0
+        self.db_time = 0.0
+        self.shapes: dict[str, int] = {}
+
+    def record(self, statement: str, elapsed: float):
+        self.count += 1
+        self.db_time += elapsed
+        shape = _shape(statement)
+        self.shapes[shape] = self.shapes.get(shape, 0) + 1
+
+    def repeated(self) -> dict[str, int]:
+        """
+        Statement shapes run often enough in one request to look like N+1.
+        """
+        threshold = settings.QUERY_N_PLUS_ONE_THRESHOLD
+        return {shape: n for shape, n in self.shapes.items() if n >= threshold}
+
+
+# contextvars are copied into run_in_threadpool, so sync routes and
+# dependencies record into the same object as the middleware
+_current: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def current_query_stats() -> Optional[RequestQueryStats]:
+    return _current.get()
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_start = time.perf_counter()
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, time.perf_counter() - context._query_start)
+
+
+# =========================================================
+# ✅ Per-route aggregates (served by /metrics/db)
+# =========================================================
+class _RouteQueryStats:
+    __slots__ = ("requests", "queries", "db_time", "max_queries", "n_plus_one_requests", "repeated_shapes")
+
+    def __init__(self):
+        self.requests = 0
+        self.queries = 0
+        self.db_time = 0.0
+        self.max_queries = 0
+        self.n_plus_one_requests = 0
+        self.repeated_shapes: dict[str, int] = {}  # shape -> worst count seen
+
+
+_routes: dict[str, _RouteQueryStats] = {}
+_routes_lock = threading.Lock()
+
+
+def _aggregate(route: str, stats: RequestQueryStats, repeated: dict[str, int]):
+    with _routes_lock:
+        agg = _routes.get(route)
+        if agg is None:
+            agg = _routes[route] = _RouteQueryStats()
+        agg.requests += 1
+        agg.queries += stats.count
+        agg.db_time += stats.db_time
+        agg.max_queries = max(agg.max_queries, stats.count)
+        if repeated:
+            agg.n_plus_one_requests += 1
+            for shape, n in repeated.items():
+                agg.repeated_shapes[shape] = max(agg.repeated_shapes.get(shape, 0), n)
+
+
+def query_stats_snapshot() -> dict:
+    with _routes_lock:
+        return {
+            route: {
+                "requests": agg.requests,
+                "queries": agg.queries,
+                "avg_queries": round(agg.queries / agg.requests, 2),
+                "max_queries": agg.max_queries,
+                "db_time_ms": round(agg.db_time * 1000, 2),
+                "avg_db_time_ms": round(agg.db_time * 1000 / agg.requests, 2),
+                "n_plus_one_requests": agg.n_plus_one_requests,
+                "repeated_statements": [
+                    {"statement": shape, "max_per_request": n}
+                    for shape, n in sorted(agg.repeated_shapes.items(), key=lambda kv: -kv[1])
+                ],
+            }
+            for route, agg in _routes.items()
+        }
+
+
+def route_label(scope) -> str:
+    route = scope.get("route")
+    path = getattr(route, "path", None) or "<unmatched>"
+    return f'{scope["method"]} {path}'
+
+
+class QueryStatsMiddleware:
+    """
+    Pure ASGI. Response headers (DEBUG only):
+    X-DB-Query-Count, X-DB-Time-Ms, X-DB-N-Plus-One (repeated shapes).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = RequestQueryStats()
+        token = _current.set(stats)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start" and settings.DEBUG:
+                headers = list(message.get("headers", []))
+                headers += [
+                    (b"x-db-query-count", str(stats.count).encode()),
+                    (b"x-db-time-ms", f"{stats.db_time * 1000:.2f}".encode()),
+                    (b"x-db-n-plus-one", str(len(stats.repeated())).encode()),
+                ]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _current.reset(token)
+
+            route = route_label(scope)
+            repeated = stats.repeated()
+            if repeated:
+                logger.warning(
+                    "Possible N+1 on %s: %d queries, repeated: %s",
+                    route, stats.count, list(repeated.values())
+                )
+            _aggregate(route, stats, repeated)
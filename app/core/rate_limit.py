@@ -0,0 +1,192 @@
+import json
+import math
+import re
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from app.core.config import settings
+
+
+# =========================================================
+# ✅ Policies (declared next to the routes they protect)
+# =========================================================
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    """
+    Token bucket: `rate` tokens per second refill, up to `burst`.
+    key_by: any of "ip", "user" (bearer token), "path" (the concrete path,
+    so /trips/{trip_id}/... gets one bucket per trip), joined with the route.
+    Only key by "user" on routes that authenticate: the header is not
+    verified here, so a bogus one per request would mint fresh buckets.
+    """
+    name: str
+    rate: float
+    burst: int
+    key_by: Tuple[str, ...] = ("ip",)
+
+
+_exact_routes: dict[tuple[str, str], RateLimitPolicy] = {}
+_pattern_routes: list[tuple[str, re.Pattern, RateLimitPolicy]] = []
+
+
+def limit_route(method: str, path: str, policy: RateLimitPolicy):
+    """
+    Attach a policy to METHOD + full path ("/trips/{trip_id}/otp/verify").
+    """
+    if "{" in path:
+        regex = re.compile("^" + re.sub(r"\{[^}]+\}", "[^/]+", path) + "$")
+        _pattern_routes.append((method, regex, policy))
+    else:
+        _exact_routes[(method, path)] = policy
+
+
+def _match(method: str, path: str) -> Optional[RateLimitPolicy]:
+    policy = _exact_routes.get((method, path))
+    if policy:
+        return policy
+    for m, regex, p in _pattern_routes:
+        if m == method and regex.match(path):
+            return p
+    return None
+
+
+# =========================================================
+# ✅ Backends
+# =========================================================
+class RateLimitBackend:
+    """
+    Shared backends (e.g. Redis) implement consume() so limits hold across
+    worker processes. Returns (allowed, retry_after_seconds).
+    """
+
+    async def consume(self, key: str, policy: RateLimitPolicy) -> Tuple[bool, float]:
+        raise NotImplementedError
+
+
+class InMemoryBackend(RateLimitBackend):
+    """
+    Per-worker buckets. consume() is only called from the event loop
+    thread and never awaits in between read and write, so no lock is needed.
+    LRU-bounded: at max_keys the least recently used bucket is dropped
+    (O(1); it is the one most likely to have refilled anyway).
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        # key -> [tokens, last_refill]; least recently used first
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+
+    def __len__(self):
+        return len(self._buckets)
+
+    async def consume(self, key: str, policy: RateLimitPolicy) -> Tuple[bool, float]:
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+
+        if bucket is None:
+            while len(self._buckets) >= self.max_keys:
+                self._buckets.popitem(last=False)
+            self._buckets[key] = [policy.burst - 1, now]
+            return True, 0.0
+
+        self._buckets.move_to_end(key)
+
+        tokens = min(policy.burst, bucket[0] + (now - bucket[1]) * policy.rate)
+        bucket[1] = now
+
+        if tokens >= 1:
+            bucket[0] = tokens - 1
+            return True, 0.0
+
+        bucket[0] = tokens
+        return False, (1 - tokens) / policy.rate
+
+
+_backend: RateLimitBackend = InMemoryBackend()
+
+
+def set_rate_limit_backend(backend: RateLimitBackend):
+    global _backend
+    _backend = backend
+
+
+# =========================================================
+# ✅ Metrics
+# =========================================================
+_allowed: Counter = Counter()
+_limited: Counter = Counter()
+
+
+def rate_limit_stats() -> dict:
+    return {
+        name: {"allowed": _allowed[name], "limited": _limited[name]}
+        for name in set(_allowed) | set(_limited)
+    }
+
+
+# =========================================================
+# ✅ ASGI middleware
+# =========================================================
+def _client_ip(scope) -> str:
+    if settings.RATE_LIMIT_TRUST_FORWARDED:
+        for name, value in scope["headers"]:
+            if name == b"x-forwarded-for":
+                return value.split(b",")[0].strip().decode("latin-1")
+    client = scope.get("client")
+    return client[0] if client else "-"
+
+
+def _bearer(scope) -> str:
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            # raw token: unforgeable per session, no JWT decode needed
+            return value.decode("latin-1")
+    return "-"
+
+
+class RateLimitMiddleware:
+    """
+    Pure ASGI (no request object, no body read): unprotected routes cost a
+    dict lookup, protected ones one bucket update.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.RATE_LIMIT_ENABLED:
+            return await self.app(scope, receive, send)
+
+        policy = _match(scope["method"], scope["path"])
+        if policy is None:
+            return await self.app(scope, receive, send)
+
+        parts = [policy.name]
+        if "ip" in policy.key_by:
+            parts.append(_client_ip(scope))
+        if "user" in policy.key_by:
+            parts.append(_bearer(scope))
+        if "path" in policy.key_by:
+            parts.append(scope["path"])
+
+        allowed, retry_after = await _backend.consume("|".join(parts), policy)
+
+        if allowed:
+            _allowed[policy.name] += 1
+            return await self.app(scope, receive, send)
+
+        _limited[policy.name] += 1
+
+        body = json.dumps({"detail": "Too many requests"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
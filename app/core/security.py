@@ -1,12 +1,79 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 from passlib.context import CryptContext
 
+from app.core.config import settings
+
+# ✅ cost profile comes from Settings; hashes made with older
+# parameters are flagged by needs_update() and rehashed on login
 pwd_context = CryptContext(
     schemes=["argon2"],
-    deprecated="auto"
+    deprecated="auto",
+    argon2__time_cost=settings.ARGON2_TIME_COST,
+    argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+    argon2__parallelism=settings.ARGON2_PARALLELISM,
 )
 
+
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
+
 def verify_password(password: str, hashed: str) -> bool:
     return pwd_context.verify(password, hashed)
+
+
+def verify_and_update_password(password: str, hashed: str) -> tuple[bool, str | None]:
+    """
+    Returns (is_valid, new_hash). new_hash is set only when the stored
+    hash uses outdated parameters and should be replaced.
+    """
+    return pwd_context.verify_and_update(password, hashed)
+
+
+# =========================================================
+# ✅ Dedicated hashing pool
+# argon2 releases the GIL, so a small thread pool runs hashes in
+# parallel without tying up the request threadpool.
+# =========================================================
+class PasswordHasherBusy(Exception):
+    pass
+
+
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash"
+)
+_pending = 0
+_pending_lock = threading.Lock()
+
+
+def password_hash_queue_depth() -> int:
+    """
+    Hash/verify jobs submitted and not yet finished (running + queued).
+    """
+    return _pending
+
+
+async def _offload(fn, *args):
+    global _pending
+    with _pending_lock:
+        if _pending >= settings.PASSWORD_HASH_MAX_QUEUE:
+            raise PasswordHasherBusy()
+        _pending += 1
+
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_hash_executor, fn, *args)
+    finally:
+        with _pending_lock:
+            _pending -= 1
+
+
+async def hash_password_async(password: str) -> str:
+    return await _offload(hash_password, password)
+
+
+async def verify_and_update_password_async(password: str, hashed: str) -> tuple[bool, str | None]:
+    return await _offload(verify_and_update_password, password, hashed)
@@ -0,0 +1,104 @@
+import hashlib
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import select
+
+from app.core.background import register_worker
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.user_session import UserSession
+
+BLOOM_BITS = 1 << 20  # 128 KiB
+BLOOM_HASHES = 4
+
+
+def _bit_positions(session_id: uuid.UUID):
+    digest = hashlib.blake2b(session_id.bytes, digest_size=4 * BLOOM_HASHES).digest()
+    for i in range(BLOOM_HASHES):
+        yield int.from_bytes(digest[4 * i:4 * i + 4], "little") % BLOOM_BITS
+
+
+class SessionRevocationSet:
+    """
+    Logged-out session_ids whose access tokens may still be unexpired.
+
+    The bloom filter answers the common case ("never revoked") without
+    touching the exact set; a bloom hit is confirmed against the exact set.
+    Entries older than one token lifetime are pruned, since any token for
+    that session has expired on its own by then.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bloom = bytearray(BLOOM_BITS // 8)
+        self._revoked: dict[uuid.UUID, datetime] = {}
+        self._synced_until: Optional[datetime] = None
+        self.last_synced_at: Optional[datetime] = None
+
+    def _set_bits(self, bloom: bytearray, session_id: uuid.UUID):
+        for pos in _bit_positions(session_id):
+            bloom[pos >> 3] |= 1 << (pos & 7)
+
+    def revoke(self, session_id, logged_out_at: datetime):
+        if not isinstance(session_id, uuid.UUID):
+            session_id = uuid.UUID(str(session_id))
+        with self._lock:
+            self._revoked[session_id] = logged_out_at
+            self._set_bits(self._bloom, session_id)
+
+    def is_revoked(self, session_id: uuid.UUID) -> bool:
+        bloom = self._bloom
+        for pos in _bit_positions(session_id):
+            if not bloom[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return session_id in self._revoked
+
+    def __len__(self):
+        return len(self._revoked)
+
+    def _prune(self, now: datetime):
+        cutoff = now - timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        revoked = {sid: at for sid, at in self._revoked.items() if at >= cutoff}
+
+        # bloom filters cannot delete, so rebuild and swap
+        bloom = bytearray(BLOOM_BITS // 8)
+        for sid in revoked:
+            self._set_bits(bloom, sid)
+
+        self._revoked = revoked
+        self._bloom = bloom
+
+    def sync(self):
+        """
+        Pull sessions logged out since the last sync (incl. other processes).
+        """
+        now = datetime.now(timezone.utc)
+        since = self._synced_until or now - timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+
+        db = SessionLocal()
+        try:
+            rows = db.execute(
+                select(UserSession.session_id, UserSession.logged_out_at)
+                .where(UserSession.logged_out_at >= since)
+            ).all()
+        finally:
+            db.close()
+
+        with self._lock:
+            for session_id, logged_out_at in rows:
+                self._revoked[session_id] = logged_out_at
+                self._set_bits(self._bloom, session_id)
+            self._prune(now)
+
+        # small overlap covers commits that landed with an earlier timestamp
+        self._synced_until = now - timedelta(seconds=settings.AUTH_REVOCATION_SYNC_SECONDS)
+        self.last_synced_at = now
+
+
+session_revocations = SessionRevocationSet()
+
+if settings.AUTH_STATELESS:
+    register_worker("session_revocation", settings.AUTH_REVOCATION_SYNC_SECONDS, session_revocations.sync)
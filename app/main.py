@@ -1,10 +1,19 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import os
 
+from app.core.background import start_workers, stop_workers
+from app.services.document_store import shutdown_thumbnail_pool
+from app.core.rate_limit import RateLimitMiddleware
+from app.core.query_stats import QueryStatsMiddleware
+from app.core.metrics import MetricsMiddleware
+
 from app.routes import auth,country,admin_tenant
 from app.routes.admin_tenant_admin import router as tenant_admin_router
 from app.routes.admin_tenant_tax_rule import router as admin_tax_router
+from app.routes.admin_fare_config import router as admin_fare_config_router
+from app.routes.admin_boundaries import router as admin_boundaries_router
 
 from app.routes.fleet_owner import router as fleet_owner_router
 from app.routes.tenant_admin_fleet import router as tenant_admin_fleet_router
@@ -17,6 +26,7 @@ from app.routes.tenant_admin_driver_verify import router as tenant_admin_driver_
 
 from app.routes.fleet_owner_vehicle import router as fleet_owner_vehicle_router
 from app.routes.tenant_admin_vehicle_verify import router as tenant_admin_vehicle_router
+from app.routes.tenant_admin_batch_verify import router as tenant_admin_batch_verify_router
 
 from app.routes.fleet_owner_vehicle_assignment import router as fleet_owner_vehicle_assignment_router
 
@@ -31,15 +41,34 @@ from app.routes.trip_lifecycle_routes import router as lifecycle_router
 
 from app.routes.fleet_overview_routes import router as fleet_overview_router
 
-from fastapi.staticfiles import StaticFiles
+from app.routes.metrics import router as metrics_router
+from app.routes.health import router as health_router
+
+from app.core.config import settings
+from app.utils.static_files import UploadStaticFiles
+
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # ✅ surge recompute, zone index refresh, ...
+    start_workers()
+    yield
+    stop_workers()
+    shutdown_thumbnail_pool()
+
 
 app = FastAPI(
     title="Global Ride Platform",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+# ✅ added first = innermost, so 429s still pass through CORS
+app.add_middleware(RateLimitMiddleware)
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(MetricsMiddleware)
+
 origins = [
     "http://localhost:5173",  # Vite default
     "http://127.0.0.1:5173",
@@ -51,6 +80,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 app.include_router(auth.router)
@@ -59,6 +89,8 @@ app.include_router(admin_tenant.router)
 app.include_router(tenant_admin_router)
 app.include_router(tenant_admin_setup_router)
 app.include_router(admin_tax_router)
+app.include_router(admin_fare_config_router)
+app.include_router(admin_boundaries_router)
 app.include_router(fleet_owner_router)
 app.include_router(tenant_admin_fleet_router)
 app.include_router(fleet_owner_driver_router)
@@ -66,6 +98,7 @@ app.include_router(driver_docs_router)
 app.include_router(tenant_admin_driver_verify_router)
 app.include_router(fleet_owner_vehicle_router)
 app.include_router(tenant_admin_vehicle_router)
+app.include_router(tenant_admin_batch_verify_router)
 app.include_router(fleet_owner_vehicle_assignment_router)
 app.include_router(driver_shift_location_router)
 app.include_router(trip_router)
@@ -75,10 +108,10 @@ app.include_router(driver_offer_router)
 app.include_router(otp_router)
 app.include_router(lifecycle_router)
 app.include_router(fleet_overview_router)
+app.include_router(metrics_router)
+app.include_router(health_router)
 
-os.makedirs("uploads", exist_ok=True)
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+os.makedirs(settings.UPLOAD_BASE, exist_ok=True)
+# ✅ ETag / immutable caching / 304 / Range; optional nginx offload
+app.mount("/uploads", UploadStaticFiles(directory=settings.UPLOAD_BASE), name="uploads")
 
-@app.get("/health")
-async def health():
-    return {"status": "ok"}
@@ -0,0 +1,45 @@
+from sqlalchemy import Column, BigInteger, String, Integer, Numeric, TIMESTAMP, ForeignKey, func
+from sqlalchemy.schema import UniqueConstraint
+from app.models.base import Base
+
+
+class FleetStatsRollup(Base):
+    """
+    Pre-aggregated fleet analytics: one row per (fleet, scope, bucket).
+    scope is fleet | vehicle | driver (scope_id = that id), granularity
+    is hour | day. Maintained incrementally on trip completion and shift
+    closure (see services.fleet_analytics).
+    """
+    __tablename__ = "fleet_stats_rollup"
+
+    id = Column(BigInteger, primary_key=True, index=True)
+
+    fleet_id = Column(BigInteger, ForeignKey("fleet.fleet_id", ondelete="CASCADE"), nullable=False)
+    scope = Column(String(10), nullable=False)        # fleet | vehicle | driver
+    scope_id = Column(BigInteger, nullable=False)
+    granularity = Column(String(5), nullable=False)   # hour | day
+    bucket_start = Column(TIMESTAMP(timezone=True), nullable=False)  # UTC
+
+    trips = Column(Integer, nullable=False, server_default="0")
+    distance_km = Column(Numeric(12, 3), nullable=False, server_default="0")
+    trip_minutes = Column(Numeric(12, 2), nullable=False, server_default="0")
+    online_minutes = Column(Numeric(12, 2), nullable=False, server_default="0")
+    fare_total = Column(Numeric(12, 2), nullable=False, server_default="0")
+    driver_earnings = Column(Numeric(12, 2), nullable=False, server_default="0")
+
+    updated_on = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        # also the read path: fleet + scope + granularity, range on bucket_start
+        UniqueConstraint(
+            "fleet_id", "scope", "granularity", "bucket_start", "scope_id",
+            name="uq_fleet_stats_rollup_bucket"
+        ),
+    )
+
+    @property
+    def utilization_pct(self) -> float:
+        # time on trips over time online; shifts are counted when they close
+        if not self.online_minutes:
+            return 0.0
+        return round(min(float(self.trip_minutes) / float(self.online_minutes), 1.0) * 100, 1)
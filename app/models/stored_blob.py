@@ -0,0 +1,20 @@
+from sqlalchemy import Column, BigInteger, Integer, CHAR, Text, TIMESTAMP, func
+from app.models.base import Base
+
+
+class StoredBlob(Base):
+    """
+    One row per distinct uploaded file content. Document rows point at
+    `path`; ref_count is the number of documents sharing it.
+    """
+    __tablename__ = "stored_blob"
+
+    sha256 = Column(CHAR(64), primary_key=True)
+
+    path = Column(Text, nullable=False, unique=True)
+    size = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, nullable=False, server_default="1")
+
+    thumbnail_path = Column(Text, nullable=True)
+
+    created_on = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, BigInteger, ForeignKey, TIMESTAMP, Boolean, String
+from sqlalchemy import Column, BigInteger, ForeignKey, TIMESTAMP, Boolean, String, Integer
 from sqlalchemy.sql import func
 from app.models.base import Base
 
@@ -18,3 +18,7 @@ class TripOtp(Base):
     otp_code = Column(String(10), nullable=False)
     expires_at = Column(TIMESTAMP(timezone=True), nullable=False)
     verified = Column(Boolean, nullable=False, server_default="false")
+
+    # wrong codes entered by the trip's driver; the code stops verifying at
+    # MAX_FAILED_ATTEMPTS (see otp_service)
+    failed_attempts = Column(Integer, nullable=False, server_default="0")
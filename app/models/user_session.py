@@ -20,4 +20,8 @@ class UserSession(Base):
     active_role = Column(Enum(UserRoleEnum, name="user_role_enum"), nullable=False)
 
     logged_in_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
-    logged_out_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    logged_out_at = Column(TIMESTAMP(timezone=True), nullable=True, index=True)
+
+    # current refresh token id; rotated on every refresh
+    refresh_jti = Column(UUID(as_uuid=True), nullable=True)
+    refresh_expires_at = Column(TIMESTAMP(timezone=True), nullable=True)
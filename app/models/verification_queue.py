@@ -0,0 +1,48 @@
+from sqlalchemy import Column, BigInteger, String, SmallInteger, Boolean, TIMESTAMP, Index, ForeignKey, func
+from sqlalchemy.schema import UniqueConstraint
+from app.models.base import Base
+
+
+class VerificationQueue(Base):
+    """
+    One row per driver / vehicle / fleet with its document counts,
+    maintained incrementally on upload and verification
+    (see services.readiness_engine).
+    """
+    __tablename__ = "verification_queue"
+
+    id = Column(BigInteger, primary_key=True, index=True)
+
+    entity_type = Column(String(20), nullable=False)  # driver | vehicle | fleet
+    entity_id = Column(BigInteger, nullable=False)
+    tenant_id = Column(BigInteger, nullable=False)
+
+    required_count = Column(SmallInteger, nullable=False)
+    uploaded_count = Column(SmallInteger, nullable=False, server_default="0")
+    approved_count = Column(SmallInteger, nullable=False, server_default="0")
+    rejected_count = Column(SmallInteger, nullable=False, server_default="0")
+
+    # all required docs uploaded and at least one still PENDING
+    ready_for_review = Column(Boolean, nullable=False, server_default="false")
+    ready_since = Column(TIMESTAMP(timezone=True), nullable=True)
+
+    # same-admin rule: first verifier, and whether anyone else verified too
+    verified_by = Column(BigInteger, ForeignKey("app_user.user_id"), nullable=True)
+    mixed_verifiers = Column(Boolean, nullable=False, server_default="false")
+
+    owner_approved = Column(Boolean, nullable=False, server_default="false")
+
+    updated_on = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("entity_type", "entity_id", name="uq_verification_queue_entity"),
+        Index("ix_verification_queue_ready", "tenant_id", "ready_for_review", "ready_since", "id"),
+    )
+
+    @property
+    def missing_count(self) -> int:
+        return self.required_count - self.uploaded_count
+
+    @property
+    def pending_count(self) -> int:
+        return self.uploaded_count - self.approved_count - self.rejected_count
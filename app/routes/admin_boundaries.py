@@ -0,0 +1,39 @@
+import io
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
+from sqlalchemy.orm import Session
+
+from app.core.admin_auth import verify_admin
+from app.core.database import get_db
+from app.schemas.boundary import BoundaryImportResponse
+from app.services.boundary_import_service import import_boundaries
+
+router = APIRouter(prefix="/admin", tags=["Admin Boundaries"])
+
+
+# =========================================================
+# ✅ Import city / zone boundaries from a GeoJSON FeatureCollection
+# (streamed from the upload, written in batches)
+# =========================================================
+@router.post(
+    "/boundaries/import",
+    response_model=BoundaryImportResponse,
+    dependencies=[Depends(verify_admin)]
+)
+def import_boundaries_file(
+    kind: Literal["zone", "city"] = Query(...),
+    city_id: Optional[int] = Query(None, description="Default city for zone features"),
+    country_code: Optional[str] = Query(None, description="Default country for city features"),
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+):
+    fp = io.TextIOWrapper(file.file, encoding="utf-8")
+
+    try:
+        return import_boundaries(db, fp, kind, city_id=city_id, country_code=country_code)
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        fp.detach()
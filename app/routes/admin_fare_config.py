@@ -0,0 +1,93 @@
+from decimal import Decimal
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from sqlalchemy import select, func
+
+from app.core.database import get_db
+from app.core.admin_auth import verify_admin
+from app.models.tenant import Tenant
+from app.schemas.fare_config import FareWhatIfRequest, FareWhatIfResponse, RepricedTripResponse
+from app.services.fare_service import reprice_trips_query
+from app.services.pricing_cache import get_tax_rule
+
+router = APIRouter(prefix="/admin/tenants", tags=["Admin Fare Config"])
+
+
+def _decimal(value: float | None) -> Decimal | None:
+    return None if value is None else Decimal(str(value))
+
+
+# =========================================================
+# ✅ What-if: reprice completed trips against a candidate config
+# (read-only; nothing is written)
+# =========================================================
+@router.post(
+    "/{tenant_id}/fare-configs/what-if",
+    response_model=FareWhatIfResponse,
+    dependencies=[Depends(verify_admin)]
+)
+def fare_config_what_if(
+    tenant_id: int,
+    payload: FareWhatIfRequest,
+    db: Session = Depends(get_db),
+):
+    tenant = db.execute(
+        select(Tenant).where(Tenant.tenant_id == tenant_id)
+    ).scalar_one_or_none()
+
+    if not tenant:
+        raise HTTPException(status_code=404, detail="Tenant not found")
+
+    if payload.tax_rate is not None:
+        tax_rate = _decimal(payload.tax_rate)
+    else:
+        rule = get_tax_rule(db, tenant_id)
+        tax_rate = rule.rate if rule else Decimal("0")
+
+    repriced = reprice_trips_query(
+        tenant_id=tenant_id,
+        city_id=payload.city_id,
+        vehicle_category=payload.vehicle_category,
+        base_fare=_decimal(payload.base_fare),
+        per_km_rate=_decimal(payload.per_km_rate),
+        per_min_rate=_decimal(payload.per_min_rate),
+        minimum_fare=_decimal(payload.minimum_fare),
+        tax_rate=tax_rate,
+        completed_from=payload.completed_from,
+        completed_to=payload.completed_to,
+    )
+
+    # ✅ 1) totals over all trips, computed in the DB
+    totals = db.execute(
+        select(
+            func.count(),
+            func.coalesce(func.sum(repriced.c.current_fare), 0),
+            func.coalesce(func.sum(repriced.c.projected_fare), 0),
+        )
+    ).one()
+    trip_count, current_revenue, projected_revenue = totals
+
+    # ✅ 2) small sample for eyeballing
+    sample = db.execute(
+        select(repriced).order_by(repriced.c.trip_id.desc()).limit(payload.sample_size)
+    ).all()
+
+    return FareWhatIfResponse(
+        tenant_id=tenant_id,
+        city_id=payload.city_id,
+        vehicle_category=payload.vehicle_category,
+        tax_rate=tax_rate,
+        trip_count=trip_count,
+        current_revenue=current_revenue,
+        projected_revenue=projected_revenue,
+        delta=projected_revenue - current_revenue,
+        sample=[
+            RepricedTripResponse(
+                trip_id=r.trip_id,
+                current_fare=r.current_fare,
+                projected_fare=r.projected_fare
+            )
+            for r in sample
+        ]
+    )
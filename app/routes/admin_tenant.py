@@ -2,7 +2,7 @@
 # Router
 # ---------------------------------------------------------
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy import and_, select
 from sqlalchemy.orm import Session
 
@@ -10,6 +10,7 @@ from app.core.admin_auth import verify_admin
 from app.core.database import get_db
 from app.models.tenant import  Tenant,  TenantCountry
 from app.schemas.admin_tenant import  TenantCountryCreateRequest, TenantCountryResponse, TenantCreateRequest, TenantResponse
+from app.utils.pagination import PageParams, paginate
 
 
 
@@ -54,9 +55,12 @@ def create_tenant(payload: TenantCreateRequest, db: Session = Depends(get_db)):
     response_model=List[TenantResponse],
     dependencies=[Depends(verify_admin)]
 )
-def list_tenants(db: Session = Depends(get_db)):
-    tenants = db.execute(select(Tenant)).scalars().all()
-    return tenants
+def list_tenants(
+    response: Response,
+    page: PageParams = Depends(),
+    db: Session = Depends(get_db)
+):
+    return paginate(db, select(Tenant), [Tenant.tenant_id], page, response, TenantResponse)
 
 
 # =========================================================
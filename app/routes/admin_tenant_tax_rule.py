@@ -91,7 +91,8 @@ def add_tenant_tax_rule(
     )
 
     db.add(new_rule)
-    db.commit()
+    db.commit()  # ✅ 6) cached tax rules are dropped on commit
+
     db.refresh(new_rule)
 
     return new_rule
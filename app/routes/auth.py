@@ -1,57 +1,104 @@
 from datetime import datetime, timezone
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, select
+from sqlalchemy import or_, select, update
 from starlette import status
+from starlette.concurrency import run_in_threadpool
 
 from app.core.database import get_db
 from app.core.deps import get_current_user_session
-from app.core.security import hash_password, verify_password
+from app.core.rate_limit import RateLimitPolicy, limit_route
+from app.core.session_revocation import session_revocations
+from app.core.security import (
+    PasswordHasherBusy,
+    hash_password_async,
+    verify_and_update_password_async,
+)
 from app.models.core import Country
 from app.models.user import AppUser, UserAuth
 from app.models.user_session import UserSession
-from app.schemas.auth import LoginRequest, LoginResponse, RegisterRequest, RegisterResponse, SelectRoleRequest, TokenResponse
-from app.utils.jwt import create_access_token
+from app.schemas.auth import LoginRequest, LoginResponse, RegisterRequest, RegisterResponse, SelectRoleRequest, TokenRequest, TokenResponse, RefreshRequest
+from app.services.auth_service import (
+    RefreshTokenReused,
+    load_token_credentials,
+    issue_session_token,
+    refresh_session_token,
+)
+from app.utils.jwt import decode_refresh_token
 from app.schemas.enums import UserRoleEnum
 from app.models.user_role import UserRole
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
-# ✅ LOGIN: verify password + return roles list
-@router.post("/login", response_model=LoginResponse)
-def login(payload: LoginRequest, db: Session = Depends(get_db)):
+# ✅ every attempt costs an argon2 verification
+LOGIN_LIMIT = RateLimitPolicy("auth_login", rate=10 / 60, burst=10, key_by=("ip",))
+limit_route("POST", "/auth/login", LOGIN_LIMIT)
+limit_route("POST", "/auth/token", LOGIN_LIMIT)
+
+# =========================================================
+# ✅ Hashing runs on the dedicated hasher pool (app.core.security);
+# DB work runs on the regular threadpool, so a login spike never
+# holds request threads while argon2 is computing.
+# =========================================================
+def _password_hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Authentication is busy, please retry",
+        headers={"Retry-After": "1"}
+    )
 
-    user = db.execute(
-        select(AppUser).where(AppUser.email == payload.email)
-    ).scalar_one_or_none()
 
-    if not user:
-        raise HTTPException(status_code=401, detail="Invalid credentials")
+def _load_login_credentials(db: Session, email: str):
+    return db.execute(
+        select(AppUser, UserAuth)
+        .join(UserAuth, UserAuth.user_id == AppUser.user_id)
+        .where(AppUser.email == email)
+    ).first()
 
-    auth = db.execute(
-        select(UserAuth).where(UserAuth.user_id == user.user_id)
-    ).scalar_one_or_none()
 
-    if not auth:
-        raise HTTPException(status_code=401, detail="Invalid credentials")
-
-    if auth.is_locked:
-        raise HTTPException(status_code=403, detail="Account is locked")
-
-    # ✅ Verify password
-    if not verify_password(payload.password, auth.password_hash):
-        raise HTTPException(status_code=401, detail="Invalid credentials")
+def _finish_login(db: Session, auth: UserAuth, new_hash: str | None) -> set:
+    # ✅ Transparent rehash when the cost profile changed
+    if new_hash:
+        auth.password_hash = new_hash
+        db.commit()
 
     # ✅ Fetch roles from user_roles table
     db_roles = db.execute(
         select(UserRole.user_role)
-        .where(UserRole.user_id == user.user_id)
+        .where(UserRole.user_id == auth.user_id)
         .where(UserRole.is_active == True)
     ).scalars().all()
 
     # ✅ Ensure RIDER is always available
     roles = set(db_roles)
     roles.add(UserRoleEnum.RIDER)
+    return roles
+
+
+# ✅ LOGIN: verify password + return roles list
+@router.post("/login", response_model=LoginResponse)
+async def login(payload: LoginRequest, db: Session = Depends(get_db)):
+
+    row = await run_in_threadpool(_load_login_credentials, db, payload.email)
+
+    if not row:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+
+    user, auth = row
+
+    if auth.is_locked:
+        raise HTTPException(status_code=403, detail="Account is locked")
+
+    # ✅ Verify password
+    try:
+        valid, new_hash = await verify_and_update_password_async(payload.password, auth.password_hash)
+    except PasswordHasherBusy:
+        raise _password_hasher_busy()
+
+    if not valid:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+
+    roles = await run_in_threadpool(_finish_login, db, auth, new_hash)
 
     return LoginResponse(
         user_id=user.user_id,
@@ -59,6 +106,37 @@ def login(payload: LoginRequest, db: Session = Depends(get_db)):
     )
 
 
+# ✅ TOKEN: password + role + session in one request
+# (replaces /login + /select-role for clients that know the role up front)
+@router.post("/token", response_model=TokenResponse)
+async def issue_token(payload: TokenRequest, db: Session = Depends(get_db)):
+
+    row = await run_in_threadpool(load_token_credentials, db, payload.email, payload.role)
+
+    if not row:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+
+    if row.is_locked:
+        raise HTTPException(status_code=403, detail="Account is locked")
+
+    try:
+        valid, new_hash = await verify_and_update_password_async(payload.password, row.password_hash)
+    except PasswordHasherBusy:
+        raise _password_hasher_busy()
+
+    if not valid:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+
+    if not row.has_role:
+        raise HTTPException(status_code=403, detail="Role not assigned to this user")
+
+    access_token, refresh_token = await run_in_threadpool(
+        issue_session_token, db, row.user_id, payload.role, new_hash
+    )
+
+    return TokenResponse(access_token=access_token, refresh_token=refresh_token)
+
+
 @router.post("/select-role", response_model=TokenResponse)
 def select_role(payload: SelectRoleRequest, db: Session = Depends(get_db)):
 
@@ -82,42 +160,35 @@ def select_role(payload: SelectRoleRequest, db: Session = Depends(get_db)):
         if not role_exists:
             raise HTTPException(status_code=403, detail="Role not assigned to this user")
 
-    # ✅ 1) Check for existing active session for same user + role
-    existing_session = db.execute(
-        select(UserSession)
-        .where(UserSession.user_id == payload.user_id)
-        .where(UserSession.active_role == payload.role)
-        .where(UserSession.logged_out_at.is_(None))
-    ).scalar_one_or_none()
+    # ✅ Close old session + create new one (single statement) + JWT
+    access_token, refresh_token = issue_session_token(db, payload.user_id, payload.role)
 
-    # ✅ 2) If exists → logout old session (force single login)
-    if existing_session:
-        existing_session.logged_out_at = datetime.now(timezone.utc)
+    return TokenResponse(access_token=access_token, refresh_token=refresh_token)
 
-    # ✅ 3) Create new session
-    session = UserSession(
-        user_id=payload.user_id,
-        active_role=payload.role
-    )
-    db.add(session)
-    db.flush()  # ✅ gets session_id
 
-    # ✅ 4) Create JWT
-    token = create_access_token({
-        "sub": str(payload.user_id),
-        "session_id": str(session.session_id),
-        "role": payload.role.value
-    })
 
-    db.commit()
+# ✅ REFRESH: signature check + one UPDATE by primary key, no argon2
+@router.post("/refresh", response_model=TokenResponse)
+def refresh_access_token(payload: RefreshRequest, db: Session = Depends(get_db)):
 
-    return TokenResponse(access_token=token)
+    claims = decode_refresh_token(payload.refresh_token)
 
+    if not claims:
+        raise HTTPException(status_code=401, detail="Invalid or expired refresh token")
 
+    try:
+        tokens = refresh_session_token(db, claims)
+    except RefreshTokenReused:
+        raise HTTPException(status_code=401, detail="Refresh token reuse detected, session revoked")
 
-@router.post("/register", response_model=RegisterResponse, status_code=201)
-def register_user(payload: RegisterRequest, db: Session = Depends(get_db)):
+    if not tokens:
+        raise HTTPException(status_code=401, detail="Session expired or logged out")
 
+    access_token, refresh_token = tokens
+    return TokenResponse(access_token=access_token, refresh_token=refresh_token)
+
+
+def _create_user(db: Session, payload: RegisterRequest, password_hash: str) -> int:
     try:
         new_user = AppUser(
             full_name=payload.full_name,
@@ -131,7 +202,7 @@ def register_user(payload: RegisterRequest, db: Session = Depends(get_db)):
 
         auth = UserAuth(
             user_id=new_user.user_id,
-            password_hash=hash_password(payload.password)
+            password_hash=password_hash
         )
         db.add(auth)
 
@@ -144,20 +215,42 @@ def register_user(payload: RegisterRequest, db: Session = Depends(get_db)):
         db.commit()
         db.refresh(new_user)
 
-        return RegisterResponse(user_id=new_user.user_id, message="User registered successfully")
+        return new_user.user_id
 
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/register", response_model=RegisterResponse, status_code=201)
+async def register_user(payload: RegisterRequest, db: Session = Depends(get_db)):
+
+    try:
+        password_hash = await hash_password_async(payload.password)
+    except PasswordHasherBusy:
+        raise _password_hasher_busy()
+
+    user_id = await run_in_threadpool(_create_user, db, payload, password_hash)
+
+    return RegisterResponse(user_id=user_id, message="User registered successfully")
+
+
 @router.post("/logout", status_code=status.HTTP_200_OK)
 def logout(
     current_session: UserSession = Depends(get_current_user_session),
     db: Session = Depends(get_db)
 ):
-    current_session.logged_out_at = datetime.now(timezone.utc)
+    # ✅ UPDATE by id: in stateless mode current_session is not DB-backed
+    logged_out_at = datetime.now(timezone.utc)
+    db.execute(
+        update(UserSession)
+        .where(UserSession.session_id == current_session.session_id)
+        .where(UserSession.logged_out_at.is_(None))
+        .values(logged_out_at=logged_out_at, refresh_jti=None)
+    )
     db.commit()
 
+    session_revocations.revoke(current_session.session_id, logged_out_at)
+
     return {"message": "Logged out successfully"}
 
@@ -16,6 +16,7 @@ from app.schemas.driver_docs import (
     DriverDocumentStatusResponse
 )
 
+from app.services.readiness_engine import record_upload
 from app.services.driver_workflow import (
     get_uploaded_driver_docs,
     compute_driver_doc_status
@@ -60,6 +61,7 @@ def upload_driver_document(
     )
 
     db.add(doc)
+    record_upload(db, "driver", session.user_id, profile.tenant_id, payload.document_type)
     db.commit()
     db.refresh(doc)
     return doc
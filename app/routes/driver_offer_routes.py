@@ -13,6 +13,7 @@ from app.models.trip import Trip
 from app.models.dispatch_attempt import DispatchAttempt
 
 from app.schemas.driver_offers import DriverOfferResponse, DriverOfferRespondRequest
+from app.core.metrics import dispatch_offers
 from app.services.dispatch_service import send_next_offer, assign_trip
 
 router = APIRouter(prefix="/driver/offers", tags=["Driver Offers - Phase 2"])
@@ -87,6 +88,7 @@ def respond_offer(
             raise HTTPException(status_code=400, detail=str(e))
 
         db.commit()
+        dispatch_offers.inc("accepted")
         return {"message": "Offer accepted. Trip assigned successfully."}
 
     # ✅ REJECT
@@ -94,6 +96,7 @@ def respond_offer(
 
     next_offer = send_next_offer(db, trip, created_by=session.user_id)
     db.commit()
+    dispatch_offers.inc("rejected")
 
     if next_offer:
         return {"message": "Offer rejected. Next driver notified."}
@@ -5,6 +5,8 @@ from starlette import status
 from datetime import datetime, time, timezone, timedelta
 
 from app.core.database import get_db
+from app.core.metrics import location_updates
+from app.core.rate_limit import RateLimitPolicy, limit_route
 
 from app.models.user import AppUser
 from app.models.driver_shift import DriverShift
@@ -22,9 +24,19 @@ from app.schemas.driver_location import (
     DriverLocationResponse
 )
 from app.schemas.enums import DriverShiftStatusEnum
+from app.services.surge_service import surge_engine, track_driver_location
+from app.services.fleet_live import fleet_live
+from app.services.fleet_analytics import record_shift_closed
 
 router = APIRouter(prefix="/drivers", tags=["Driver Shift & Location"])
 
+# ✅ apps ping every few seconds; this only stops floods
+# (unauthenticated route: per-IP only, an unverified header must not pick the bucket)
+limit_route(
+    "POST", "/drivers/location/update",
+    RateLimitPolicy("location_update", rate=2, burst=10, key_by=("ip",))
+)
+
 
 # =========================================================
 # 🔧 TIME HELPERS
@@ -81,7 +93,10 @@ def auto_end_shift_if_required(
     ):
         shift.status = DriverShiftStatusEnum.OFFLINE
         shift.ended_at = shift.expected_end_at
+        record_shift_closed(db, shift)
         db.commit()
+        surge_engine.record_driver_unavailable(shift.driver_id)
+        fleet_live.record(shift.driver_id, status=DriverShiftStatusEnum.OFFLINE, vehicle_id=None)
         return True
     return False
 
@@ -192,6 +207,24 @@ def start_driver_shift(
 
     db.commit()
     db.refresh(shift)
+
+    # ✅ driver joins idle supply (fresh vehicle category for this shift)
+    track_driver_location(
+        db,
+        payload.driver_id,
+        assignment.vehicle_id,
+        payload.latitude,
+        payload.longitude,
+        refresh_category=True
+    )
+    fleet_live.record(
+        payload.driver_id,
+        at=now,
+        status=DriverShiftStatusEnum.ONLINE,
+        vehicle_id=assignment.vehicle_id,
+        latitude=payload.latitude,
+        longitude=payload.longitude
+    )
     return shift
 
 
@@ -264,6 +297,16 @@ def update_driver_location(
 
     db.commit()
     db.refresh(loc)
+    location_updates.inc()
+
+    track_driver_location(
+        db,
+        payload.driver_id,
+        shift.vehicle_id,
+        payload.latitude,
+        payload.longitude
+    )
+    fleet_live.record(payload.driver_id, at=now, latitude=payload.latitude, longitude=payload.longitude)
     return loc
 
 
@@ -298,8 +341,11 @@ def end_driver_shift(
 
     shift.status = DriverShiftStatusEnum.OFFLINE
     shift.ended_at = now
+    record_shift_closed(db, shift)
 
     db.commit()
+    surge_engine.record_driver_unavailable(payload.driver_id)
+    fleet_live.record(payload.driver_id, at=now, status=DriverShiftStatusEnum.OFFLINE, vehicle_id=None)
     return {"message": "Shift ended successfully"}
 
 
@@ -1,4 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import select, and_
 
@@ -12,12 +15,19 @@ from app.models.fleet_driver import FleetDriver
 from app.models.driver_profile import DriverProfile
 from app.models.user import AppUser
 from app.models.driver_vehicle_assignment import DriverVehicleAssignment
+from app.models.fleet_stats_rollup import FleetStatsRollup
 
 from app.schemas.fleet_overview import (
     FleetVehicleResponse,
     FleetDriverResponse,
+    FleetLiveResponse,
+    FleetStatsRollupResponse,
+    RollupGranularity,
+    RollupScope,
     VehicleDriverAssignmentResponse
 )
+from app.services.fleet_live import fleet_live
+from app.utils.pagination import PageParams, paginate
 
 router = APIRouter(prefix="/fleet-owner", tags=["Fleet Owner - Overview"])
 
@@ -26,6 +36,8 @@ router = APIRouter(prefix="/fleet-owner", tags=["Fleet Owner - Overview"])
 @router.get("/fleets/{fleet_id}/vehicles", response_model=list[FleetVehicleResponse])
 def get_fleet_vehicles(
     fleet_id: int,
+    response: Response,
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
     session=Depends(require_role(TenantRoleEnum.FLEET_OWNER))
 ):
@@ -36,11 +48,9 @@ def get_fleet_vehicles(
     if fleet.owner_user_id != session.user_id:
         raise HTTPException(status_code=403, detail="Not allowed")
 
-    vehicles = db.execute(
-        select(Vehicle).where(Vehicle.fleet_id == fleet_id)
-    ).scalars().all()
-    print('return vehicles')
-    return vehicles
+    stmt = select(Vehicle).where(Vehicle.fleet_id == fleet_id)
+
+    return paginate(db, stmt, [Vehicle.vehicle_id], page, response, FleetVehicleResponse)
 
 
 # ✅ Get all drivers in fleet
@@ -91,6 +101,65 @@ def get_fleet_drivers(
     return drivers
 
 
+# ✅ Live driver status + location, served from memory
+@router.get("/fleets/{fleet_id}/live", response_model=FleetLiveResponse)
+def get_fleet_live(
+    fleet_id: int,
+    since_version: Optional[int] = Query(None, ge=0, description="`version` of the previous response; returns only what changed"),
+    db: Session = Depends(get_db),
+    session=Depends(require_role(TenantRoleEnum.FLEET_OWNER))
+):
+    fleet = db.execute(select(Fleet).where(Fleet.fleet_id == fleet_id)).scalar_one_or_none()
+    if not fleet:
+        raise HTTPException(status_code=404, detail="Fleet not found")
+
+    if fleet.owner_user_id != session.user_id:
+        raise HTTPException(status_code=403, detail="Not allowed")
+
+    return fleet_live.snapshot(db, fleet_id, since_version)
+
+
+# ✅ Utilization / earnings from the pre-aggregated rollups
+@router.get("/fleets/{fleet_id}/analytics", response_model=list[FleetStatsRollupResponse])
+def get_fleet_analytics(
+    fleet_id: int,
+    response: Response,
+    granularity: RollupGranularity = Query("day"),
+    scope: RollupScope = Query("fleet", description="fleet totals, or one row per vehicle / driver"),
+    scope_id: Optional[int] = Query(None, description="a single vehicle_id / driver_id"),
+    start: Optional[datetime] = Query(None, description="bucket_start >= start"),
+    end: Optional[datetime] = Query(None, description="bucket_start < end"),
+    page: PageParams = Depends(),
+    db: Session = Depends(get_db),
+    session=Depends(require_role(TenantRoleEnum.FLEET_OWNER))
+):
+    fleet = db.execute(select(Fleet).where(Fleet.fleet_id == fleet_id)).scalar_one_or_none()
+    if not fleet:
+        raise HTTPException(status_code=404, detail="Fleet not found")
+
+    if fleet.owner_user_id != session.user_id:
+        raise HTTPException(status_code=403, detail="Not allowed")
+
+    # ✅ index range scan on uq_fleet_stats_rollup_bucket
+    stmt = select(FleetStatsRollup).where(
+        FleetStatsRollup.fleet_id == fleet_id,
+        FleetStatsRollup.scope == scope,
+        FleetStatsRollup.granularity == granularity
+    )
+    if scope_id is not None:
+        stmt = stmt.where(FleetStatsRollup.scope_id == scope_id)
+    if start is not None:
+        stmt = stmt.where(FleetStatsRollup.bucket_start >= start)
+    if end is not None:
+        stmt = stmt.where(FleetStatsRollup.bucket_start < end)
+
+    return paginate(
+        db, stmt,
+        [FleetStatsRollup.bucket_start, FleetStatsRollup.scope_id],
+        page, response, FleetStatsRollupResponse
+    )
+
+
 # ✅ Get vehicle-driver assignments (history + current)
 @router.get(
     "/fleets/{fleet_id}/assignments",
@@ -98,6 +167,8 @@ def get_fleet_drivers(
 )
 def get_fleet_vehicle_driver_assignments(
     fleet_id: int,
+    response: Response,
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
     session=Depends(require_role(TenantRoleEnum.FLEET_OWNER))
 ):
@@ -108,14 +179,19 @@ def get_fleet_vehicle_driver_assignments(
     if fleet.owner_user_id != session.user_id:
         raise HTTPException(status_code=403, detail="Not allowed")
 
-    assignments = db.execute(
+    stmt = (
         select(DriverVehicleAssignment)
         .join(Vehicle, Vehicle.vehicle_id == DriverVehicleAssignment.vehicle_id)
         .where(Vehicle.fleet_id == fleet_id)
-        .order_by(DriverVehicleAssignment.start_time.desc())
-    ).scalars().all()
-
-    return assignments
+    )
+
+    # ✅ newest first; assignment_id breaks start_time ties
+    return paginate(
+        db, stmt,
+        [DriverVehicleAssignment.start_time, DriverVehicleAssignment.assignment_id],
+        page, response, VehicleDriverAssignmentResponse,
+        descending=True
+    )
 
 
 # ✅ Get current assignment of a vehicle (if any)
@@ -1,8 +1,9 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Form, UploadFile, File
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Form, UploadFile, File
 from sqlalchemy.orm import Session
 from sqlalchemy import select, and_
 from starlette import status
+from starlette.concurrency import run_in_threadpool
 
 from app.core.database import get_db
 from app.core.deps import get_current_user_session
@@ -25,7 +26,9 @@ from app.services.fleet_workflow import (
     get_fleet_uploaded_docs,
     compute_doc_status
 )
-from app.utils.file_storage import save_upload_file
+from app.services.readiness_engine import record_upload
+from app.services.document_store import BlobRef, acquire_blob, generate_thumbnail
+from app.utils.file_storage import StoredFile, UploadTooLarge, save_upload_file
 
 router = APIRouter(prefix="/fleet-owner", tags=["Fleet Owner Apply"])
 
@@ -137,15 +140,7 @@ def apply_fleet_owner(
     return fleet
 
 
-@router.post("/fleets/{fleet_id}/documents", response_model=FleetDocumentResponse, status_code=201)
-def upload_fleet_document(
-    fleet_id: int,
-    document_type: FleetDocumentTypeEnum = Form(...),
-    document_number: str | None = Form(None),
-    file: UploadFile = File(...),
-    db: Session = Depends(get_db),
-    session: UserSession = Depends(get_current_user_session)
-):
+def _check_fleet_document_upload(db: Session, fleet_id: int, document_type: FleetDocumentTypeEnum, user_id: int) -> Fleet:
     fleet = db.execute(
         select(Fleet).where(Fleet.fleet_id == fleet_id)
     ).scalar_one_or_none()
@@ -153,36 +148,89 @@ def upload_fleet_document(
     if not fleet:
         raise HTTPException(status_code=404, detail="Fleet not found")
 
-    if fleet.owner_user_id != session.user_id:
+    if fleet.owner_user_id != user_id:
         raise HTTPException(status_code=403, detail="Not allowed")
 
-    # ✅ stop re-upload same document type
+    # ✅ stop re-upload same document type (fails fast, before the file is streamed)
+    _reject_existing_fleet_document(db, fleet_id, document_type)
+
+    return fleet
+
+
+def _reject_existing_fleet_document(db: Session, fleet_id: int, document_type: FleetDocumentTypeEnum):
     existing = db.execute(
-        select(FleetDocument).where(
+        select(FleetDocument.document_id).where(
             and_(
                 FleetDocument.fleet_id == fleet_id,
                 FleetDocument.document_type == document_type
             )
         )
-    ).scalar_one_or_none()
+    ).first()
 
     if existing:
         raise HTTPException(status_code=400, detail="This document type is already uploaded")
 
-    # ✅ store file
-    stored_path = save_upload_file(file, folder=f"fleet_docs/{fleet_id}")
+
+def _create_fleet_document(
+    db: Session,
+    fleet: Fleet,
+    document_type: FleetDocumentTypeEnum,
+    document_number: str | None,
+    stored: StoredFile,
+    user_id: int
+) -> tuple[FleetDocument, BlobRef]:
+    # ✅ re-check under the fleet row lock: a concurrent upload of the
+    # same type may have passed the first check while we streamed the file
+    db.execute(select(Fleet.fleet_id).where(Fleet.fleet_id == fleet.fleet_id).with_for_update())
+    _reject_existing_fleet_document(db, fleet.fleet_id, document_type)
+
+    # ✅ identical scans share one stored file
+    blob = acquire_blob(db, stored)
 
     doc = FleetDocument(
-        fleet_id=fleet_id,
+        fleet_id=fleet.fleet_id,
         document_type=document_type,
-        file_url=stored_path,
+        file_url=blob.path,
         document_number=document_number,
-        created_by=session.user_id
+        created_by=user_id
     )
 
     db.add(doc)
+    record_upload(db, "fleet", fleet.fleet_id, fleet.tenant_id, document_type)
     db.commit()
     db.refresh(doc)
+    return doc, blob
+
+
+# DB work on the threadpool, file copy streamed on the event loop
+@router.post("/fleets/{fleet_id}/documents", response_model=FleetDocumentResponse, status_code=201)
+async def upload_fleet_document(
+    fleet_id: int,
+    background_tasks: BackgroundTasks,
+    document_type: FleetDocumentTypeEnum = Form(...),
+    document_number: str | None = Form(None),
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    session: UserSession = Depends(get_current_user_session)
+):
+    fleet = await run_in_threadpool(_check_fleet_document_upload, db, fleet_id, document_type, session.user_id)
+
+    # ✅ store file
+    try:
+        stored = await save_upload_file(file)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    # a failed insert leaves the file for reconcile_blobs: a concurrent
+    # upload of the same bytes may be about to reference it
+    doc, blob = await run_in_threadpool(
+        _create_fleet_document, db, fleet, document_type, document_number, stored, session.user_id
+    )
+
+    # ✅ preview for admin review screens, built after the response is sent
+    if blob.needs_thumbnail:
+        background_tasks.add_task(generate_thumbnail, blob)
+
     return doc
 
 # ✅ User sees what's uploaded + what's missing (Frontend uses this)
@@ -1,4 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException
+import io
+
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
 from sqlalchemy.orm import Session
 from sqlalchemy import select, and_
 from starlette import status
@@ -16,6 +18,10 @@ from app.models.driver_profile import DriverProfile
 from app.schemas.enums import TenantRoleEnum
 from app.schemas.driver_management import AddDriverToFleetByEmailRequest
 from app.schemas.driver_management import FleetDriverResponse  # your response schema
+from app.schemas.driver_management import BulkDriverOnboardResponse
+from app.services.readiness_engine import rebuild_counters
+from app.services.bulk_onboarding_service import is_ndjson, iter_manifest_rows, bulk_add_drivers
+from app.services.fleet_live import fleet_live
 
 
 router = APIRouter(prefix="/fleet-owner", tags=["Fleet Owner - Drivers"])
@@ -116,7 +122,60 @@ def add_driver_to_fleet_by_email(
         profile.driver_type = payload.driver_type
         profile.tenant_id = fleet.tenant_id
 
+    rebuild_counters(db, "driver", [driver_user.user_id])
     db.commit()
     db.refresh(mapping)
+    fleet_live.invalidate(fleet_id)
 
     return mapping
+
+
+# =========================================================
+# ✅ Bulk add drivers from a CSV (email,driver_type) or NDJSON file
+# =========================================================
+@router.post(
+    "/fleets/{fleet_id}/drivers/bulk",
+    response_model=BulkDriverOnboardResponse,
+    status_code=status.HTTP_200_OK
+)
+def bulk_add_drivers_to_fleet(
+    fleet_id: int,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    session: UserSession = Depends(get_current_user_session),
+):
+    fleet = db.execute(
+        select(Fleet).where(Fleet.fleet_id == fleet_id)
+    ).scalar_one_or_none()
+
+    if not fleet:
+        raise HTTPException(status_code=404, detail="Fleet not found")
+
+    if fleet.owner_user_id != session.user_id:
+        raise HTTPException(status_code=403, detail="Not allowed")
+
+    fp = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        rows = iter_manifest_rows(fp, is_ndjson(file.filename, file.content_type))
+        results = bulk_add_drivers(db, fleet, session.user_id, rows)
+    except UnicodeDecodeError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="File must be UTF-8 text")
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        fp.detach()
+
+    # ✅ one transaction for the whole file
+    db.commit()
+    fleet_live.invalidate(fleet_id)
+
+    added = sum(1 for r in results if r["status"] == "added")
+    return BulkDriverOnboardResponse(
+        fleet_id=fleet_id,
+        total=len(results),
+        added=added,
+        skipped=len(results) - added,
+        results=results
+    )
@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, Form, UploadFile, File
+import io
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Form, UploadFile, File
 from sqlalchemy.orm import Session
 from sqlalchemy import select, and_
 from starlette import status
+from starlette.concurrency import run_in_threadpool
 
 from app.core.database import get_db
 from app.core.deps import get_current_user_session
@@ -12,13 +15,16 @@ from app.models.vehicle import Vehicle
 from app.models.vehicle_document import VehicleDocument
 from app.schemas.enums import VehicleDocumentTypeEnum
 
-from app.schemas.vehicle_owner import VehicleCreateRequest, VehicleResponse
+from app.schemas.vehicle_owner import VehicleCreateRequest, VehicleResponse, BulkVehicleImportResponse
 from app.schemas.vehicle_docs import (
     VehicleDocumentUploadRequest, VehicleDocumentResponse, VehicleDocStatusResponse
 )
 
 from app.services.vehicle_workflow import get_vehicle_docs, compute_vehicle_doc_status
-from app.utils.file_storage import save_upload_file
+from app.services.bulk_onboarding_service import is_ndjson, iter_manifest_rows, bulk_add_vehicles
+from app.services.readiness_engine import record_upload
+from app.services.document_store import BlobRef, acquire_blob, generate_thumbnail
+from app.utils.file_storage import StoredFile, UploadTooLarge, save_upload_file
 
 router = APIRouter(prefix="/fleet-owner", tags=["Fleet Owner - Vehicles"])
 
@@ -63,15 +69,47 @@ def add_vehicle_to_fleet(
     return vehicle
 
 
-# ✅ Upload vehicle document
-@router.post("/vehicles/{vehicle_id}/documents", response_model=VehicleDocumentResponse, status_code=201)
-def upload_vehicle_document(
-    vehicle_id: int,
-    document_type: VehicleDocumentTypeEnum = Form(...),
+# ✅ Bulk import vehicles (+ document references) from a CSV or NDJSON manifest
+@router.post("/fleets/{fleet_id}/vehicles/bulk", response_model=BulkVehicleImportResponse)
+def bulk_add_vehicles_to_fleet(
+    fleet_id: int,
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
     session: UserSession = Depends(get_current_user_session),
 ):
+    fleet = db.execute(select(Fleet).where(Fleet.fleet_id == fleet_id)).scalar_one_or_none()
+    if not fleet:
+        raise HTTPException(status_code=404, detail="Fleet not found")
+
+    if fleet.owner_user_id != session.user_id:
+        raise HTTPException(status_code=403, detail="Not allowed")
+
+    fp = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        rows = iter_manifest_rows(fp, is_ndjson(file.filename, file.content_type))
+        results = bulk_add_vehicles(db, fleet, session.user_id, rows)
+    except UnicodeDecodeError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="File must be UTF-8 text")
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        fp.detach()
+
+    db.commit()
+
+    added = sum(1 for r in results if r["status"] == "added")
+    return BulkVehicleImportResponse(
+        fleet_id=fleet_id,
+        total=len(results),
+        added=added,
+        skipped=len(results) - added,
+        results=results
+    )
+
+
+def _check_vehicle_document_upload(db: Session, vehicle_id: int, document_type: VehicleDocumentTypeEnum, user_id: int) -> Vehicle:
     vehicle = db.execute(
         select(Vehicle).where(Vehicle.vehicle_id == vehicle_id)
     ).scalar_one_or_none()
@@ -83,34 +121,82 @@ def upload_vehicle_document(
         select(Fleet).where(Fleet.fleet_id == vehicle.fleet_id)
     ).scalar_one_or_none()
 
-    if not fleet or fleet.owner_user_id != session.user_id:
+    if not fleet or fleet.owner_user_id != user_id:
         raise HTTPException(status_code=403, detail="Not allowed")
 
-    # ✅ stop reupload same type
+    # ✅ stop reupload same type (fails fast, before the file is streamed)
+    _reject_existing_vehicle_document(db, vehicle_id, document_type)
+
+    return vehicle
+
+
+def _reject_existing_vehicle_document(db: Session, vehicle_id: int, document_type: VehicleDocumentTypeEnum):
     existing = db.execute(
-        select(VehicleDocument).where(
+        select(VehicleDocument.document_id).where(
             and_(
                 VehicleDocument.vehicle_id == vehicle_id,
                 VehicleDocument.document_type == document_type
             )
         )
-    ).scalar_one_or_none()
+    ).first()
 
     if existing:
         raise HTTPException(status_code=400, detail="This document type already uploaded")
 
-    stored_path = save_upload_file(file, folder=f"vehicle_docs/{vehicle_id}")
+
+def _create_vehicle_document(
+    db: Session,
+    vehicle: Vehicle,
+    document_type: VehicleDocumentTypeEnum,
+    stored: StoredFile,
+    user_id: int
+) -> tuple[VehicleDocument, BlobRef]:
+    # ✅ re-check under the vehicle row lock: a concurrent upload of the
+    # same type may have passed the first check while we streamed the file
+    db.execute(select(Vehicle.vehicle_id).where(Vehicle.vehicle_id == vehicle.vehicle_id).with_for_update())
+    _reject_existing_vehicle_document(db, vehicle.vehicle_id, document_type)
+
+    # ✅ identical scans share one stored file
+    blob = acquire_blob(db, stored)
 
     doc = VehicleDocument(
-        vehicle_id=vehicle_id,
+        vehicle_id=vehicle.vehicle_id,
         document_type=document_type,
-        file_url=stored_path,
-        created_by=session.user_id
+        file_url=blob.path,
+        created_by=user_id
     )
 
     db.add(doc)
+    record_upload(db, "vehicle", vehicle.vehicle_id, vehicle.tenant_id, document_type)
     db.commit()
     db.refresh(doc)
+    return doc, blob
+
+
+# ✅ Upload vehicle document (DB work on the threadpool, file streamed async)
+@router.post("/vehicles/{vehicle_id}/documents", response_model=VehicleDocumentResponse, status_code=201)
+async def upload_vehicle_document(
+    vehicle_id: int,
+    background_tasks: BackgroundTasks,
+    document_type: VehicleDocumentTypeEnum = Form(...),
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    session: UserSession = Depends(get_current_user_session),
+):
+    vehicle = await run_in_threadpool(_check_vehicle_document_upload, db, vehicle_id, document_type, session.user_id)
+
+    try:
+        stored = await save_upload_file(file)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    # a failed insert leaves the file for reconcile_blobs (see fleet_owner)
+    doc, blob = await run_in_threadpool(_create_vehicle_document, db, vehicle, document_type, stored, session.user_id)
+
+    # ✅ preview for admin review screens, built after the response is sent
+    if blob.needs_thumbnail:
+        background_tasks.add_task(generate_thumbnail, blob)
+
     return doc
 
 
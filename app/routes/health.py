@@ -0,0 +1,109 @@
+import time
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+
+from app.core.background import get_workers
+from app.core.config import settings
+from app.core.database import engine
+from app.services.zone_index import zone_index
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+
+@router.get("")
+async def health():
+    return {"status": "ok"}
+
+
+# ✅ LIVENESS: the process answers; never touches dependencies
+@router.get("/live")
+async def liveness():
+    return {"status": "ok"}
+
+
+# =========================================================
+# ✅ READINESS: can this worker serve traffic right now?
+# =========================================================
+def _check_pool() -> dict:
+    pool = engine.pool
+    capacity = pool.size() + max(getattr(pool, "_max_overflow", 0), 0)
+    checked_out = pool.checkedout()
+    saturation = checked_out / capacity if capacity else 0.0
+    return {
+        "ok": saturation < settings.HEALTH_POOL_MAX_SATURATION,
+        "checked_out": checked_out,
+        "capacity": capacity,
+        "saturation": round(saturation, 2),
+    }
+
+
+def _check_db() -> dict:
+    start = time.perf_counter()
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except Exception as e:
+        return {"ok": False, "error": str(e.__class__.__name__)}
+
+    latency_ms = (time.perf_counter() - start) * 1000
+    return {
+        "ok": latency_ms <= settings.HEALTH_DB_MAX_LATENCY_MS,
+        "latency_ms": round(latency_ms, 2),
+    }
+
+
+def _check_workers() -> dict:
+    now = time.time()
+    workers = {}
+    for name, worker in get_workers().items():
+        # a run may legitimately take a while; allow a few missed intervals
+        max_age = max(worker.interval_seconds * 3, 30)
+        age = now - worker.last_heartbeat if worker.last_heartbeat else None
+        # the heartbeat also ticks on failed runs: a worker that raises every
+        # time is only caught by its last success going stale
+        success_age = now - worker.last_success if worker.last_success else None
+        workers[name] = {
+            "ok": (
+                worker.is_alive()
+                and age is not None and age <= max_age
+                and success_age is not None and success_age <= max_age
+            ),
+            "heartbeat_age_s": round(age, 1) if age is not None else None,
+            "success_age_s": round(success_age, 1) if success_age is not None else None,
+            "last_error": worker.last_error,
+        }
+    return {"ok": all(w["ok"] for w in workers.values()), "workers": workers}
+
+
+_cached: tuple[float, int, dict] | None = None
+
+
+def _run_readiness() -> tuple[int, dict]:
+    pool = _check_pool()
+    # an exhausted pool would block SELECT 1 for pool_timeout; report instead
+    db = _check_db() if pool["ok"] else {"ok": False, "error": "pool saturated"}
+
+    checks = {
+        "database": db,
+        "pool": pool,
+        "zone_index": {"ok": zone_index.is_warm, "zones": zone_index.zone_count},
+        "background_workers": _check_workers(),
+    }
+    ready = all(c["ok"] for c in checks.values())
+    return (200 if ready else 503), {"status": "ready" if ready else "not_ready", "checks": checks}
+
+
+@router.get("/ready")
+async def readiness():
+    global _cached
+
+    now = time.monotonic()
+    if _cached is None or now - _cached[0] >= settings.HEALTH_CACHE_SECONDS:
+        status_code, body = await run_in_threadpool(_run_readiness)
+        _cached = (now, status_code, body)
+
+    _, status_code, body = _cached
+    return JSONResponse(status_code=status_code, content=body)
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from app.core.admin_auth import verify_admin
+from app.core.metrics import render_prometheus
+from app.core.query_stats import query_stats_snapshot
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+# ✅ Prometheus text exposition (scraped, so no auth header)
+@router.get("", response_class=PlainTextResponse)
+def prometheus_metrics():
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+# ✅ Query counts / DB time / N+1 suspects per route (since process start)
+@router.get("/db")
+def db_query_metrics(_: bool = Depends(verify_admin)):
+    return {"routes": query_stats_snapshot()}
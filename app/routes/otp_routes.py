@@ -5,6 +5,7 @@ from starlette import status
 from datetime import datetime, timezone
 
 from app.core.database import get_db
+from app.core.rate_limit import RateLimitPolicy, limit_route
 from app.core.role_guard import require_role
 from app.schemas.enums import TenantRoleEnum, TripStatusEnum
 
@@ -17,6 +18,14 @@ from app.services.otp_service import create_trip_otp, verify_trip_otp
 
 router = APIRouter(prefix="/trips", tags=["Trips - OTP"])
 
+# ✅ throttle per token and trip. The brute-force budget itself is the
+# per-code failure count in verify_trip_otp (only the trip's driver gets
+# that far), so anonymous requests cannot lock the driver out.
+limit_route(
+    "POST", "/trips/{trip_id}/otp/verify",
+    RateLimitPolicy("otp_verify", rate=5 / 60, burst=5, key_by=("user", "path"))
+)
+
 
 # ✅ Driver generates OTP at pickup (only if trip is ASSIGNED to him)
 @router.post("/{trip_id}/otp/generate", response_model=GenerateOtpResponse)
@@ -68,6 +77,8 @@ def verify_and_start_trip(
     ok = verify_trip_otp(db, trip_id, payload.otp_code)
 
     if not ok:
+        # keep the failed attempt count
+        db.commit()
         raise HTTPException(status_code=400, detail="Invalid or expired OTP")
 
     # ✅ start trip
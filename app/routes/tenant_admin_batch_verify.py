@@ -0,0 +1,150 @@
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.orm import Session
+from sqlalchemy import select
+
+from app.core.database import get_db
+from app.core.role_guard import require_role
+from app.schemas.enums import TenantRoleEnum, ApprovalStatusEnum
+
+from app.models.user_session import UserSession
+from app.models.tenant_admin import TenantAdmin
+from app.models.verification_queue import VerificationQueue
+
+from app.schemas.batch_verify import BatchVerifyRequest, BatchVerifyResponse, VerifiableEntity
+from app.schemas.verification_queue import VerificationQueueItemResponse
+from app.utils.pagination import PageParams, paginate
+
+from app.services.readiness_engine import RULES, ReadinessRule, get_states, missing_types, record_verifications, sweep
+
+router = APIRouter(prefix="/tenant-admin/documents", tags=["Tenant Admin - Batch Verification"])
+
+
+def _verify_entity_batch(db: Session, rule: ReadinessRule, items: list, tenant_id: int, admin_user_id: int) -> list[int]:
+    # ✅ only the documents being decided; readiness comes from the counters.
+    # Locked (in id order, so overlapping batches don't deadlock) because
+    # old_status feeds the counter deltas.
+    docs_by_id = {
+        doc.document_id: doc
+        for doc in db.execute(
+            select(rule.document)
+            .where(rule.document.document_id.in_([item.document_id for item in items]))
+            .order_by(rule.document.document_id)
+            .with_for_update()
+        ).scalars()
+    }
+
+    for item in items:
+        if item.document_id not in docs_by_id:
+            raise HTTPException(status_code=404, detail=f"{rule.label} document {item.document_id} not found")
+
+    owner_ids = {getattr(doc, rule.owner_column) for doc in docs_by_id.values()}
+    states = get_states(db, rule.entity_type, owner_ids)
+
+    # same rules as the single-document verify routes
+    for owner_id in owner_ids:
+        state = states.get(owner_id)
+        if state is None:
+            raise HTTPException(status_code=400, detail=f"{rule.label} {owner_id} has no profile")
+        if state.tenant_id != tenant_id:
+            raise HTTPException(status_code=403, detail=f"{rule.label} {owner_id} not allowed for this tenant")
+
+        if state.uploaded_count < state.required_count:
+            raise HTTPException(
+                status_code=400,
+                detail=f"{rule.label} {owner_id}: all required docs must be uploaded before verification. "
+                       f"Missing: {missing_types(db, rule.entity_type, owner_id)}"
+            )
+
+        if state.mixed_verifiers or state.verified_by not in (None, admin_user_id):
+            raise HTTPException(
+                status_code=409,
+                detail=f"{rule.label} {owner_id}: another tenant admin started verification. Same admin must approve all docs."
+            )
+
+    now = datetime.now(timezone.utc)
+    changes = []
+    approved_owners = set()
+    for item in items:
+        doc = docs_by_id[item.document_id]
+        old_status = doc.verification_status
+        doc.verification_status = ApprovalStatusEnum.APPROVED if item.approve else ApprovalStatusEnum.REJECTED
+        doc.verified_by = admin_user_id
+        doc.verified_on = now
+
+        owner_id = getattr(doc, rule.owner_column)
+        changes.append((owner_id, doc.document_type, old_status, doc.verification_status))
+        if item.approve:
+            approved_owners.add(owner_id)
+
+    # ✅ one counter UPDATE per type, then one approval sweep per type
+    record_verifications(db, rule.entity_type, changes, admin_user_id)
+    return sweep(db, rule.entity_type, approved_owners)
+
+
+# ✅ Approve / reject many driver, vehicle and fleet documents in one transaction
+@router.post("/verify-batch", response_model=BatchVerifyResponse)
+def verify_documents_batch(
+    payload: BatchVerifyRequest,
+    db: Session = Depends(get_db),
+    session: UserSession = Depends(require_role(TenantRoleEnum.TENANT_ADMIN)),
+):
+    tenant_admin = db.execute(
+        select(TenantAdmin).where(TenantAdmin.user_id == session.user_id)
+    ).scalar_one_or_none()
+
+    if not tenant_admin:
+        raise HTTPException(status_code=403, detail="Not a tenant admin")
+
+    # last decision wins for a document listed twice
+    by_type: dict[str, dict] = {entity_type: {} for entity_type in RULES}
+    for item in payload.items:
+        by_type[item.entity_type][item.document_id] = item
+
+    approved = {}
+    for entity_type, rule in RULES.items():
+        items = list(by_type[entity_type].values())
+        approved[entity_type] = (
+            _verify_entity_batch(db, rule, items, tenant_admin.tenant_id, session.user_id) if items else []
+        )
+
+    # ✅ all or nothing: any HTTPException above leaves the session uncommitted
+    db.commit()
+
+    return BatchVerifyResponse(
+        verified=sum(len(items) for items in by_type.values()),
+        approved_drivers=approved["driver"],
+        approved_vehicles=approved["vehicle"],
+        approved_fleets=approved["fleet"],
+    )
+
+
+# ✅ "Ready to review" work queue: oldest first, counts precomputed
+@router.get("/queue", response_model=List[VerificationQueueItemResponse])
+def list_verification_queue(
+    response: Response,
+    entity_type: Optional[VerifiableEntity] = Query(None),
+    page: PageParams = Depends(),
+    db: Session = Depends(get_db),
+    session: UserSession = Depends(require_role(TenantRoleEnum.TENANT_ADMIN)),
+):
+    tenant_admin = db.execute(
+        select(TenantAdmin).where(TenantAdmin.user_id == session.user_id)
+    ).scalar_one_or_none()
+
+    if not tenant_admin:
+        raise HTTPException(status_code=403, detail="Not a tenant admin")
+
+    stmt = select(VerificationQueue).where(
+        VerificationQueue.tenant_id == tenant_admin.tenant_id,
+        VerificationQueue.ready_for_review == True
+    )
+    if entity_type:
+        stmt = stmt.where(VerificationQueue.entity_type == entity_type)
+
+    return paginate(
+        db, stmt, [VerificationQueue.ready_since, VerificationQueue.id], page, response,
+        VerificationQueueItemResponse
+    )
@@ -1,7 +1,7 @@
 from datetime import datetime, timezone
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import select, and_
 
@@ -17,18 +17,18 @@ from app.models.driver_document import DriverDocument
 from app.models.driver_profile import DriverProfile
 
 from app.schemas.fleet_verify import VerifyFleetDocumentRequest  # reuse {approve: bool}
+from app.utils.pagination import PageParams, paginate
 
-from app.services.driver_workflow import (
-    get_uploaded_driver_docs,
-    compute_driver_doc_status,
-    auto_approve_driver_if_ready
-)
+from app.services.driver_workflow import auto_approve_driver_if_ready
+from app.services.readiness_engine import get_states, missing_types, record_verifications
 
 router = APIRouter(prefix="/tenant-admin/drivers", tags=["Tenant Admin - Driver Verification"])
 
 # ✅ 1) LIST PENDING DRIVERS (like fleets pending)
 @router.get("/pending", response_model=List[PendingDriverResponse])
 def list_pending_drivers(
+    response: Response,
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
     session: UserSession = Depends(require_role(TenantRoleEnum.TENANT_ADMIN)),
 ):
@@ -39,7 +39,7 @@ def list_pending_drivers(
     if not tenant_admin:
         raise HTTPException(status_code=403, detail="Not a tenant admin")
 
-    drivers = db.execute(
+    stmt = (
         select(DriverProfile)
         .join(DriverDocument, DriverDocument.driver_id == DriverProfile.driver_id)
         .where(
@@ -47,9 +47,9 @@ def list_pending_drivers(
             DriverProfile.approval_status == ApprovalStatusEnum.PENDING
         )
         .distinct()
-    ).scalars().all()
+    )
 
-    return drivers
+    return paginate(db, stmt, [DriverProfile.driver_id], page, response, PendingDriverResponse)
 
 
 # ✅ 2) GET DRIVER DOCUMENTS (like fleet documents)
@@ -97,8 +97,9 @@ def verify_driver_document(
     if not tenant_admin:
         raise HTTPException(status_code=403, detail="Not a tenant admin")
 
+    # ✅ locked: old_status below feeds the readiness counters
     doc = db.execute(
-        select(DriverDocument).where(DriverDocument.document_id == document_id)
+        select(DriverDocument).where(DriverDocument.document_id == document_id).with_for_update()
     ).scalar_one_or_none()
 
     if not doc:
@@ -115,31 +116,32 @@ def verify_driver_document(
     if profile.tenant_id != tenant_admin.tenant_id:
         raise HTTPException(status_code=403, detail="Not allowed for this tenant")
 
-    # ✅ must upload all docs before verification
-    uploaded_docs = get_uploaded_driver_docs(db, doc.driver_id)
-    missing, all_uploaded, _, _ = compute_driver_doc_status(uploaded_docs)
+    # ✅ counters instead of reloading every doc
+    state = get_states(db, "driver", [doc.driver_id])[doc.driver_id]
 
-    if not all_uploaded:
+    # ✅ must upload all docs before verification
+    if state.uploaded_count < state.required_count:
         raise HTTPException(
             status_code=400,
-            detail=f"All required docs must be uploaded before verification. Missing: {missing}"
+            detail=f"All required docs must be uploaded before verification. Missing: {missing_types(db, 'driver', doc.driver_id)}"
         )
 
     # ✅ same tenant admin rule
-    already_started_by_other_admin = any(
-        d.verified_by is not None and d.verified_by != session.user_id
-        for d in uploaded_docs
-    )
-    if already_started_by_other_admin:
+    if state.mixed_verifiers or state.verified_by not in (None, session.user_id):
         raise HTTPException(
             status_code=409,
             detail="Another tenant admin started verification. Same admin must approve all docs."
         )
 
+    old_status = doc.verification_status
     doc.verification_status = ApprovalStatusEnum.APPROVED if payload.approve else ApprovalStatusEnum.REJECTED
     doc.verified_by = session.user_id
     doc.verified_on = datetime.now(timezone.utc)
 
+    record_verifications(
+        db, "driver", [(doc.driver_id, doc.document_type, old_status, doc.verification_status)], session.user_id
+    )
+
     driver_auto_approved = False
     if payload.approve:
         driver_auto_approved = auto_approve_driver_if_ready(db, doc.driver_id)
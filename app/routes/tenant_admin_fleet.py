@@ -17,11 +17,9 @@ from app.schemas.fleet_admin import FleetPendingResponse
 from app.schemas.fleet_verify import VerifyFleetDocumentRequest
 from app.schemas.fleet_docs import FleetDocumentResponse
 
-from app.services.fleet_workflow import (
-    get_fleet_uploaded_docs,
-    compute_doc_status,
-    auto_approve_fleet_if_ready
-)
+from app.services.fleet_workflow import auto_approve_fleet_if_ready
+from app.services.document_store import thumbnail_urls
+from app.services.readiness_engine import get_states, missing_types, record_verifications
 
 router = APIRouter(prefix="/tenant-admin/fleets", tags=["Tenant Admin - Fleet Verification"])
 
@@ -76,7 +74,12 @@ def get_fleet_documents(
         select(FleetDocument).where(FleetDocument.fleet_id == fleet_id)
     ).scalars().all()
 
-    return docs
+    # ✅ review screens load previews instead of full scans
+    thumbs = thumbnail_urls(db, [d.file_url for d in docs])
+    return [
+        FleetDocumentResponse.model_validate(d).model_copy(update={"thumbnail_url": thumbs.get(d.file_url)})
+        for d in docs
+    ]
 
 
 # ✅ Verify single document (auto approves fleet if last doc approved)
@@ -94,8 +97,9 @@ def verify_fleet_document(
     if not tenant_admin:
         raise HTTPException(status_code=403, detail="Not a tenant admin")
 
+    # ✅ locked: old_status below feeds the readiness counters
     doc = db.execute(
-        select(FleetDocument).where(FleetDocument.document_id == document_id)
+        select(FleetDocument).where(FleetDocument.document_id == document_id).with_for_update()
     ).scalar_one_or_none()
 
     if not doc:
@@ -109,33 +113,33 @@ def verify_fleet_document(
     if fleet.tenant_id != tenant_admin.tenant_id:
         raise HTTPException(status_code=403, detail="Not allowed for this tenant")
 
-    # ✅ all docs must be uploaded before verification
-    uploaded_docs = get_fleet_uploaded_docs(db, fleet.fleet_id)
-    missing, all_uploaded, _, _ = compute_doc_status(uploaded_docs)
+    # ✅ counters instead of reloading every doc
+    state = get_states(db, "fleet", [fleet.fleet_id])[fleet.fleet_id]
 
-    if not all_uploaded:
+    # ✅ all docs must be uploaded before verification
+    if state.uploaded_count < state.required_count:
         raise HTTPException(
             status_code=400,
-            detail=f"All 4 documents must be uploaded before verification. Missing: {missing}"
+            detail=f"All 4 documents must be uploaded before verification. Missing: {missing_types(db, 'fleet', fleet.fleet_id)}"
         )
 
     # ✅ same admin must approve ALL docs
-    already_started_by_other_admin = any(
-        d.verified_by is not None and d.verified_by != session.user_id
-        for d in uploaded_docs
-    )
-
-    if already_started_by_other_admin:
+    if state.mixed_verifiers or state.verified_by not in (None, session.user_id):
         raise HTTPException(
             status_code=409,
             detail="Another tenant admin started verification. Only the same admin must approve all documents."
         )
 
     # ✅ update document
+    old_status = doc.verification_status
     doc.verification_status = ApprovalStatusEnum.APPROVED if payload.approve else ApprovalStatusEnum.REJECTED
     doc.verified_by = session.user_id
     doc.verified_on = datetime.now(timezone.utc)
 
+    record_verifications(
+        db, "fleet", [(fleet.fleet_id, doc.document_type, old_status, doc.verification_status)], session.user_id
+    )
+
     # ✅ only if approved, check auto-approval
     fleet_auto_approved = False
     if payload.approve:
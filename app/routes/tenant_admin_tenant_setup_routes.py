@@ -4,7 +4,7 @@
 # ---------------------------------------------------------
 
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import select, and_
 from starlette import status
@@ -15,6 +15,8 @@ from app.core.tenant_admin_guard import get_tenant_admin
 from app.models.tenant import Tenant, TenantCity, TenantCountry
 from app.models.core import City
 from app.models.tenant_admin import TenantAdmin
+from app.services.tenant_city_service import bulk_onboard_cities
+from app.utils.pagination import PageParams, paginate
 
 from app.schemas.admin_tenant import (
     TenantCountryCreateRequest,
@@ -71,57 +73,13 @@ def bulk_add_cities_for_tenant_country(
             detail="Tenant does not have this country enabled or it is inactive"
         )
 
-    created_cities: List[City] = []
-    mapped_city_ids: List[int] = []
-    skipped_city_names: List[str] = []
-
-    for c in payload.cities:
-        city_name = c.name.strip()
-
-        # ✅ 1) Check if city exists in master city table
-        city = db.execute(
-            select(City).where(
-                and_(
-                    City.country_code == country_code,
-                    City.name == city_name
-                )
-            )
-        ).scalar_one_or_none()
-
-        # ✅ 2) If not exists → create
-        if not city:
-            city = City(
-                country_code=country_code,
-                name=city_name,
-                timezone=c.timezone,
-                currency=c.currency
-            )
-            db.add(city)
-            db.flush()  # get city_id
-            created_cities.append(city)
-
-        # ✅ 3) Map into tenant_city if not already mapped
-        existing_map = db.execute(
-            select(TenantCity).where(
-                and_(
-                    TenantCity.tenant_id == tenant_id,
-                    TenantCity.city_id == city.city_id
-                )
-            )
-        ).scalar_one_or_none()
-
-        if existing_map:
-            skipped_city_names.append(city.name)
-            continue
-
-        mapping = TenantCity(
-            tenant_id=tenant_id,
-            city_id=city.city_id,
-            is_active=True
+    # ✅ set-based: same handful of statements for 1 or 1000 cities
+    try:
+        created_cities, mapped_city_ids, skipped_city_names = bulk_onboard_cities(
+            db, tenant_id, country_code, payload.cities
         )
-        db.add(mapping)
-        db.flush()
-        mapped_city_ids.append(city.city_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     db.commit()
 
@@ -143,7 +101,9 @@ def bulk_add_cities_for_tenant_country(
 )
 def list_tenant_cities(
     tenant_id: int,
+    response: Response,
     country_code: Optional[str] = None,
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
     tenant_admin: TenantAdmin = Depends(get_tenant_admin),
 ):
@@ -160,5 +120,4 @@ def list_tenant_cities(
     if country_code:
         stmt = stmt.where(City.country_code == country_code)
 
-    cities = db.execute(stmt).scalars().all()
-    return cities
+    return paginate(db, stmt, [City.city_id], page, response, CityResponse)
@@ -1,5 +1,5 @@
 from datetime import datetime, timezone
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import select, and_
 from typing import List
@@ -15,11 +15,10 @@ from app.models.vehicle_document import VehicleDocument
 
 from app.schemas.fleet_verify import VerifyFleetDocumentRequest  # reuse schema {approve: bool}
 from app.schemas.vehicle_docs import VehicleDocumentResponse
-from app.services.vehicle_workflow import (
-    get_vehicle_docs,
-    compute_vehicle_doc_status,
-    auto_approve_vehicle_if_ready
-)
+from app.utils.pagination import PageParams, paginate
+from app.services.vehicle_workflow import auto_approve_vehicle_if_ready
+from app.services.document_store import thumbnail_urls
+from app.services.readiness_engine import get_states, missing_types, record_verifications
 
 router = APIRouter(prefix="/tenant-admin/vehicles", tags=["Tenant Admin - Vehicle Verification"])
 
@@ -27,6 +26,8 @@ router = APIRouter(prefix="/tenant-admin/vehicles", tags=["Tenant Admin - Vehicl
 # ✅ List pending vehicles
 @router.get("/pending", response_model=List[int])
 def list_pending_vehicles(
+    response: Response,
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
     session: UserSession = Depends(require_role(TenantRoleEnum.TENANT_ADMIN)),
 ):
@@ -34,17 +35,15 @@ def list_pending_vehicles(
     if not tenant_admin:
         raise HTTPException(status_code=403, detail="Not a tenant admin")
 
-    vehicles = db.execute(
-        select(Vehicle).where(
-            and_(
-                Vehicle.tenant_id == tenant_admin.tenant_id,
-                Vehicle.approval_status == ApprovalStatusEnum.PENDING
-            )
+    # ✅ ids only: no need to load whole Vehicle rows
+    stmt = select(Vehicle.vehicle_id).where(
+        and_(
+            Vehicle.tenant_id == tenant_admin.tenant_id,
+            Vehicle.approval_status == ApprovalStatusEnum.PENDING
         )
-    ).scalars().all()
+    )
 
-    # return vehicle_ids (or create response model)
-    return [v.vehicle_id for v in vehicles]
+    return paginate(db, stmt, [Vehicle.vehicle_id], page, response)
 
 
 # ✅ Get vehicle documents
@@ -69,7 +68,12 @@ def get_vehicle_documents(
         select(VehicleDocument).where(VehicleDocument.vehicle_id == vehicle_id)
     ).scalars().all()
 
-    return docs
+    # ✅ review screens load previews instead of full scans
+    thumbs = thumbnail_urls(db, [d.file_url for d in docs])
+    return [
+        VehicleDocumentResponse.model_validate(d).model_copy(update={"thumbnail_url": thumbs.get(d.file_url)})
+        for d in docs
+    ]
 
 
 # ✅ Verify vehicle document
@@ -84,8 +88,9 @@ def verify_vehicle_document(
     if not tenant_admin:
         raise HTTPException(status_code=403, detail="Not a tenant admin")
 
+    # ✅ locked: old_status below feeds the readiness counters
     doc = db.execute(
-        select(VehicleDocument).where(VehicleDocument.document_id == document_id)
+        select(VehicleDocument).where(VehicleDocument.document_id == document_id).with_for_update()
     ).scalar_one_or_none()
 
     if not doc:
@@ -98,32 +103,33 @@ def verify_vehicle_document(
     if vehicle.tenant_id != tenant_admin.tenant_id:
         raise HTTPException(status_code=403, detail="Not allowed for this tenant")
 
-    # ✅ must upload both docs before verification
-    docs = get_vehicle_docs(db, vehicle.vehicle_id)
-    missing, all_uploaded, _, _ = compute_vehicle_doc_status(docs)
+    # ✅ counters instead of reloading every doc
+    state = get_states(db, "vehicle", [vehicle.vehicle_id])[vehicle.vehicle_id]
 
-    if not all_uploaded:
+    # ✅ must upload both docs before verification
+    if state.uploaded_count < state.required_count:
         raise HTTPException(
             status_code=400,
-            detail=f"All required vehicle documents must be uploaded before verification. Missing: {missing}"
+            detail=f"All required vehicle documents must be uploaded before verification. Missing: {missing_types(db, 'vehicle', vehicle.vehicle_id)}"
         )
 
     # ✅ same tenant admin rule
-    started_by_other_admin = any(
-        d.verified_by is not None and d.verified_by != session.user_id
-        for d in docs
-    )
-    if started_by_other_admin:
+    if state.mixed_verifiers or state.verified_by not in (None, session.user_id):
         raise HTTPException(
             status_code=409,
             detail="Another tenant admin started verification. Same admin must approve all docs."
         )
 
     # ✅ verify doc
+    old_status = doc.verification_status
     doc.verification_status = ApprovalStatusEnum.APPROVED if payload.approve else ApprovalStatusEnum.REJECTED
     doc.verified_by = session.user_id
     doc.verified_on = datetime.now(timezone.utc)
 
+    record_verifications(
+        db, "vehicle", [(vehicle.vehicle_id, doc.document_type, old_status, doc.verification_status)], session.user_id
+    )
+
     vehicle_auto_approved = False
     if payload.approve:
         vehicle_auto_approved = auto_approve_vehicle_if_ready(db, vehicle)
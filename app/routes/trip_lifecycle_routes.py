@@ -15,8 +15,10 @@ from app.schemas.trip_lifecycle import (
     TripCompleteRequest,
     TripStatusResponse
 )
-from app.services.trip_lifecycle_service import cancel_trip
+from app.services.trip_lifecycle_service import cancel_trip, set_driver_shift_online
 from app.services.payment_service import create_payment_for_trip
+from app.services.fare_service import settle_trip_earnings
+from app.services.fleet_analytics import record_trip_completed
 
 router = APIRouter(prefix="/trips", tags=["Trips - Lifecycle"])
 
@@ -89,8 +91,17 @@ def complete_trip(
     trip.status = TripStatusEnum.COMPLETED
     trip.completed_at = datetime.now(timezone.utc)
 
+    # ✅ driver share / platform commission, from the fare config it was priced under
+    settle_trip_earnings(db, trip)
+
     # ✅ Payment uses stored fare_amount
     create_payment_for_trip(db, trip)
 
+    # Driver goes back ONLINE (same as cancel)
+    set_driver_shift_online(db, trip.driver_id)
+
+    # ✅ fleet analytics rollups, same transaction
+    record_trip_completed(db, trip)
+
     db.commit()
     return {"fare": trip.fare_amount}
@@ -9,31 +9,41 @@ from app.schemas.enums import TenantRoleEnum
 from app.models.trip import Trip
 from app.models.user_session import UserSession
 
-from app.schemas.trip import TripRequestCreate, TripResponse
+from app.schemas.trip import (
+    TripRequestCreate,
+    TripResponse,
+    TripQuoteRequest,
+    TripQuoteItem,
+    TripQuoteResponse,
+)
 from app.services.distance_service import calculate_distance_km
-from app.services.fare_service import calculate_fare
+from app.services.fare_service import FareBreakdown, calculate_fare, calculate_fares_for_city
 from app.services.location_service import detect_city_by_location
 from app.services.geo_coding_service import reverse_geocode
 from app.services.tenant_city_service import tenant_operates_in_city
 from app.services.dispatch_service import create_first_offer
+from app.services.surge_service import surge_engine
+from app.services.zone_index import zone_index
+from app.utils.jwt import create_quote_token, decode_quote_token
 
 router = APIRouter(prefix="/trips", tags=["Trips"])
 
 
+def _quote_coords(lat1: float, lng1: float, lat2: float, lng2: float) -> list[float]:
+    # same precision as trip.pickup_lat / drop_lat columns
+    return [round(v, 6) for v in (lat1, lng1, lat2, lng2)]
+
+
 # =========================================================
-# ✅ Rider requests a trip
+# ✅ Rider gets prices for every vehicle category (read-only)
 # =========================================================
-@router.post(
-    "/request",
-    response_model=TripResponse,
-    status_code=status.HTTP_201_CREATED
-)
-def request_trip(
-    payload: TripRequestCreate,
+@router.post("/quote", response_model=TripQuoteResponse)
+def quote_trip(
+    payload: TripQuoteRequest,
     db: Session = Depends(get_db),
     session: UserSession = Depends(require_role(TenantRoleEnum.RIDER))
 ):
-    # 1️⃣ Detect city using PostGIS
+    # 1️⃣ Resolve city once
     city_id = detect_city_by_location(
         db,
         payload.pickup_lat,
@@ -42,11 +52,10 @@ def request_trip(
     if not city_id:
         raise HTTPException(400, "Pickup outside service area")
 
-    # 2️⃣ Tenant operates in city?
     if not tenant_operates_in_city(db, payload.tenant_id, city_id):
         raise HTTPException(403, "Tenant not operating here")
 
-    # 3️⃣ Distance calculation
+    # 2️⃣ Distance once
     distance_km = calculate_distance_km(
         payload.pickup_lat,
         payload.pickup_lng,
@@ -54,15 +63,131 @@ def request_trip(
         payload.drop_lng
     )
 
-    # 4️⃣ Fare calculation (existing service)
-    fare = calculate_fare(
+    # 3️⃣ Zone (for surge) from the in-memory index
+    zone_index.ensure_loaded(db)
+    zone_id = zone_index.find_zone_id(payload.pickup_lat, payload.pickup_lng)
+
+    # 4️⃣ Price all categories against cached fare configs
+    fares = calculate_fares_for_city(
         db=db,
         tenant_id=payload.tenant_id,
         city_id=city_id,
-        vehicle_category=payload.vehicle_category,
-        distance_km=distance_km
+        distance_km=distance_km,
+        zone_id=zone_id
+    )
+    if not fares:
+        raise HTTPException(404, "Fare configuration not found")
+
+    coords = _quote_coords(
+        payload.pickup_lat,
+        payload.pickup_lng,
+        payload.drop_lat,
+        payload.drop_lng
+    )
+
+    quotes = []
+    expires_at = None
+    for category, fare in fares.items():
+        token, expires_at = create_quote_token({
+            "sub": str(session.user_id),
+            "tenant_id": payload.tenant_id,
+            "city_id": city_id,
+            "zone_id": zone_id,
+            "vehicle_category": category.value,
+            "coords": coords,
+            "fare": fare.to_dict(),
+        })
+        quotes.append(TripQuoteItem(
+            vehicle_category=category,
+            fare_amount=float(fare.final_fare),
+            quote_token=token
+        ))
+
+    return TripQuoteResponse(
+        city_id=city_id,
+        distance_km=distance_km,
+        expires_at=expires_at,
+        quotes=quotes
+    )
+
+
+def _verified_quote(payload: TripRequestCreate, rider_id: int) -> dict:
+    quote = decode_quote_token(payload.quote_token)
+
+    coords = _quote_coords(
+        payload.pickup_lat,
+        payload.pickup_lng,
+        payload.drop_lat,
+        payload.drop_lng
     )
 
+    if (
+        not quote
+        or quote.get("sub") != str(rider_id)
+        or quote.get("tenant_id") != payload.tenant_id
+        or quote.get("vehicle_category") != payload.vehicle_category.value
+        or quote.get("coords") != coords
+    ):
+        raise HTTPException(400, "Invalid or expired quote")
+
+    return quote
+
+
+# =========================================================
+# ✅ Rider requests a trip
+# =========================================================
+@router.post(
+    "/request",
+    response_model=TripResponse,
+    status_code=status.HTTP_201_CREATED
+)
+def request_trip(
+    payload: TripRequestCreate,
+    db: Session = Depends(get_db),
+    session: UserSession = Depends(require_role(TenantRoleEnum.RIDER))
+):
+    if payload.quote_token:
+        # 1️⃣-4️⃣ already done by /trips/quote
+        quote = _verified_quote(payload, session.user_id)
+        city_id = quote["city_id"]
+        zone_id = quote.get("zone_id")
+        fare = FareBreakdown.from_dict(quote["fare"])
+    else:
+        # 1️⃣ Detect city using PostGIS
+        city_id = detect_city_by_location(
+            db,
+            payload.pickup_lat,
+            payload.pickup_lng
+        )
+        if not city_id:
+            raise HTTPException(400, "Pickup outside service area")
+
+        # 2️⃣ Tenant operates in city?
+        if not tenant_operates_in_city(db, payload.tenant_id, city_id):
+            raise HTTPException(403, "Tenant not operating here")
+
+        # ✅ Zone (for surge) from the in-memory index
+        zone_index.ensure_loaded(db)
+        zone_id = zone_index.find_zone_id(payload.pickup_lat, payload.pickup_lng)
+
+        # 3️⃣ Distance calculation
+        distance_km = calculate_distance_km(
+            payload.pickup_lat,
+            payload.pickup_lng,
+            payload.drop_lat,
+            payload.drop_lng
+        )
+
+        # 4️⃣ Fare calculation (existing service)
+        fare = calculate_fare(
+            db=db,
+            tenant_id=payload.tenant_id,
+            city_id=city_id,
+            vehicle_category=payload.vehicle_category,
+            distance_km=distance_km,
+            zone_id=zone_id
+        )
+
     # 5️⃣ Reverse geocode addresses (optional)
     pickup_address = payload.pickup_address or reverse_geocode(
         payload.pickup_lat,
@@ -79,6 +204,7 @@ def request_trip(
         tenant_id=payload.tenant_id,
         rider_id=session.user_id,
         city_id=city_id,
+        zone_id=zone_id,
 
         pickup_lat=payload.pickup_lat,
         pickup_lng=payload.pickup_lng,
@@ -89,14 +215,21 @@ def request_trip(
         drop_address=drop_address,
 
         vehicle_category=payload.vehicle_category,
-        fare_amount=fare["total_fare"],
+        fare_amount=fare.final_fare,
         created_by=session.user_id
     )
 
     db.add(trip)
+    db.flush()  # ✅ gets trip_id
+
+    # ✅ fare breakdown in the same transaction as the trip
+    db.add(fare.to_model(trip.trip_id))
+
     db.commit()
     db.refresh(trip)
 
+    surge_engine.record_trip_requested(trip.trip_id, zone_id, trip.vehicle_category)
+
     # 7️⃣ Trigger dispatch
     create_first_offer(db, trip, session.user_id)
     db.commit()
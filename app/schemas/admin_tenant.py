@@ -45,6 +45,7 @@ class CityCreateRequest(BaseModel):
     name: str
     timezone: str
     currency: str
+    boundary: Optional[dict] = None  # GeoJSON Polygon geometry
 
 
 class BulkCitiesCreateRequest(BaseModel):
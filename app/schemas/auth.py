@@ -1,6 +1,6 @@
 from pydantic import BaseModel, EmailStr
 from app.schemas.enums import GenderEnum
-from typing import List
+from typing import List, Optional
 
 from app.schemas.enums import UserRoleEnum
 
@@ -11,6 +11,12 @@ class LoginRequest(BaseModel):
     password: str
 
 
+class TokenRequest(BaseModel):
+    email: EmailStr
+    password: str
+    role: UserRoleEnum = UserRoleEnum.RIDER
+
+
 class LoginResponse(BaseModel):
     user_id: int
     roles: List[UserRoleEnum]
@@ -18,9 +24,14 @@ class LoginResponse(BaseModel):
 
 class TokenResponse(BaseModel):
     access_token: str
+    refresh_token: Optional[str] = None
     token_type: str = "bearer"
 
 
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+
 class RegisterRequest(BaseModel):
     full_name: str
     phone: str
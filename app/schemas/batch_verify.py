@@ -0,0 +1,21 @@
+from pydantic import BaseModel, Field
+from typing import List, Literal
+
+VerifiableEntity = Literal["driver", "vehicle", "fleet"]
+
+
+class BatchVerifyItem(BaseModel):
+    entity_type: VerifiableEntity
+    document_id: int
+    approve: bool
+
+
+class BatchVerifyRequest(BaseModel):
+    items: List[BatchVerifyItem] = Field(..., min_length=1, max_length=1000)
+
+
+class BatchVerifyResponse(BaseModel):
+    verified: int
+    approved_drivers: List[int]
+    approved_vehicles: List[int]
+    approved_fleets: List[int]
@@ -0,0 +1,18 @@
+from typing import List, Literal
+from pydantic import BaseModel
+
+
+class BoundaryImportError(BaseModel):
+    feature: int
+    error: str
+
+
+class BoundaryImportResponse(BaseModel):
+    kind: Literal["zone", "city"]
+    features: int
+    upserted: int
+    skipped: int
+    errors: List[BoundaryImportError]
+
+    class Config:
+        from_attributes = True
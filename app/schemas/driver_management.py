@@ -1,5 +1,6 @@
 from pydantic import BaseModel, EmailStr
 from datetime import datetime
+from typing import List, Optional
 from app.schemas.enums import DriverTypeEnum
 
 class AddDriverToFleetByEmailRequest(BaseModel):
@@ -25,4 +26,19 @@ class PendingDriverResponse(BaseModel):
     created_on: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class BulkDriverRowResult(BaseModel):
+    row: int
+    email: Optional[str] = None
+    status: str  # added | already_in_fleet | user_not_found | duplicate_in_file | invalid
+    fleet_driver_id: Optional[int] = None
+    detail: Optional[str] = None
+
+
+class BulkDriverOnboardResponse(BaseModel):
+    fleet_id: int
+    total: int
+    added: int
+    skipped: int
+    results: List[BulkDriverRowResult]
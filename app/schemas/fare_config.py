@@ -0,0 +1,44 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel
+
+from app.schemas.enums import VehicleCategoryEnum
+
+
+class FareWhatIfRequest(BaseModel):
+    city_id: int
+    vehicle_category: VehicleCategoryEnum
+
+    # candidate config
+    base_fare: float
+    per_km_rate: float
+    per_min_rate: float
+    minimum_fare: Optional[float] = None
+
+    # defaults to tenant's current tax rule
+    tax_rate: Optional[float] = None
+
+    completed_from: Optional[datetime] = None
+    completed_to: Optional[datetime] = None
+
+    sample_size: int = 50
+
+
+class RepricedTripResponse(BaseModel):
+    trip_id: int
+    current_fare: Optional[float]
+    projected_fare: float
+
+
+class FareWhatIfResponse(BaseModel):
+    tenant_id: int
+    city_id: int
+    vehicle_category: VehicleCategoryEnum
+    tax_rate: float
+
+    trip_count: int
+    current_revenue: float
+    projected_revenue: float
+    delta: float
+
+    sample: List[RepricedTripResponse]
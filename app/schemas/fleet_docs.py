@@ -20,6 +20,7 @@ class FleetDocumentResponse(BaseModel):
     verified_by: Optional[int]
     verified_on: Optional[datetime]
     created_on: datetime
+    thumbnail_url: Optional[str] = None  # small preview, when one exists
 
     class Config:
         from_attributes = True
@@ -1,5 +1,5 @@
 from datetime import datetime, time
-from typing import Optional
+from typing import Literal, Optional
 from pydantic import BaseModel
 
 
@@ -26,6 +26,24 @@ class FleetDriverResponse(BaseModel):
         from_attributes = True
 
 
+class FleetLiveDriverResponse(BaseModel):
+    driver_id: int
+    full_name: str
+    status: str
+    vehicle_id: Optional[int]
+    latitude: Optional[float]
+    longitude: Optional[float]
+    updated_at: Optional[datetime]
+    version: int
+
+
+class FleetLiveResponse(BaseModel):
+    fleet_id: int
+    version: int
+    full: bool  # False: only drivers changed after since_version
+    drivers: list[FleetLiveDriverResponse]
+
+
 class VehicleDriverAssignmentResponse(BaseModel):
     assignment_id: int
     driver_id: int
@@ -37,3 +55,25 @@ class VehicleDriverAssignmentResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+RollupScope = Literal["fleet", "vehicle", "driver"]
+RollupGranularity = Literal["hour", "day"]
+
+
+class FleetStatsRollupResponse(BaseModel):
+    scope: str
+    scope_id: int
+    granularity: str
+    bucket_start: datetime  # UTC
+
+    trips: int
+    distance_km: float
+    trip_minutes: float
+    online_minutes: float
+    utilization_pct: float
+    fare_total: float
+    driver_earnings: float
+
+    class Config:
+        from_attributes = True
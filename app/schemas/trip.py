@@ -1,6 +1,7 @@
+from datetime import datetime
 from pydantic import BaseModel
 from app.schemas.enums import VehicleCategoryEnum
-from typing import Optional
+from typing import List, Optional
 
 
 class TripRequestCreate(BaseModel):
@@ -15,6 +16,9 @@ class TripRequestCreate(BaseModel):
 
     vehicle_category: VehicleCategoryEnum
 
+    # ✅ from POST /trips/quote — skips city detection + pricing
+    quote_token: Optional[str] = None
+
 
 class TripResponse(BaseModel):
     trip_id: int
@@ -23,3 +27,24 @@ class TripResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class TripQuoteRequest(BaseModel):
+    tenant_id: int
+    pickup_lat: float
+    pickup_lng: float
+    drop_lat: float
+    drop_lng: float
+
+
+class TripQuoteItem(BaseModel):
+    vehicle_category: VehicleCategoryEnum
+    fare_amount: float
+    quote_token: str
+
+
+class TripQuoteResponse(BaseModel):
+    city_id: int
+    distance_km: float
+    expires_at: datetime
+    quotes: List[TripQuoteItem]
@@ -16,6 +16,7 @@ class VehicleDocumentResponse(BaseModel):
     verified_by: int | None
     verified_on: datetime | None
     created_on: datetime
+    thumbnail_url: str | None = None  # small preview, when one exists
 
     class Config:
         from_attributes = True
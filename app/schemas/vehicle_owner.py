@@ -1,7 +1,7 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Dict, List, Optional
 from datetime import datetime
-from app.schemas.enums import VehicleCategoryEnum
+from app.schemas.enums import VehicleCategoryEnum, VehicleDocumentTypeEnum
 
 class VehicleCreateRequest(BaseModel):
     category: VehicleCategoryEnum
@@ -22,3 +22,27 @@ class VehicleResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class BulkVehicleRow(VehicleCreateRequest):
+    # document_type -> path of an already uploaded file (a stored blob,
+    # e.g. uploads/blobs/ab/<sha256>.pdf); anything else rejects the row
+    documents: Dict[VehicleDocumentTypeEnum, str] = {}
+
+
+class BulkVehicleRowResult(BaseModel):
+    row: int
+    registration_no: Optional[str] = None
+    status: str  # added | already_exists | duplicate_in_file | invalid
+    vehicle_id: Optional[int] = None
+    documents: int = 0
+    approved: bool = False
+    detail: Optional[str] = None
+
+
+class BulkVehicleImportResponse(BaseModel):
+    fleet_id: int
+    total: int
+    added: int
+    skipped: int
+    results: List[BulkVehicleRowResult]
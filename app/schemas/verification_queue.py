@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+
+class VerificationQueueItemResponse(BaseModel):
+    entity_type: str
+    entity_id: int
+    required_count: int
+    uploaded_count: int
+    approved_count: int
+    rejected_count: int
+    missing_count: int
+    pending_count: int
+    ready_for_review: bool
+    ready_since: Optional[datetime]
+    updated_on: datetime
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,187 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import select, update, insert, exists, func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.session_revocation import session_revocations
+from app.models.user import AppUser, UserAuth
+from app.models.user_role import UserRole
+from app.models.user_session import UserSession
+from app.schemas.enums import UserRoleEnum
+from app.utils.jwt import create_access_token, create_refresh_token
+
+
+# =========================================================
+# ✅ Credentials + role check in ONE query
+# =========================================================
+def load_token_credentials(db: Session, email: str, role: UserRoleEnum):
+    """
+    Returns a row (user_id, password_hash, is_locked, has_role) or None.
+    RIDER is implicit for every user.
+    """
+    has_role = exists().where(
+        UserRole.user_id == AppUser.user_id,
+        UserRole.user_role == role,
+        UserRole.is_active == True
+    )
+
+    row = db.execute(
+        select(
+            AppUser.user_id,
+            UserAuth.password_hash,
+            UserAuth.is_locked,
+            has_role.label("has_role"),
+        )
+        .join(UserAuth, UserAuth.user_id == AppUser.user_id)
+        .where(AppUser.email == email)
+    ).first()
+
+    if row and role == UserRoleEnum.RIDER:
+        row = row._replace(has_role=True)
+    return row
+
+
+# =========================================================
+# ✅ Close previous session(s) + open a new one in ONE statement
+# =========================================================
+def _token_pair(user_id: int, session_id, role: UserRoleEnum, refresh_jti: uuid.UUID):
+    access_token = create_access_token({
+        "sub": str(user_id),
+        "session_id": str(session_id),
+        "role": role.value
+    })
+    refresh_token, refresh_expire = create_refresh_token({
+        "sub": str(user_id),
+        "session_id": str(session_id),
+        "jti": str(refresh_jti)
+    })
+    return access_token, refresh_token, refresh_expire.replace(tzinfo=timezone.utc)
+
+
+def issue_session_token(
+    db: Session,
+    user_id: int,
+    role: UserRoleEnum,
+    new_password_hash: Optional[str] = None
+) -> tuple[str, str]:
+    """
+    Force single login for (user, role): a data-modifying CTE logs out the
+    active session and the INSERT creates the new one. Commits.
+    Returns (access_token, refresh_token).
+    """
+    now = datetime.now(timezone.utc)
+    refresh_jti = uuid.uuid4()
+
+    if new_password_hash:
+        # parameters changed since this hash was made (rare)
+        db.execute(
+            update(UserAuth)
+            .where(UserAuth.user_id == user_id)
+            .values(password_hash=new_password_hash)
+        )
+
+    closed = (
+        update(UserSession)
+        .where(
+            UserSession.user_id == user_id,
+            UserSession.active_role == role,
+            UserSession.logged_out_at.is_(None)
+        )
+        .values(logged_out_at=now)
+        .returning(UserSession.session_id)
+        .cte("closed")
+    )
+
+    session_id, closed_ids = db.execute(
+        insert(UserSession)
+        .add_cte(closed)
+        .values(
+            user_id=user_id,
+            active_role=role,
+            refresh_jti=refresh_jti,
+            refresh_expires_at=now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+        )
+        .returning(
+            UserSession.session_id,
+            select(func.array_agg(closed.c.session_id)).scalar_subquery()
+        )
+    ).one()
+
+    access_token, refresh_token, _ = _token_pair(user_id, session_id, role, refresh_jti)
+
+    db.commit()
+
+    for closed_id in closed_ids or ():
+        session_revocations.revoke(closed_id, now)
+
+    return access_token, refresh_token
+
+
+# =========================================================
+# ✅ Refresh: rotate the refresh token, no password check
+# =========================================================
+class RefreshTokenReused(Exception):
+    pass
+
+
+def refresh_session_token(db: Session, payload: dict) -> Optional[tuple[str, str]]:
+    """
+    `payload` is a decoded (signature-checked) refresh token.
+
+    One UPDATE ... WHERE refresh_jti = <presented jti> both validates and
+    rotates, so two concurrent refreshes with the same token cannot both win.
+    Returns None for an unknown / expired / logged-out session. Raises
+    RefreshTokenReused (after logging the session out) when an already
+    rotated token is presented again.
+    """
+    try:
+        session_id = uuid.UUID(payload["session_id"])
+        presented_jti = uuid.UUID(payload["jti"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+    now = datetime.now(timezone.utc)
+    new_jti = uuid.uuid4()
+
+    row = db.execute(
+        update(UserSession)
+        .where(
+            UserSession.session_id == session_id,
+            UserSession.refresh_jti == presented_jti,
+            UserSession.refresh_expires_at > now,
+            UserSession.logged_out_at.is_(None)
+        )
+        .values(
+            refresh_jti=new_jti,
+            refresh_expires_at=now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+        )
+        .returning(UserSession.user_id, UserSession.active_role)
+    ).first()
+
+    if row:
+        access_token, refresh_token, _ = _token_pair(row.user_id, session_id, row.active_role, new_jti)
+        db.commit()
+        return access_token, refresh_token
+
+    # ✅ Reuse detection: live session, but a different (newer) jti is current
+    reused = db.execute(
+        update(UserSession)
+        .where(
+            UserSession.session_id == session_id,
+            UserSession.refresh_jti.isnot(None),
+            UserSession.refresh_jti != presented_jti,
+            UserSession.logged_out_at.is_(None)
+        )
+        .values(logged_out_at=now, refresh_jti=None)
+        .returning(UserSession.session_id)
+    ).first()
+    db.commit()
+
+    if reused:
+        session_revocations.revoke(session_id, now)
+        raise RefreshTokenReused()
+
+    return None
@@ -0,0 +1,325 @@
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Iterator, Optional, TextIO
+
+from sqlalchemy import select, update, bindparam, func, tuple_, Text
+from sqlalchemy.dialects.postgresql import insert, ARRAY
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.core import City, Zone
+from app.services.geo_service import validate_polygon_geojson, polygon_from_geojson
+from app.services.zone_index import zone_index
+
+_FEATURES_KEY = re.compile(r'"features"\s*:\s*\[')
+MAX_REPORTED_ERRORS = 100
+
+
+# =========================================================
+# ✅ Incremental FeatureCollection reader
+# =========================================================
+def iter_geojson_features(fp: TextIO, chunk_size: int = 1 << 16) -> Iterator[dict]:
+    """
+    Yields features one at a time from a FeatureCollection without loading
+    the whole file. Memory is bounded by the largest single feature.
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    eof = False
+
+    def read_more(size: int) -> bool:
+        nonlocal buf, eof
+        chunk = fp.read(size)
+        if not chunk:
+            eof = True
+            return False
+        buf += chunk
+        return True
+
+    # 1) seek to the features array
+    while True:
+        match = _FEATURES_KEY.search(buf)
+        if match:
+            buf = buf[match.end():]
+            break
+        # keep a tail in case the key straddles two chunks
+        buf = buf[-64:]
+        if not read_more(chunk_size):
+            raise ValueError("No FeatureCollection 'features' array found")
+
+    # 2) decode features one by one
+    read_size = chunk_size
+    while True:
+        stripped = buf.lstrip(" \t\r\n,")
+        if not stripped:
+            if not read_more(chunk_size):
+                raise ValueError("Unexpected end of file inside 'features'")
+            continue
+        buf = stripped
+
+        if buf[0] == "]":
+            return
+
+        try:
+            feature, end = decoder.raw_decode(buf)
+        except json.JSONDecodeError:
+            if eof or not read_more(read_size):
+                raise ValueError("Malformed feature in GeoJSON")
+            read_size *= 2  # large feature: grow reads instead of re-parsing often
+            continue
+
+        read_size = chunk_size
+        buf = buf[end:]
+        yield feature
+
+
+# =========================================================
+# ✅ Geometry normalisation
+# =========================================================
+def _ring_area(ring: list) -> float:
+    return abs(sum(
+        ring[i][0] * ring[i + 1][1] - ring[i + 1][0] * ring[i][1]
+        for i in range(len(ring) - 1)
+    )) / 2
+
+
+def _feature_polygon(feature: dict) -> str:
+    """
+    Polygon as-is; MultiPolygon -> its largest part (boundary columns are
+    POLYGON). Returns validated GeoJSON text or raises ValueError.
+    """
+    geometry = feature.get("geometry") or {}
+
+    if geometry.get("type") == "MultiPolygon":
+        parts = geometry.get("coordinates") or []
+        if not parts:
+            raise ValueError("Empty MultiPolygon")
+        largest = max(parts, key=lambda p: _ring_area(p[0]) if p and len(p[0]) > 3 else 0)
+        geometry = {"type": "Polygon", "coordinates": largest}
+
+    return validate_polygon_geojson(geometry)
+
+
+def _simplified(geojson):
+    return func.ST_SimplifyPreserveTopology(
+        polygon_from_geojson(geojson),
+        settings.BOUNDARY_SIMPLIFY_TOLERANCE
+    )
+
+
+def _parse_city_id(value) -> Optional[int]:
+    if value in (None, ""):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid city_id {value!r}")
+
+
+@dataclass
+class BoundaryImportResult:
+    kind: str
+    features: int = 0
+    upserted: int = 0
+    skipped: int = 0
+    errors: list = field(default_factory=list)  # [{"feature": i, "error": "..."}]
+
+    def reject(self, index: int, reason: str):
+        self.skipped += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"feature": index, "error": reason})
+
+
+# =========================================================
+# ✅ Batched writers
+# =========================================================
+def _invalid_geometries(db: Session, geojsons: list[str]) -> dict[int, str]:
+    """
+    One round trip per batch: position -> ST_IsValidReason for invalid ones.
+    """
+    g = (
+        func.unnest(bindparam("geojsons", type_=ARRAY(Text)))
+        .table_valued("g", with_ordinality="idx")
+        .render_derived()
+    )
+    rows = db.execute(
+        select(g.c.idx, func.ST_IsValidReason(polygon_from_geojson(g.c.g))),
+        {"geojsons": geojsons}
+    ).all()
+    return {idx - 1: reason for idx, reason in rows if reason != "Valid Geometry"}
+
+
+def _write_zone_batch(db: Session, batch: list[tuple[int, dict]], result: BoundaryImportResult):
+    # last feature wins for a repeated (city_id, name): ON CONFLICT cannot
+    # touch the same row twice in one statement
+    unique = {(row["city_id"], row["name"]): (i, row) for i, row in batch}
+
+    known_cities = set(db.execute(
+        select(City.city_id).where(City.city_id.in_({city for city, _ in unique}))
+    ).scalars())
+
+    items = []
+    for i, row in unique.values():
+        if row["city_id"] in known_cities:
+            items.append((i, row))
+        else:
+            result.reject(i, f"Unknown city_id {row['city_id']}")
+    if not items:
+        return
+
+    invalid = _invalid_geometries(db, [row["geojson"] for _, row in items])
+    for pos, reason in invalid.items():
+        result.reject(items[pos][0], reason)
+
+    rows = [row for pos, (_, row) in enumerate(items) if pos not in invalid]
+    if not rows:
+        return
+
+    stmt = insert(Zone).values([
+        {"city_id": row["city_id"], "name": row["name"], "boundary": _simplified(row["geojson"])}
+        for row in rows
+    ])
+    zone_ids = db.execute(
+        stmt.on_conflict_do_update(
+            constraint="uq_zone_city_name",
+            set_={"boundary": stmt.excluded.boundary, "updated_on": func.now()}
+        ).returning(Zone.zone_id)
+    ).scalars().all()
+
+    db.execute(
+        update(Zone)
+        .where(Zone.zone_id.in_(zone_ids))
+        .values(
+            center_lat=func.ST_Y(func.ST_PointOnSurface(Zone.boundary)),
+            center_lng=func.ST_X(func.ST_PointOnSurface(Zone.boundary)),
+        )
+    )
+    result.upserted += len(zone_ids)
+
+
+def _write_city_batch(db: Session, batch: list[tuple[int, dict]], result: BoundaryImportResult):
+    # cities are master data: boundaries are attached to existing rows only
+    by_name = {(row["country_code"], row["name"]): (i, row) for i, row in batch if "city_id" not in row}
+    if by_name:
+        found = {
+            (c.country_code, c.name): c.city_id
+            for c in db.execute(
+                select(City.city_id, City.country_code, City.name)
+                .where(tuple_(City.country_code, City.name).in_(list(by_name.keys())))
+            )
+        }
+        for key, (i, row) in by_name.items():
+            if key in found:
+                row["city_id"] = found[key]
+            else:
+                result.reject(i, f"Unknown city {key[1]} ({key[0]})")
+
+    by_id = {row["city_id"]: (i, row) for i, row in batch if "city_id" in row}
+    if not by_id:
+        return
+
+    # explicit ids are checked like names: an UPDATE matching no row is not an import
+    known_cities = set(db.execute(
+        select(City.city_id).where(City.city_id.in_(list(by_id)))
+    ).scalars())
+
+    items = []
+    for city_id, (i, row) in by_id.items():
+        if city_id in known_cities:
+            items.append((i, row))
+        else:
+            result.reject(i, f"Unknown city_id {city_id}")
+    if not items:
+        return
+
+    invalid = _invalid_geometries(db, [row["geojson"] for _, row in items])
+    for pos, reason in invalid.items():
+        result.reject(items[pos][0], reason)
+
+    params = [
+        {"b_city_id": row["city_id"], "b_geojson": row["geojson"]}
+        for pos, (_, row) in enumerate(items) if pos not in invalid
+    ]
+    if params:
+        db.execute(
+            update(City.__table__)
+            .where(City.city_id == bindparam("b_city_id"))
+            .values(boundary=_simplified(bindparam("b_geojson")), updated_on=func.now()),
+            params
+        )
+        result.upserted += len(params)
+
+
+# =========================================================
+# ✅ Entry point (used by the admin route and the CLI)
+# =========================================================
+def import_boundaries(
+    db: Session,
+    fp: TextIO,
+    kind: str,
+    city_id: Optional[int] = None,
+    country_code: Optional[str] = None
+) -> BoundaryImportResult:
+    """
+    kind="zone": feature properties {name, city_id?}; city_id may be given
+                 once for the whole file. Upserts on (city_id, name).
+    kind="city": feature properties {city_id} or {name, country_code?};
+                 sets the boundary of existing cities.
+
+    Commits per batch, so a failure part-way keeps earlier batches.
+    Zone imports rebuild this process's zone index; other processes (the
+    API, when this runs from the CLI) see the change on their next
+    ZONE_INDEX_POLL_SECONDS poll.
+    Raises ValueError for an unreadable file.
+    """
+    if kind not in ("zone", "city"):
+        raise ValueError("kind must be 'zone' or 'city'")
+
+    result = BoundaryImportResult(kind=kind)
+    writer = _write_zone_batch if kind == "zone" else _write_city_batch
+    batch: list[tuple[int, dict]] = []
+
+    for i, feature in enumerate(iter_geojson_features(fp)):
+        result.features += 1
+        props = feature.get("properties") or {}
+
+        try:
+            row = {"geojson": _feature_polygon(feature)}
+            feature_city_id = _parse_city_id(props.get("city_id"))
+        except ValueError as e:
+            result.reject(i, str(e))
+            continue
+
+        name = str(props.get("name") or "").strip()
+
+        if kind == "zone":
+            row["city_id"] = feature_city_id or city_id or 0
+            row["name"] = name
+            if not row["city_id"] or not name:
+                result.reject(i, "Zone needs name and city_id")
+                continue
+        elif feature_city_id:
+            row["city_id"] = feature_city_id
+        else:
+            row["country_code"] = props.get("country_code") or country_code
+            row["name"] = name
+            if not row["country_code"] or not name:
+                result.reject(i, "City needs city_id, or name and country_code")
+                continue
+
+        batch.append((i, row))
+        if len(batch) >= settings.BOUNDARY_IMPORT_BATCH_SIZE:
+            writer(db, batch, result)
+            db.commit()
+            batch = []
+
+    if batch:
+        writer(db, batch, result)
+        db.commit()
+
+    # ✅ dispatch / quotes read zones from memory: swap in the new polygons
+    if kind == "zone":
+        zone_index.load(db)
+
+    return result
@@ -0,0 +1,328 @@
+import csv
+import json
+from typing import Iterator, Optional, TextIO
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.driver_profile import DriverProfile
+from app.models.fleet import Fleet
+from app.models.fleet_driver import FleetDriver
+from app.models.user import AppUser
+from app.models.user_role import UserRole
+from app.models.vehicle import Vehicle
+from app.models.vehicle_document import VehicleDocument
+from app.schemas.driver_management import AddDriverToFleetByEmailRequest
+from app.schemas.enums import TenantRoleEnum
+from app.schemas.vehicle_owner import BulkVehicleRow
+from app.services.readiness_engine import rebuild_counters, sweep
+from app.services.document_store import lock_blob_paths, acquire_blob_paths
+
+ManifestRow = tuple[int, Optional[dict], Optional[str]]  # (row_no, data, parse_error)
+
+
+# =========================================================
+# ✅ CSV / NDJSON manifests, read row by row
+# =========================================================
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/jsonl")
+JSON_ARRAY_ERROR = "Upload CSV or NDJSON (one JSON object per line, .ndjson / .jsonl); JSON arrays are not supported"
+
+
+def is_ndjson(filename: Optional[str], content_type: Optional[str]) -> bool:
+    """
+    .ndjson / .jsonl or an NDJSON content type -> NDJSON, else CSV.
+    Raises ValueError for plain JSON (.json / application/json).
+    """
+    name = (filename or "").lower()
+    content_type = (content_type or "").split(";")[0].strip().lower()
+
+    if name.endswith((".ndjson", ".jsonl")) or content_type in NDJSON_CONTENT_TYPES:
+        return True
+    if name.endswith(".json") or content_type == "application/json":
+        raise ValueError(JSON_ARRAY_ERROR)
+    return False
+
+
+def iter_manifest_rows(fp: TextIO, ndjson: bool) -> Iterator[ManifestRow]:
+    """
+    Yields (row_no, data, error). row_no is 1-based over data rows.
+    Raises ValueError for an NDJSON file that is really a JSON array.
+    """
+    if ndjson:
+        row_no = 0
+        for line in fp:
+            if not line.strip():
+                continue
+            if row_no == 0 and line.lstrip().startswith("["):
+                raise ValueError(JSON_ARRAY_ERROR)
+            row_no += 1
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield row_no, None, f"Invalid JSON: {e.msg}"
+                continue
+            if not isinstance(data, dict):
+                yield row_no, None, "Row must be a JSON object"
+                continue
+            yield row_no, data, None
+        return
+
+    for row_no, data in enumerate(csv.DictReader(fp), start=1):
+        yield row_no, {k.strip(): (v.strip() if isinstance(v, str) else v) for k, v in data.items() if k}, None
+
+
+def _batches(items: list, size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+# =========================================================
+# ✅ Drivers: email + driver_type per row
+# =========================================================
+def _validate_rows(rows: Iterator[ManifestRow], schema: type[BaseModel], key: str, results: list[dict]) -> dict:
+    """
+    Validates every row against `schema`; invalid and repeated-`key` rows
+    go straight to `results`. Returns key -> (row_no, payload), in file order.
+    """
+    valid: dict = {}
+
+    for row_no, data, error in rows:
+        if error:
+            results.append({"row": row_no, "status": "invalid", "detail": error})
+            continue
+        try:
+            payload = schema.model_validate(data)
+        except ValidationError as e:
+            results.append({"row": row_no, key: data.get(key), "status": "invalid",
+                            "detail": e.errors()[0]["msg"]})
+            continue
+
+        value = str(getattr(payload, key))
+        if value in valid:
+            results.append({"row": row_no, key: value, "status": "duplicate_in_file"})
+            continue
+        valid[value] = (row_no, payload)
+
+    return valid
+
+
+def bulk_add_drivers(db: Session, fleet: Fleet, created_by: int, rows: Iterator[ManifestRow]) -> list[dict]:
+    """
+    Same rules as add_driver_to_fleet_by_email, set-based per batch:
+    one IN query for users, one for active mappings, one for roles, then
+    bulk INSERTs (driver_profile via ON CONFLICT DO UPDATE).
+    Returns one result dict per input row. Does not commit.
+    """
+    results: list[dict] = []
+    valid = _validate_rows(rows, AddDriverToFleetByEmailRequest, "email", results)
+
+    for batch in _batches(list(valid.items()), settings.BULK_ONBOARD_BATCH_SIZE):
+        results.extend(_add_driver_batch(db, fleet, created_by, batch))
+
+    results.sort(key=lambda r: r["row"])
+    return results
+
+
+def _add_driver_batch(db: Session, fleet: Fleet, created_by: int, batch: list) -> list[dict]:
+    results = []
+
+    # ✅ 1) users by email
+    user_ids = dict(db.execute(
+        select(AppUser.email, AppUser.user_id).where(AppUser.email.in_([email for email, _ in batch]))
+    ).all())
+
+    # ✅ 2) already active in this fleet
+    active = set(db.execute(
+        select(FleetDriver.driver_id).where(
+            FleetDriver.fleet_id == fleet.fleet_id,
+            FleetDriver.driver_id.in_(user_ids.values()),
+            FleetDriver.end_date.is_(None)
+        )
+    ).scalars())
+
+    to_add: list[tuple[int, str, int, AddDriverToFleetByEmailRequest]] = []
+    for email, (row_no, payload) in batch:
+        user_id = user_ids.get(email)
+        if user_id is None:
+            results.append({"row": row_no, "email": email, "status": "user_not_found"})
+        elif user_id == created_by:
+            results.append({"row": row_no, "email": email, "status": "invalid",
+                            "detail": "Fleet owner cannot be added as a driver"})
+        elif user_id in active:
+            results.append({"row": row_no, "email": email, "status": "already_in_fleet"})
+        else:
+            to_add.append((row_no, email, user_id, payload))
+
+    if not to_add:
+        return results
+
+    driver_ids = [user_id for _, _, user_id, _ in to_add]
+
+    # ✅ 3) fleet_driver mappings
+    mapping_ids = dict(db.execute(
+        insert(FleetDriver)
+        .values([
+            {"fleet_id": fleet.fleet_id, "driver_id": user_id, "created_by": created_by}
+            for user_id in driver_ids
+        ])
+        .returning(FleetDriver.driver_id, FleetDriver.id)
+    ).all())
+
+    # ✅ 4) DRIVER role where not already active (user_roles has no unique key)
+    has_role = set(db.execute(
+        select(UserRole.user_id).where(
+            UserRole.user_id.in_(driver_ids),
+            UserRole.user_role == TenantRoleEnum.DRIVER,
+            UserRole.is_active == True
+        )
+    ).scalars())
+    new_roles = [
+        {"user_id": user_id, "user_role": TenantRoleEnum.DRIVER, "is_active": True}
+        for user_id in driver_ids if user_id not in has_role
+    ]
+    if new_roles:
+        db.execute(insert(UserRole).values(new_roles))
+
+    # ✅ 5) driver_profile: create, or move to this tenant + driver type
+    stmt = insert(DriverProfile).values([
+        {"driver_id": user_id, "tenant_id": fleet.tenant_id, "driver_type": payload.driver_type}
+        for _, _, user_id, payload in to_add
+    ])
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[DriverProfile.driver_id],
+        set_={
+            "driver_type": stmt.excluded.driver_type,
+            "tenant_id": stmt.excluded.tenant_id,
+            "updated_on": func.now(),
+        }
+    ))
+
+    # driver may have moved tenant: keep its queue row in step
+    rebuild_counters(db, "driver", driver_ids)
+
+    for row_no, email, user_id, _ in to_add:
+        results.append({"row": row_no, "email": email, "status": "added",
+                        "fleet_driver_id": mapping_ids[user_id]})
+
+    return results
+
+
+# =========================================================
+# ✅ Vehicles: registration_no, category, make, model, year + documents
+# =========================================================
+DOC_COLUMN_PREFIX = "doc_"
+
+
+def _vehicle_row(data: dict) -> dict:
+    """
+    CSV rows carry documents as doc_<type> columns (doc_insurance=...);
+    NDJSON rows may use either that or {"documents": {"INSURANCE": ...}}.
+    Empty CSV cells count as missing.
+    """
+    row = {k: v for k, v in data.items() if v not in ("", None)}
+    documents = dict(row.pop("documents", None) or {})
+    for k in [k for k in row if k.lower().startswith(DOC_COLUMN_PREFIX)]:
+        documents[k[len(DOC_COLUMN_PREFIX):].upper()] = row.pop(k)
+    # /uploads/blobs/... (served URL) and uploads/blobs/... are the same blob
+    row["documents"] = {k: v.lstrip("/") if isinstance(v, str) else v for k, v in documents.items()}
+    return row
+
+
+def bulk_add_vehicles(db: Session, fleet: Fleet, created_by: int, rows: Iterator[ManifestRow]) -> list[dict]:
+    """
+    Same rules as add_vehicle_to_fleet + upload_vehicle_document, per batch:
+    one IN query on registration_no, one for the referenced blobs, one
+    INSERT for vehicles, one for their documents (+ blob ref counts), then
+    one auto-approval pass over the new vehicles.
+    Returns one result dict per input row. Does not commit.
+    """
+    results: list[dict] = []
+    rows = ((row_no, _vehicle_row(data) if data else data, error) for row_no, data, error in rows)
+    valid = _validate_rows(rows, BulkVehicleRow, "registration_no", results)
+
+    for batch in _batches(list(valid.items()), settings.BULK_ONBOARD_BATCH_SIZE):
+        results.extend(_add_vehicle_batch(db, fleet, created_by, batch))
+
+    results.sort(key=lambda r: r["row"])
+    return results
+
+
+def _add_vehicle_batch(db: Session, fleet: Fleet, created_by: int, batch: list) -> list[dict]:
+    results = []
+
+    # ✅ 1) registration_no is UNIQUE: one set query for the whole batch
+    existing = set(db.execute(
+        select(Vehicle.registration_no).where(Vehicle.registration_no.in_([reg for reg, _ in batch]))
+    ).scalars())
+
+    # ✅ documents may only point at files uploaded through this API
+    # (stored blobs), never at arbitrary paths under /uploads
+    known_files = lock_blob_paths(db, (
+        file_url for _, (_, payload) in batch for file_url in payload.documents.values()
+    ))
+
+    to_add = {}
+    for reg, (row_no, payload) in batch:
+        unknown = sorted(set(payload.documents.values()) - known_files)
+        if reg in existing:
+            results.append({"row": row_no, "registration_no": reg, "status": "already_exists"})
+        elif unknown:
+            results.append({"row": row_no, "registration_no": reg, "status": "invalid",
+                            "detail": f"Unknown document file: {unknown[0]} (upload it first)"})
+        else:
+            to_add[reg] = (row_no, payload)
+
+    if not to_add:
+        return results
+
+    # ✅ 2) vehicles; DO NOTHING covers a concurrent insert of the same number
+    stmt = insert(Vehicle).values([
+        {
+            "tenant_id": fleet.tenant_id,
+            "fleet_id": fleet.fleet_id,
+            "category": payload.category,
+            "registration_no": reg,
+            "make": payload.make,
+            "model": payload.model,
+            "year_of_manufacture": payload.year_of_manufacture,
+            "created_by": created_by,
+        }
+        for reg, (_, payload) in to_add.items()
+    ])
+    vehicle_ids = dict(db.execute(
+        stmt.on_conflict_do_nothing(index_elements=[Vehicle.registration_no])
+        .returning(Vehicle.registration_no, Vehicle.vehicle_id)
+    ).all())
+
+    # ✅ 3) documents for the vehicles actually inserted
+    docs = [
+        {"vehicle_id": vehicle_ids[reg], "document_type": doc_type, "file_url": file_url, "created_by": created_by}
+        for reg, (_, payload) in to_add.items() if reg in vehicle_ids
+        for doc_type, file_url in payload.documents.items()
+    ]
+    if docs:
+        db.execute(insert(VehicleDocument).values(docs))
+        acquire_blob_paths(db, [doc["file_url"] for doc in docs])
+
+    # ✅ 4) single auto-approval pass over the affected vehicles
+    rebuild_counters(db, "vehicle", vehicle_ids.values())
+    approved = set(sweep(db, "vehicle", vehicle_ids.values()))
+
+    for reg, (row_no, payload) in to_add.items():
+        vehicle_id = vehicle_ids.get(reg)
+        if vehicle_id is None:
+            results.append({"row": row_no, "registration_no": reg, "status": "already_exists"})
+            continue
+        results.append({
+            "row": row_no,
+            "registration_no": reg,
+            "status": "added",
+            "vehicle_id": vehicle_id,
+            "documents": len(payload.documents),
+            "approved": vehicle_id in approved,
+        })
+
+    return results
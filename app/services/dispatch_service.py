@@ -9,6 +9,9 @@ from app.models.driver_shift import DriverShift
 from app.models.driver_profile import DriverProfile
 from app.models.driver_vehicle_assignment import DriverVehicleAssignment
 from app.models.vehicle import Vehicle
+from app.core.metrics import dispatch_offers, dispatch_time_to_assign
+from app.services.surge_service import surge_engine
+from app.services.fleet_live import fleet_live
 
 from app.schemas.enums import (
     ApprovalStatusEnum,
@@ -83,6 +86,7 @@ def create_first_offer(
 
     db.add(attempt)
     db.flush()
+    dispatch_offers.inc("sent")
     return attempt
 
 
@@ -115,6 +119,7 @@ def send_next_offer(
         )
         db.add(attempt)
         db.flush()
+        dispatch_offers.inc("sent")
         return attempt
 
     return None
@@ -162,3 +167,11 @@ def assign_trip(
     if shift:
         shift.status = "ON_TRIP"
         shift.vehicle_id = assignment.vehicle_id
+
+    if trip.requested_at:
+        dispatch_time_to_assign.observe((now - trip.requested_at).total_seconds())
+
+    # ✅ trip leaves demand, driver leaves idle supply
+    surge_engine.record_trip_closed(trip.trip_id)
+    surge_engine.record_driver_unavailable(driver_id)
+    fleet_live.record_on_commit(db, driver_id, at=now, status="ON_TRIP", vehicle_id=assignment.vehicle_id)
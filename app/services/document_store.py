@@ -0,0 +1,285 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+
+from sqlalchemy import select, update, delete, bindparam, union_all, func, exists
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.fleet_document import FleetDocument
+from app.models.stored_blob import StoredBlob
+from app.models.vehicle_document import VehicleDocument
+from app.utils.file_storage import BLOB_FOLDER, StoredFile, thumbnail_path, _remove_quietly
+from app.utils.thumbnails import render_thumbnail
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_EXTS = {".jpg", ".jpeg", ".png", ".webp", ".bmp", ".tif", ".tiff"}
+
+
+@dataclass(frozen=True)
+class BlobRef:
+    sha256: str
+    path: str
+    needs_thumbnail: bool
+
+
+# =========================================================
+# ✅ Reference counting (same transaction as the document row)
+# =========================================================
+def acquire_blob(db: Session, stored: StoredFile) -> BlobRef:
+    """
+    Registers one more document pointing at this content. Returns the
+    canonical path to store in file_url. Does not commit.
+    """
+    stmt = insert(StoredBlob).values(sha256=stored.sha256, path=stored.path, size=stored.size, ref_count=1)
+    row = db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[StoredBlob.sha256],
+            set_={"ref_count": StoredBlob.ref_count + 1}
+        ).returning(StoredBlob.path, StoredBlob.thumbnail_path)
+    ).one()
+
+    # same bytes first uploaded under another extension: keep one copy
+    if stored.created and row.path != stored.path:
+        _remove_quietly(stored.path)
+
+    ext = os.path.splitext(row.path)[-1].lower()
+    return BlobRef(
+        sha256=stored.sha256,
+        path=row.path,
+        needs_thumbnail=row.thumbnail_path is None and ext in THUMBNAIL_EXTS,
+    )
+
+
+def lock_blob_paths(db: Session, paths: Iterable[str]) -> set[str]:
+    """
+    The subset of `paths` that are stored blobs, row-locked until commit
+    so a concurrent release_blob cannot delete them before they are
+    referenced (acquire_blob_paths).
+    """
+    paths = set(paths)
+    if not paths:
+        return set()
+    return set(db.execute(
+        select(StoredBlob.path).where(StoredBlob.path.in_(paths)).with_for_update()
+    ).scalars())
+
+
+def acquire_blob_paths(db: Session, paths: Iterable[str]):
+    """
+    One more reference per occurrence of each (already stored) path,
+    one executemany UPDATE. Does not commit.
+    """
+    counts = Counter(paths)
+    if not counts:
+        return
+    blob = StoredBlob.__table__
+    db.execute(
+        update(blob)
+        .where(blob.c.path == bindparam("b_path"))
+        .values(ref_count=blob.c.ref_count + bindparam("b_refs")),
+        [{"b_path": path, "b_refs": n} for path, n in counts.items()]
+    )
+
+
+def release_blob(db: Session, path: str) -> list[str]:
+    """
+    Drops one reference. When none are left the row is deleted and the
+    file paths are returned, to be removed once the transaction commits.
+    """
+    row = db.execute(
+        update(StoredBlob)
+        .where(StoredBlob.path == path)
+        .values(ref_count=StoredBlob.ref_count - 1)
+        .returning(StoredBlob.sha256, StoredBlob.ref_count, StoredBlob.thumbnail_path)
+    ).one_or_none()
+
+    if row is None or row.ref_count > 0:
+        return []
+
+    db.execute(delete(StoredBlob).where(StoredBlob.sha256 == row.sha256))
+    return [p for p in (path, row.thumbnail_path) if p]
+
+
+# rows / files this young may belong to an upload whose document is not committed yet
+RECONCILE_GRACE = timedelta(hours=1)
+SWEEP_BATCH_SIZE = 1000
+
+
+def reconcile_blobs(db: Session) -> list[str]:
+    """
+    Recounts ref_count from the document tables and deletes blobs nothing
+    references any more (documents removed by ON DELETE CASCADE never
+    call release_blob). Returns file paths to remove after commit.
+    """
+    refs = union_all(
+        select(FleetDocument.file_url.label("path")),
+        select(VehicleDocument.file_url.label("path")),
+    ).subquery("refs")
+
+    ref_count = (
+        select(func.count())
+        .select_from(refs)
+        .where(refs.c.path == StoredBlob.path)
+        .scalar_subquery()
+    )
+    db.execute(
+        update(StoredBlob)
+        .values(ref_count=ref_count)
+        .execution_options(synchronize_session=False)
+    )
+
+    orphans = db.execute(
+        delete(StoredBlob)
+        .where(
+            StoredBlob.created_on < datetime.now(timezone.utc) - RECONCILE_GRACE,
+            ~exists().where(refs.c.path == StoredBlob.path),
+        )
+        .returning(StoredBlob.path, StoredBlob.thumbnail_path)
+    ).all()
+
+    return [p for row in orphans for p in (row.path, row.thumbnail_path) if p]
+
+
+def remove_files(paths: Iterable[str]):
+    for path in paths:
+        _remove_quietly(path)
+
+
+def _unclaimed(db: Session, paths: list[str]) -> list[str]:
+    claimed = set(db.execute(select(StoredBlob.path).where(StoredBlob.path.in_(paths))).scalars())
+    return [p for p in paths if p not in claimed]
+
+
+def sweep_orphan_files(db: Session) -> int:
+    """
+    Removes blob files (and abandoned .part uploads) that no stored_blob
+    row claims and that are older than RECONCILE_GRACE: uploads whose
+    document insert failed leave their file for this sweep rather than
+    racing a concurrent upload of the same bytes. _publish refreshes the
+    mtime of a file it reuses, so a file about to be claimed is young.
+    Returns the number of files removed.
+    """
+    root = os.path.join(settings.UPLOAD_BASE, BLOB_FOLDER)
+    cutoff = (datetime.now(timezone.utc) - RECONCILE_GRACE).timestamp()
+
+    def old(path: str) -> bool:
+        try:
+            return os.path.getmtime(path) < cutoff
+        except FileNotFoundError:
+            return False
+
+    removed = 0
+    tmp_dir = os.path.join(root, ".tmp")
+    if os.path.isdir(tmp_dir):
+        for entry in os.scandir(tmp_dir):
+            if entry.is_file() and old(entry.path):
+                _remove_quietly(entry.path)
+                removed += 1
+
+    candidates: list[str] = []
+
+    def flush():
+        nonlocal removed
+        for path in _unclaimed(db, candidates):
+            # re-check right before removing: a reuse may have touched it
+            if old(path):
+                _remove_quietly(path)
+                removed += 1
+        candidates.clear()
+
+    if not os.path.isdir(root):
+        return removed
+    for fan_out in os.scandir(root):
+        if not fan_out.is_dir() or fan_out.name == ".tmp":
+            continue
+        for entry in os.scandir(fan_out.path):
+            if entry.is_file() and old(entry.path):
+                candidates.append(os.path.join(root, fan_out.name, entry.name))
+                if len(candidates) >= SWEEP_BATCH_SIZE:
+                    flush()
+    flush()
+    return removed
+
+
+def thumbnail_urls(db: Session, paths: Iterable[str]) -> dict[str, str]:
+    """
+    file_url -> thumbnail path for the ones that have a preview, one query.
+    """
+    paths = list(set(paths))
+    if not paths:
+        return {}
+    return dict(db.execute(
+        select(StoredBlob.path, StoredBlob.thumbnail_path)
+        .where(StoredBlob.path.in_(paths), StoredBlob.thumbnail_path.isnot(None))
+    ).all())
+
+
+# =========================================================
+# ✅ Thumbnails on a process pool (CPU-bound decode/resize)
+# =========================================================
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _thumbnail_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking a threaded server process is unsafe
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.THUMBNAIL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def shutdown_thumbnail_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def _save_thumbnail_path(sha256: str, path: str):
+    db = SessionLocal()
+    try:
+        db.execute(update(StoredBlob).where(StoredBlob.sha256 == sha256).values(thumbnail_path=path))
+        db.commit()
+    finally:
+        db.close()
+
+
+async def generate_thumbnail(blob: BlobRef):
+    """
+    Background task (runs after the upload response is sent).
+    Failures only mean no preview: the full file is still served.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        dst = await loop.run_in_executor(
+            _thumbnail_pool(), render_thumbnail, blob.path, thumbnail_path(blob.sha256), settings.THUMBNAIL_SIZE
+        )
+    except BrokenProcessPool as e:
+        # a worker died (e.g. OOM on a huge image): start a fresh pool next time
+        shutdown_thumbnail_pool()
+        logger.warning("thumbnail for %s failed: %s", blob.path, e)
+        return
+    except Exception as e:
+        logger.warning("thumbnail for %s failed: %s", blob.path, e)
+        return
+
+    await run_in_threadpool(_save_thumbnail_path, blob.sha256, dst)
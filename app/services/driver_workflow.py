@@ -1,11 +1,12 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import select, and_
+from sqlalchemy import select, update
 from datetime import datetime, timezone
 
 from app.models.driver_document import DriverDocument
 from app.models.driver_profile import DriverProfile
 from app.models.fleet_driver import FleetDriver
 from app.schemas.enums import DriverDocumentTypeEnum, ApprovalStatusEnum
+from app.services.readiness_engine import ReadinessRule, Approvals, register_rule, doc_status, sweep
 
 REQUIRED_DRIVER_DOCS = {
     DriverDocumentTypeEnum.DRIVING_LICENSE,
@@ -21,47 +22,41 @@ def get_uploaded_driver_docs(db: Session, driver_id: int):
 
 
 def compute_driver_doc_status(docs: list[DriverDocument]):
-    uploaded_types = {d.document_type for d in docs}
-    missing = list(REQUIRED_DRIVER_DOCS - uploaded_types)
-
-    all_uploaded = len(missing) == 0
-    all_approved = all_uploaded and all(
-        d.verification_status == ApprovalStatusEnum.APPROVED for d in docs
-    )
-
-    verified_by_set = {d.verified_by for d in docs if d.verified_by is not None}
-    approved_by_same_admin = all_approved and len(verified_by_set) == 1
-
-    return missing, all_uploaded, all_approved, approved_by_same_admin
+    return doc_status("driver", docs)
 
 
 def auto_approve_driver_if_ready(db: Session, driver_id: int):
-    docs = get_uploaded_driver_docs(db, driver_id)
-    missing, all_uploaded, all_approved, approved_by_same_admin = compute_driver_doc_status(docs)
+    return driver_id in sweep(db, "driver", [driver_id])
 
-    if not (all_uploaded and all_approved and approved_by_same_admin):
-        return False
 
-    # ✅ approve driver profile
-    profile = db.execute(
-        select(DriverProfile).where(DriverProfile.driver_id == driver_id)
-    ).scalar_one_or_none()
+def _approve_drivers(db: Session, approvals: Approvals):
+    driver_ids = [driver_id for driver_id, _ in approvals]
 
-    if profile:
-        profile.approval_status = ApprovalStatusEnum.APPROVED
-        profile.updated_on = datetime.now(timezone.utc)
+    # ✅ approve driver profiles
+    db.execute(
+        update(DriverProfile)
+        .where(DriverProfile.driver_id.in_(driver_ids))
+        .values(approval_status=ApprovalStatusEnum.APPROVED, updated_on=datetime.now(timezone.utc))
+        .execution_options(synchronize_session=False)
+    )
 
-    # ✅ approve fleet_driver mapping
-    fleet_driver = db.execute(
-        select(FleetDriver).where(
-            and_(
-                FleetDriver.driver_id == driver_id,
-                FleetDriver.end_date.is_(None)
-            )
-        )
-    ).scalar_one_or_none()
+    # ✅ approve active fleet_driver mappings
+    db.execute(
+        update(FleetDriver)
+        .where(FleetDriver.driver_id.in_(driver_ids), FleetDriver.end_date.is_(None))
+        .values(approval_status=ApprovalStatusEnum.APPROVED)
+        .execution_options(synchronize_session=False)
+    )
 
-    if fleet_driver:
-        fleet_driver.approval_status = ApprovalStatusEnum.APPROVED
 
-    return True
+register_rule(ReadinessRule(
+    entity_type="driver",
+    label="Driver",
+    document=DriverDocument,
+    owner_column="driver_id",
+    owner_key=DriverProfile.driver_id,
+    owner_tenant=DriverProfile.tenant_id,
+    owner_status=DriverProfile.approval_status,
+    required=frozenset(REQUIRED_DRIVER_DOCS),
+    approve=_approve_drivers,
+))
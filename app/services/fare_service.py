@@ -1,9 +1,107 @@
-from sqlalchemy import select, and_
+from dataclasses import dataclass, fields
+from datetime import datetime
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Optional
+
+from geoalchemy2 import Geography
+from sqlalchemy import select, update, func, cast, or_, Numeric, literal
 from sqlalchemy.orm import Session
 
 from app.models.fare_config import FareConfig
+from app.models.trip import Trip
+from app.models.trip_fare_breakdown import TripFareBreakdown
+from app.schemas.enums import TripStatusEnum, VehicleCategoryEnum
+from app.services.pricing_cache import (
+    FareConfigSnapshot,
+    get_fare_config,
+    get_city_fare_configs,
+)
+from app.services.surge_service import surge_engine
 from app.services.tax_service import get_tax_amount
 
+CENT = Decimal("0.01")
+KM_PRECISION = Decimal("0.001")
+ZERO = Decimal("0")
+
+
+def _money(value: Decimal) -> Decimal:
+    return value.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+@dataclass(slots=True)
+class FareBreakdown:
+    """
+    Exact fare components (all Decimal, rounded to cents).
+    Mirrors trip_fare_breakdown columns.
+    """
+    base_fare: Decimal
+    distance_fare: Decimal
+    time_fare: Decimal
+    surge_multiplier: Decimal
+    surge_amount: Decimal
+    tax_amount: Decimal
+    discount_amount: Decimal
+    final_fare: Decimal
+
+    def to_model(self, trip_id: int) -> TripFareBreakdown:
+        return TripFareBreakdown(
+            trip_id=trip_id,
+            base_fare=self.base_fare,
+            distance_fare=self.distance_fare,
+            time_fare=self.time_fare,
+            surge_amount=self.surge_amount,
+            tax_amount=self.tax_amount,
+            discount_amount=self.discount_amount,
+            final_fare=self.final_fare,
+        )
+
+    def to_dict(self) -> dict[str, str]:
+        # strings keep Decimals exact through JSON (quote tokens)
+        return {f.name: str(getattr(self, f.name)) for f in fields(self)}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FareBreakdown":
+        return cls(**{f.name: Decimal(data[f.name]) for f in fields(cls)})
+
+
+def _price(
+    db: Session,
+    config: FareConfigSnapshot,
+    distance_km: float,
+    duration_minutes: float,
+    zone_id: Optional[int]
+) -> FareBreakdown:
+    # ✅ only the two float inputs are converted, once; config values are already Decimal
+    distance = Decimal(str(distance_km)).quantize(KM_PRECISION, rounding=ROUND_HALF_UP)
+    duration = Decimal(str(duration_minutes))
+
+    base = config.base_fare
+    distance_fare = _money(distance * config.per_km_rate)
+    time_fare = _money(duration * config.per_min_rate)
+
+    subtotal = base + distance_fare + time_fare
+
+    if config.minimum_fare:
+        subtotal = max(subtotal, config.minimum_fare)
+
+    # ✅ O(1) read of the live multiplier for this zone + category
+    surge_multiplier = surge_engine.get_multiplier(zone_id, config.vehicle_category)
+    surge_amount = _money(subtotal * (surge_multiplier - 1))
+
+    taxable = subtotal + surge_amount
+    tax = _money(get_tax_amount(db, config.tenant_id, taxable))
+
+    return FareBreakdown(
+        base_fare=base,
+        distance_fare=distance_fare,
+        time_fare=time_fare,
+        surge_multiplier=surge_multiplier,
+        surge_amount=surge_amount,
+        tax_amount=tax,
+        discount_amount=ZERO,
+        final_fare=taxable + tax,
+    )
+
 
 def calculate_fare(
     db: Session,
@@ -11,44 +109,209 @@ def calculate_fare(
     city_id: int,
     vehicle_category,
     distance_km: float,
-    duration_minutes: float = 0
+    duration_minutes: float = 0,
+    zone_id: Optional[int] = None
+) -> FareBreakdown:
+    """
+    Uses ACTIVE + LATEST fare_config effective right now (served from pricing cache)
+    """
+
+    config = get_fare_config(db, tenant_id, city_id, vehicle_category)
+
+    if not config:
+        raise ValueError("Fare configuration not found")
+
+    return _price(db, config, distance_km, duration_minutes, zone_id)
+
+
+def calculate_fares_for_city(
+    db: Session,
+    tenant_id: int,
+    city_id: int,
+    distance_km: float,
+    duration_minutes: float = 0,
+    zone_id: Optional[int] = None
+) -> dict[VehicleCategoryEnum, FareBreakdown]:
+    """
+    Prices every vehicle category configured for the city in one pass.
+    Unconfigured categories are skipped.
+    """
+    configs = get_city_fare_configs(db, tenant_id, city_id)
+
+    return {
+        category: _price(db, config, distance_km, duration_minutes, zone_id)
+        for category, config in configs.items()
+    }
+
+
+# =========================================================
+# ✅ What-if: reprice historical trips against a candidate config
+# =========================================================
+def reprice_trips_query(
+    tenant_id: int,
+    city_id: int,
+    vehicle_category: VehicleCategoryEnum,
+    base_fare: Decimal,
+    per_km_rate: Decimal,
+    per_min_rate: Decimal,
+    minimum_fare: Optional[Decimal],
+    tax_rate: Decimal,
+    completed_from: Optional[datetime] = None,
+    completed_to: Optional[datetime] = None,
 ):
     """
-    Uses ACTIVE + LATEST fare_config
+    Set-based repricing: Postgres evaluates the fare formula over all
+    matching COMPLETED trips in one statement, in NUMERIC (exact) math.
+    Returns a subquery with trip_id, current_fare, projected_fare.
+
+    Surge and discounts are not replayed (no per-trip multiplier is stored).
+    """
+    money = Numeric(10, 2)
+    geography = Geography(geometry_type="POINT", srid=4326)
+
+    def point(lng, lat):
+        return cast(func.ST_SetSRID(func.ST_MakePoint(lng, lat), 4326), geography)
+
+    distance_km = cast(
+        func.ST_Distance(point(Trip.pickup_lng, Trip.pickup_lat), point(Trip.drop_lng, Trip.drop_lat)) / 1000,
+        Numeric(12, 3)
+    )
+    duration_min = cast(
+        func.coalesce(func.extract("epoch", Trip.completed_at - Trip.picked_up_at), 0) / 60,
+        Numeric(10, 2)
+    )
+
+    trips = (
+        select(
+            Trip.trip_id,
+            Trip.fare_amount.label("current_fare"),
+            distance_km.label("distance_km"),
+            duration_min.label("duration_min"),
+        )
+        .where(
+            Trip.tenant_id == tenant_id,
+            Trip.city_id == city_id,
+            Trip.vehicle_category == vehicle_category,
+            Trip.status == TripStatusEnum.COMPLETED,
+            Trip.drop_lat.isnot(None),
+        )
+    )
+    if completed_from:
+        trips = trips.where(Trip.completed_at >= completed_from)
+    if completed_to:
+        trips = trips.where(Trip.completed_at < completed_to)
+    trips = trips.subquery("t")
+
+    subtotal = (
+        literal(base_fare, money)
+        + func.round(trips.c.distance_km * literal(per_km_rate, money), 2)
+        + func.round(trips.c.duration_min * literal(per_min_rate, money), 2)
+    )
+    if minimum_fare is not None:
+        subtotal = func.greatest(subtotal, literal(minimum_fare, money))
+
+    subtotal = subtotal.label("subtotal")
+    priced = select(trips.c.trip_id, trips.c.current_fare, subtotal).subquery("p")
+
+    projected = priced.c.subtotal + func.round(priced.c.subtotal * literal(tax_rate, Numeric(5, 2)) / 100, 2)
+
+    return select(
+        priced.c.trip_id,
+        priced.c.current_fare,
+        projected.label("projected_fare"),
+    ).subquery("repriced")
+
+
+# =========================================================
+# ✅ Earnings split: driver share / platform commission
+# =========================================================
+def split_fare(
+    fare_amount: Optional[Decimal],
+    tax_amount: Optional[Decimal],
+    commission_percent: Optional[Decimal]
+) -> tuple[Decimal, Decimal]:
+    """
+    Returns (driver_earning, platform_fee). Commission is taken on the
+    fare net of tax; tax is remitted, so it is neither party's.
     """
+    net = (fare_amount or ZERO) - (tax_amount or ZERO)
+    platform_fee = _money(net * (commission_percent or ZERO) / 100)
+    return net - platform_fee, platform_fee
+
 
-    config = db.execute(
-        select(FareConfig)
+def _commission_at(tenant_id, city_id, vehicle_category, at):
+    """
+    platform_commission_percent of the config effective at `at`, by its
+    historical window (the pricing cache only keeps configs effective now).
+    Arguments may be values or Trip columns (correlated).
+    """
+    return (
+        select(FareConfig.platform_commission_percent)
         .where(
-            and_(
-                FareConfig.tenant_id == tenant_id,
-                FareConfig.city_id == city_id,
-                FareConfig.vehicle_category == vehicle_category,
-                FareConfig.is_active == True,
-                FareConfig.effective_to.is_(None)
+            FareConfig.tenant_id == tenant_id,
+            FareConfig.city_id == city_id,
+            FareConfig.vehicle_category == vehicle_category,
+            FareConfig.is_active == True,
+            FareConfig.effective_from <= at,
+            or_(
+                FareConfig.effective_to.is_(None),
+                FareConfig.effective_to > at
             )
         )
         .order_by(FareConfig.effective_from.desc())
-    ).scalar_one_or_none()
+        .limit(1)
+        .scalar_subquery()
+    )
 
-    if not config:
-        raise ValueError("Fare configuration not found")
 
-    base = float(config.base_fare)
-    distance_fare = distance_km * float(config.per_km_rate)
-    time_fare = duration_minutes * float(config.per_min_rate)
+def _trip_tax(trip_id):
+    return (
+        select(TripFareBreakdown.tax_amount)
+        .where(TripFareBreakdown.trip_id == trip_id)
+        .order_by(TripFareBreakdown.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
 
-    subtotal = base + distance_fare + time_fare
 
-    if config.minimum_fare:
-        subtotal = max(subtotal, float(config.minimum_fare))
+def settle_trip_earnings(db: Session, trip: Trip):
+    """
+    Sets trip.driver_earning / trip.platform_fee on completion, using the
+    commission of the fare config the trip was priced under (the one
+    effective at requested_at, even if it has expired since).
+    Does not commit.
+    """
+    commission, tax = db.execute(
+        select(
+            _commission_at(trip.tenant_id, trip.city_id, trip.vehicle_category, trip.requested_at),
+            _trip_tax(trip.trip_id),
+        )
+    ).one()
 
-    tax = get_tax_amount(db, tenant_id, subtotal)
+    trip.driver_earning, trip.platform_fee = split_fare(trip.fare_amount, tax, commission)
 
-    return {
-        "base_fare": base,
-        "distance_fare": distance_fare,
-        "time_fare": time_fare,
-        "tax": tax,
-        "total_fare": subtotal + tax
-    }
+
+def backfill_trip_earnings(db: Session, completed_from: datetime) -> int:
+    """
+    Set-based settle_trip_earnings for COMPLETED trips that never got one
+    (completed before it existed). Same rule, in NUMERIC. Returns rows
+    updated. Does not commit.
+    """
+    tax = _trip_tax(Trip.trip_id)
+    commission = _commission_at(Trip.tenant_id, Trip.city_id, Trip.vehicle_category, Trip.requested_at)
+
+    net = Trip.fare_amount - func.coalesce(tax, 0)
+    platform_fee = func.round(net * func.coalesce(commission, 0) / 100, 2)
+
+    result = db.execute(
+        update(Trip)
+        .where(
+            Trip.status == TripStatusEnum.COMPLETED,
+            Trip.completed_at >= completed_from,
+            Trip.fare_amount.isnot(None),
+            Trip.driver_earning.is_(None),
+        )
+        .values(platform_fee=platform_fee, driver_earning=net - platform_fee)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
@@ -0,0 +1,213 @@
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Iterator, Optional
+
+from sqlalchemy import select, delete, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.driver_shift import DriverShift
+from app.models.fleet_stats_rollup import FleetStatsRollup
+from app.models.trip import Trip
+from app.models.vehicle import Vehicle
+from app.schemas.enums import TripStatusEnum
+from app.services.fare_service import backfill_trip_earnings
+from app.services.geo_utils import haversine_km
+
+SCOPES = ("fleet", "vehicle", "driver")
+GRANULARITIES = ("hour", "day")
+MEASURES = ("trips", "distance_km", "trip_minutes", "online_minutes", "fare_total", "driver_earnings")
+
+UPSERT_BATCH_SIZE = 1000
+STREAM_BATCH_SIZE = 1000
+
+# (fleet_id, scope, scope_id, granularity, bucket_start)
+RollupKey = tuple[int, str, int, str, datetime]
+
+HOUR = timedelta(hours=1)
+CENTS = Decimal("0.01")
+
+
+# =========================================================
+# ✅ Buckets (UTC; hourly rows let dashboards re-bucket to local days)
+# =========================================================
+def bucket_start(at: datetime, granularity: str) -> datetime:
+    at = at.astimezone(timezone.utc)
+    if granularity == "day":
+        return at.replace(hour=0, minute=0, second=0, microsecond=0)
+    return at.replace(minute=0, second=0, microsecond=0)
+
+
+def _split_hours(start: datetime, end: datetime) -> Iterator[tuple[datetime, Decimal]]:
+    """(hour_start, minutes inside that hour) for every hour [start, end) touches."""
+    cursor = start
+    while cursor < end:
+        hour = bucket_start(cursor, "hour")
+        upto = min(hour + HOUR, end)
+        yield hour, (Decimal((upto - cursor).total_seconds()) / 60).quantize(CENTS)
+        cursor = upto
+
+
+class RollupBatch:
+    """
+    Sums measures per rollup row in memory, then writes them with one
+    INSERT ... ON CONFLICT DO UPDATE (counter += excluded) per chunk.
+    """
+
+    def __init__(self):
+        self.rows: dict[RollupKey, dict] = {}
+
+    def add(self, fleet_id: int, vehicle_id: Optional[int], driver_id: Optional[int], at: datetime, **measures):
+        for granularity in GRANULARITIES:
+            bucket = bucket_start(at, granularity)
+            for scope, scope_id in (("fleet", fleet_id), ("vehicle", vehicle_id), ("driver", driver_id)):
+                if scope_id is None:
+                    continue
+                row = self.rows.setdefault((fleet_id, scope, scope_id, granularity, bucket), dict.fromkeys(MEASURES, 0))
+                for measure, value in measures.items():
+                    row[measure] += value
+
+    def add_interval(self, fleet_id, vehicle_id, driver_id, start: datetime, end: datetime, measure: str):
+        for hour, minutes in _split_hours(start, end):
+            self.add(fleet_id, vehicle_id, driver_id, hour, **{measure: minutes})
+
+    def flush(self, db: Session):
+        # sorted: concurrent writers lock shared rows (the fleet's) in the same order
+        keys = sorted(self.rows)
+        for i in range(0, len(keys), UPSERT_BATCH_SIZE):
+            values = [
+                {
+                    "fleet_id": fleet_id, "scope": scope, "scope_id": scope_id,
+                    "granularity": granularity, "bucket_start": bucket,
+                    **self.rows[(fleet_id, scope, scope_id, granularity, bucket)],
+                }
+                for fleet_id, scope, scope_id, granularity, bucket in keys[i:i + UPSERT_BATCH_SIZE]
+            ]
+            stmt = insert(FleetStatsRollup).values(values)
+            db.execute(stmt.on_conflict_do_update(
+                constraint="uq_fleet_stats_rollup_bucket",
+                set_={
+                    **{m: getattr(FleetStatsRollup, m) + getattr(stmt.excluded, m) for m in MEASURES},
+                    "updated_on": func.now(),
+                }
+            ))
+        self.rows.clear()
+
+
+# =========================================================
+# ✅ Event measures
+# =========================================================
+def _add_trip(batch: RollupBatch, fleet_id: int, trip, since: Optional[datetime] = None):
+    distance = Decimal(0)
+    if trip.drop_lat is not None and trip.drop_lng is not None:
+        distance = Decimal(str(round(haversine_km(
+            float(trip.pickup_lat), float(trip.pickup_lng), float(trip.drop_lat), float(trip.drop_lng)
+        ), 3)))
+
+    # counts and money land in the completion hour
+    batch.add(
+        fleet_id, trip.vehicle_id, trip.driver_id, trip.completed_at,
+        trips=1,
+        distance_km=distance,
+        fare_total=trip.fare_amount or 0,
+        driver_earnings=trip.driver_earning or 0,
+    )
+
+    # engaged time (assignment -> drop) is spread over the hours it covers
+    engaged_from = trip.assigned_at or trip.picked_up_at
+    if engaged_from:
+        batch.add_interval(
+            fleet_id, trip.vehicle_id, trip.driver_id,
+            max(engaged_from, since) if since else engaged_from, trip.completed_at, "trip_minutes"
+        )
+
+
+def _add_shift(batch: RollupBatch, fleet_id: int, shift, since: Optional[datetime] = None):
+    start = max(shift.started_at, since) if since else shift.started_at
+    batch.add_interval(fleet_id, shift.vehicle_id, shift.driver_id, start, shift.ended_at, "online_minutes")
+
+
+def _vehicle_fleet(db: Session, vehicle_id: Optional[int]) -> Optional[int]:
+    if vehicle_id is None:
+        return None
+    return db.execute(select(Vehicle.fleet_id).where(Vehicle.vehicle_id == vehicle_id)).scalar_one_or_none()
+
+
+def record_trip_completed(db: Session, trip: Trip):
+    """
+    Adds a COMPLETED trip to its fleet's rollups. Call in the same
+    transaction as the completion so it is counted exactly once.
+    Trips on non-fleet vehicles are ignored. Does not commit.
+    """
+    fleet_id = _vehicle_fleet(db, trip.vehicle_id)
+    if fleet_id is None or trip.completed_at is None:
+        return
+    batch = RollupBatch()
+    _add_trip(batch, fleet_id, trip)
+    batch.flush(db)
+
+
+def record_shift_closed(db: Session, shift: DriverShift):
+    """
+    Adds a closed shift's online time (per hour) to the rollups of the
+    fleet owning the shift's vehicle. Does not commit.
+    """
+    fleet_id = _vehicle_fleet(db, shift.vehicle_id)
+    if fleet_id is None or shift.ended_at is None:
+        return
+    batch = RollupBatch()
+    _add_shift(batch, fleet_id, shift)
+    batch.flush(db)
+
+
+# =========================================================
+# ✅ Backfill / rebuild (CLI)
+# =========================================================
+def rebuild_rollups(db: Session, since: datetime, fleet_id: Optional[int] = None) -> int:
+    """
+    Recomputes every rollup from `since` (rounded down to a UTC day) from
+    the trip and driver_shift tables, streaming rows. Trips and shifts
+    that started earlier only count their part after `since`. Completed
+    trips without driver_earning are settled first (same rule as at
+    completion). Returns the number of rollup rows written. Does not commit.
+    """
+    since = bucket_start(since, "day")
+
+    backfill_trip_earnings(db, since)
+
+    cleanup = delete(FleetStatsRollup).where(FleetStatsRollup.bucket_start >= since)
+    if fleet_id is not None:
+        cleanup = cleanup.where(FleetStatsRollup.fleet_id == fleet_id)
+    db.execute(cleanup)
+
+    batch = RollupBatch()
+
+    trips = (
+        select(Trip, Vehicle.fleet_id)
+        .join(Vehicle, Vehicle.vehicle_id == Trip.vehicle_id)
+        .where(
+            Vehicle.fleet_id.isnot(None),
+            Trip.status == TripStatusEnum.COMPLETED,
+            Trip.completed_at >= since,
+        )
+    )
+    shifts = (
+        select(DriverShift, Vehicle.fleet_id)
+        .join(Vehicle, Vehicle.vehicle_id == DriverShift.vehicle_id)
+        .where(
+            Vehicle.fleet_id.isnot(None),
+            DriverShift.ended_at >= since,
+        )
+    )
+    if fleet_id is not None:
+        trips = trips.where(Vehicle.fleet_id == fleet_id)
+        shifts = shifts.where(Vehicle.fleet_id == fleet_id)
+
+    for trip, trip_fleet_id in db.execute(trips.execution_options(yield_per=STREAM_BATCH_SIZE)):
+        _add_trip(batch, trip_fleet_id, trip, since)
+    for shift, shift_fleet_id in db.execute(shifts.execution_options(yield_per=STREAM_BATCH_SIZE)):
+        _add_shift(batch, shift_fleet_id, shift, since)
+
+    written = len(batch.rows)
+    batch.flush(db)
+    return written
@@ -0,0 +1,297 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import select, event
+from sqlalchemy.orm import Session
+
+from app.core.background import register_worker
+from app.core.config import settings
+from app.models.driver_location import DriverLocation
+from app.models.driver_shift import DriverShift
+from app.models.fleet_driver import FleetDriver
+from app.models.user import AppUser
+from app.schemas.enums import DriverShiftStatusEnum
+
+
+@dataclass
+class LiveDriver:
+    driver_id: int
+    full_name: str
+    status: DriverShiftStatusEnum
+    vehicle_id: Optional[int]
+    latitude: Optional[float]
+    longitude: Optional[float]
+    updated_at: Optional[datetime]
+    version: int
+
+
+@dataclass
+class _FleetState:
+    base_version: int      # deltas older than this need a full snapshot
+    version: int           # last change in this fleet
+    loaded_at: float
+    last_read: float
+    # least recently changed first, so deltas walk back from the end
+    drivers: "OrderedDict[int, LiveDriver]"
+
+
+class FleetLiveSnapshot:
+    """
+    Per-fleet view of who is ONLINE / ON_TRIP / OFFLINE and where, kept in
+    memory for fleet dashboards.
+
+    A fleet is loaded from the DB on first read (one join), then kept
+    current by shift, location and trip events. Every change gets a
+    version from one increasing counter (seeded from the clock, so a
+    restart never hands out numbers a client has already seen), so
+    `since_version` deltas stay valid across reloads: a reload raises
+    base_version and older clients simply get a full snapshot. Fleets are
+    reloaded after FLEET_LIVE_TTL_SECONDS (bounds drift from missed
+    events) and dropped when nobody reads them. Events raised inside a
+    transaction go through record_on_commit, so a rollback never shows.
+    State is per process, like the surge engine.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last_version = 0
+        self._fleets: dict[int, _FleetState] = {}
+        self._driver_fleets: dict[int, set[int]] = {}
+
+        # while a load runs its query, events are also kept here so the
+        # load can apply the ones its rows may predate
+        self._loading = 0
+        self._recent: dict[int, tuple[int, datetime, dict]] = {}  # driver -> (version, at, changes)
+
+    def _next_version(self) -> int:
+        # microseconds since epoch, strictly increasing; caller holds the lock
+        self._last_version = max(self._last_version + 1, time.time_ns() // 1000)
+        return self._last_version
+
+    # -----------------------------------------------------
+    # events
+    # -----------------------------------------------------
+    def record(self, driver_id: int, at: Optional[datetime] = None, **changes):
+        """
+        changes: any of status, vehicle_id, latitude, longitude.
+        Drivers of fleets nobody is watching are ignored (no DB access).
+        """
+        if "status" in changes:
+            changes["status"] = DriverShiftStatusEnum(changes["status"])
+        for key in ("latitude", "longitude"):
+            if changes.get(key) is not None:
+                changes[key] = float(changes[key])
+        at = at or datetime.now(timezone.utc)
+
+        with self._lock:
+            version = self._next_version()
+
+            for fleet_id in self._driver_fleets.get(driver_id, ()):
+                fleet = self._fleets[fleet_id]
+                entry = fleet.drivers[driver_id]
+                for key, value in changes.items():
+                    setattr(entry, key, value)
+                entry.updated_at = at
+                entry.version = fleet.version = version
+                fleet.drivers.move_to_end(driver_id)
+
+            if self._loading:
+                _, _, earlier = self._recent.get(driver_id, (0, at, {}))
+                self._recent[driver_id] = (version, at, {**earlier, **changes})
+
+    def record_on_commit(self, db: Session, driver_id: int, **changes):
+        """
+        record() once `db` commits; dropped if it rolls back.
+        For services that change shift state inside the caller's transaction.
+        """
+        changes.setdefault("at", datetime.now(timezone.utc))
+        db.info.setdefault(_PENDING_KEY, []).append((driver_id, changes))
+
+    def invalidate(self, fleet_id: int):
+        """Membership changed (drivers added/removed): reload on next read."""
+        with self._lock:
+            self._drop(fleet_id)
+
+    def _drop(self, fleet_id: int):
+        fleet = self._fleets.pop(fleet_id, None)
+        if not fleet:
+            return
+        for driver_id in fleet.drivers:
+            fleets = self._driver_fleets.get(driver_id)
+            if fleets:
+                fleets.discard(fleet_id)
+                if not fleets:
+                    del self._driver_fleets[driver_id]
+
+    # -----------------------------------------------------
+    # loading
+    # -----------------------------------------------------
+    def load(self, db: Session, fleet_id: int) -> _FleetState:
+        with self._lock:
+            self._loading += 1
+            started = self._next_version()
+        try:
+            rows = self._query(db, fleet_id)
+            with self._lock:
+                return self._install(fleet_id, rows, started)
+        finally:
+            with self._lock:
+                self._loading -= 1
+                if not self._loading:
+                    self._recent.clear()
+
+    def _query(self, db: Session, fleet_id: int) -> list:
+
+        # current shift per driver (latest open one)
+        shift = (
+            select(
+                DriverShift.driver_id,
+                DriverShift.status,
+                DriverShift.vehicle_id,
+                DriverShift.expected_end_at,
+            )
+            .where(DriverShift.ended_at.is_(None))
+            .distinct(DriverShift.driver_id)
+            .order_by(DriverShift.driver_id, DriverShift.started_at.desc())
+            .subquery()
+        )
+
+        return db.execute(
+            select(
+                FleetDriver.driver_id,
+                AppUser.full_name,
+                shift.c.status,
+                shift.c.vehicle_id,
+                shift.c.expected_end_at,
+                DriverLocation.latitude,
+                DriverLocation.longitude,
+                DriverLocation.last_updated,
+            )
+            .join(AppUser, AppUser.user_id == FleetDriver.driver_id)
+            .outerjoin(shift, shift.c.driver_id == FleetDriver.driver_id)
+            .outerjoin(DriverLocation, DriverLocation.driver_id == FleetDriver.driver_id)
+            .where(
+                FleetDriver.fleet_id == fleet_id,
+                FleetDriver.end_date.is_(None)
+            )
+            .order_by(DriverLocation.last_updated.asc().nulls_first())
+        ).all()
+
+    def _install(self, fleet_id: int, rows: list, started: int) -> _FleetState:
+        """
+        Caller holds the lock. Rows may predate events recorded after
+        `started`: those win, from the previous snapshot or from _recent.
+        """
+        now = datetime.now(timezone.utc)
+        previous = self._fleets.get(fleet_id)
+        self._drop(fleet_id)
+        version = self._next_version()
+
+        fresh, newer = [], []
+        for row in rows:
+            kept = previous.drivers.get(row.driver_id) if previous else None
+            if kept is not None and kept.version > started:
+                newer.append(kept)
+                continue
+
+            status = DriverShiftStatusEnum(row.status) if row.status else DriverShiftStatusEnum.OFFLINE
+            # shift past its window is OFFLINE (auto-ended on next touch)
+            if row.expected_end_at is not None and now >= row.expected_end_at:
+                status = DriverShiftStatusEnum.OFFLINE
+
+            entry = LiveDriver(
+                driver_id=row.driver_id,
+                full_name=row.full_name,
+                status=status,
+                vehicle_id=row.vehicle_id if status != DriverShiftStatusEnum.OFFLINE else None,
+                latitude=float(row.latitude) if row.latitude is not None else None,
+                longitude=float(row.longitude) if row.longitude is not None else None,
+                updated_at=row.last_updated,
+                version=version,
+            )
+
+            event_version, at, changes = self._recent.get(row.driver_id, (0, None, None))
+            if event_version > started:
+                for key, value in changes.items():
+                    setattr(entry, key, value)
+                entry.updated_at = at
+                entry.version = event_version
+                newer.append(entry)
+            else:
+                fresh.append(entry)
+
+        # versions must not decrease along the order (deltas walk back from the end)
+        drivers = OrderedDict((e.driver_id, e) for e in sorted(newer, key=lambda e: e.version))
+        drivers.update((e.driver_id, e) for e in fresh)
+        for driver_id in drivers:
+            self._driver_fleets.setdefault(driver_id, set()).add(fleet_id)
+
+        loaded_at = time.monotonic()
+        fleet = self._fleets[fleet_id] = _FleetState(
+            base_version=version,
+            version=version,
+            loaded_at=loaded_at,
+            last_read=loaded_at,
+            drivers=drivers,
+        )
+        return fleet
+
+    # -----------------------------------------------------
+    # reads
+    # -----------------------------------------------------
+    def snapshot(self, db: Session, fleet_id: int, since_version: Optional[int] = None) -> dict:
+        """
+        since_version=None (or older than the loaded snapshot) -> every driver,
+        full=True. Otherwise only drivers changed after since_version.
+        """
+        fleet = self._fleets.get(fleet_id)
+        if fleet is None or time.monotonic() - fleet.loaded_at > settings.FLEET_LIVE_TTL_SECONDS:
+            fleet = self.load(db, fleet_id)
+
+        with self._lock:
+            fleet.last_read = time.monotonic()
+
+            full = since_version is None or since_version < fleet.base_version
+            if full:
+                changed = list(fleet.drivers.values())
+            else:
+                changed = []
+                for entry in reversed(fleet.drivers.values()):
+                    if entry.version <= since_version:
+                        break
+                    changed.append(entry)
+
+            return {
+                "fleet_id": fleet_id,
+                "version": fleet.version,
+                "full": full,
+                "drivers": [asdict(entry) for entry in changed],
+            }
+
+    def evict_idle(self):
+        cutoff = time.monotonic() - settings.FLEET_LIVE_TTL_SECONDS
+        with self._lock:
+            for fleet_id in [f for f, state in self._fleets.items() if state.last_read < cutoff]:
+                self._drop(fleet_id)
+
+
+fleet_live = FleetLiveSnapshot()
+
+_PENDING_KEY = "fleet_live_pending"
+
+
+@event.listens_for(Session, "after_commit")
+def _record_committed(session):
+    for driver_id, changes in session.info.pop(_PENDING_KEY, ()):
+        fleet_live.record(driver_id, **changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_rolled_back(session):
+    session.info.pop(_PENDING_KEY, None)
+
+register_worker("fleet_live", settings.FLEET_LIVE_TTL_SECONDS, fleet_live.evict_idle)
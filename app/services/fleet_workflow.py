@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 from sqlalchemy.orm import Session
-from sqlalchemy import select, and_
+from sqlalchemy import select, update, bindparam
 
 from app.models.fleet import Fleet
 from app.models.fleet_document import FleetDocument
@@ -11,6 +11,7 @@ from app.schemas.enums import (
     AccountStatusEnum,
     TenantRoleEnum,
 )
+from app.services.readiness_engine import ReadinessRule, Approvals, register_rule, doc_status, sweep
 
 
 REQUIRED_DOC_TYPES = {
@@ -28,19 +29,7 @@ def get_fleet_uploaded_docs(db: Session, fleet_id: int):
 
 
 def compute_doc_status(uploaded_docs: list[FleetDocument]):
-    uploaded_types = {d.document_type for d in uploaded_docs}
-    missing = list(REQUIRED_DOC_TYPES - uploaded_types)
-
-    all_uploaded = len(missing) == 0
-    all_approved = (
-        all_uploaded and all(d.verification_status == ApprovalStatusEnum.APPROVED for d in uploaded_docs)
-    )
-
-    # approved_by_same_admin means all docs verified_by is same value (not null)
-    verified_by_values = {d.verified_by for d in uploaded_docs if d.verified_by is not None}
-    approved_by_same_admin = all_approved and len(verified_by_values) == 1
-
-    return missing, all_uploaded, all_approved, approved_by_same_admin
+    return doc_status("fleet", uploaded_docs)
 
 
 def auto_approve_fleet_if_ready(db: Session, fleet: Fleet):
@@ -48,17 +37,31 @@ def auto_approve_fleet_if_ready(db: Session, fleet: Fleet):
     Called after every document verification.
     If all 4 docs approved by same tenant admin => approve fleet.
     """
-    uploaded_docs = get_fleet_uploaded_docs(db, fleet.fleet_id)
-    missing, all_uploaded, all_approved, approved_by_same_admin = compute_doc_status(uploaded_docs)
-
-    if not (all_uploaded and all_approved and approved_by_same_admin):
-        return False
-
-    approving_admin_user_id = uploaded_docs[0].verified_by
+    return fleet.fleet_id in sweep(db, "fleet", [fleet.fleet_id])
+
+
+def _approve_fleets(db: Session, approvals: Approvals):
+    db.execute(
+        update(Fleet.__table__)
+        .where(Fleet.fleet_id == bindparam("b_fleet_id"))
+        .values(
+            approval_status=ApprovalStatusEnum.APPROVED,
+            status=AccountStatusEnum.ACTIVE,
+            verified_by=bindparam("b_verified_by"),
+            verified_on=datetime.now(timezone.utc),
+        ),
+        [{"b_fleet_id": fleet_id, "b_verified_by": verified_by} for fleet_id, verified_by in approvals]
+    )
 
-    fleet.approval_status = ApprovalStatusEnum.APPROVED
-    fleet.status = AccountStatusEnum.ACTIVE
-    fleet.verified_by = approving_admin_user_id
-    fleet.verified_on = datetime.now(timezone.utc)
 
-    return True
+register_rule(ReadinessRule(
+    entity_type="fleet",
+    label="Fleet",
+    document=FleetDocument,
+    owner_column="fleet_id",
+    owner_key=Fleet.fleet_id,
+    owner_tenant=Fleet.tenant_id,
+    owner_status=Fleet.approval_status,
+    required=frozenset(REQUIRED_DOC_TYPES),
+    approve=_approve_fleets,
+))
@@ -1,6 +1,7 @@
+import json
 from typing import Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import select, func
 from geoalchemy2.shape import to_shape
 from geoalchemy2.functions import ST_Contains, ST_SetSRID, ST_Point
 
@@ -54,3 +55,41 @@ def detect_city_and_zone(
 
     zone = find_zone_by_gps(db, city.city_id, lat, lng)
     return city.city_id, zone.zone_id if zone else None
+
+
+# =========================================================
+# ✅ GeoJSON polygons (city / zone boundaries)
+# =========================================================
+def validate_polygon_geojson(geometry: dict) -> str:
+    """
+    Cheap structural checks before anything reaches PostGIS.
+    Returns the geometry as a JSON string; raises ValueError.
+    """
+    if not isinstance(geometry, dict) or geometry.get("type") != "Polygon":
+        raise ValueError("Boundary must be a GeoJSON Polygon")
+
+    rings = geometry.get("coordinates")
+    if not isinstance(rings, list) or not rings:
+        raise ValueError("Polygon has no coordinates")
+
+    for ring in rings:
+        if not isinstance(ring, list) or len(ring) < 4:
+            raise ValueError("Polygon ring needs at least 4 positions")
+        for position in ring:
+            if (
+                not isinstance(position, (list, tuple)) or len(position) < 2
+                or not isinstance(position[0], (int, float)) or not isinstance(position[1], (int, float))
+                or not (-180 <= position[0] <= 180 and -90 <= position[1] <= 90)
+            ):
+                raise ValueError("Polygon position must be [lng, lat] in WGS84")
+        if list(ring[0][:2]) != list(ring[-1][:2]):
+            raise ValueError("Polygon ring is not closed")
+
+    return json.dumps({"type": "Polygon", "coordinates": rings})
+
+
+def polygon_from_geojson(geojson):
+    """
+    SQL expression: GeoJSON text (literal or bindparam) -> POLYGON, SRID 4326
+    """
+    return func.ST_SetSRID(func.ST_GeomFromGeoJSON(geojson), 4326)
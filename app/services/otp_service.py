@@ -5,6 +5,9 @@ from sqlalchemy import select
 
 from app.models.trip_otp import TripOtp
 
+# wrong guesses allowed per code; after that it only expires
+MAX_FAILED_ATTEMPTS = 5
+
 
 def generate_otp_code() -> str:
     return str(random.randint(1000, 9999))
@@ -34,8 +37,14 @@ def create_trip_otp(db: Session, trip_id: int, ttl_minutes: int = 5) -> TripOtp:
 
 
 def verify_trip_otp(db: Session, trip_id: int, otp_code: str) -> bool:
+    """
+    Call only after the caller is known to be the trip's driver: wrong
+    codes count against the code (MAX_FAILED_ATTEMPTS). The count is
+    flushed, so commit it even when this returns False.
+    """
+    # ✅ locked so concurrent guesses each count
     otp = db.execute(
-        select(TripOtp).where(TripOtp.trip_id == trip_id)
+        select(TripOtp).where(TripOtp.trip_id == trip_id).with_for_update()
     ).scalar_one_or_none()
 
     if not otp:
@@ -49,7 +58,12 @@ def verify_trip_otp(db: Session, trip_id: int, otp_code: str) -> bool:
     if otp.expires_at <= now:
         return False
 
+    if otp.failed_attempts >= MAX_FAILED_ATTEMPTS:
+        return False
+
     if otp.otp_code != otp_code:
+        otp.failed_attempts += 1
+        db.flush()
         return False
 
     otp.verified = True
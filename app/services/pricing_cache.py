@@ -0,0 +1,244 @@
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import select, event, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.fare_config import FareConfig
+from app.models.tenant_tax_rule import TenantTaxRule
+from app.schemas.enums import VehicleCategoryEnum
+
+
+# =========================================================
+# ✅ Detached snapshots (safe to share across sessions/threads)
+# =========================================================
+@dataclass(frozen=True)
+class FareConfigSnapshot:
+    fare_config_id: int
+    tenant_id: int
+    city_id: int
+    vehicle_category: VehicleCategoryEnum
+    base_fare: Decimal
+    per_km_rate: Decimal
+    per_min_rate: Decimal
+    minimum_fare: Optional[Decimal]
+    platform_commission_percent: Optional[Decimal]
+    effective_from: datetime
+    effective_to: Optional[datetime]
+
+    def is_effective(self, at: datetime) -> bool:
+        return self.effective_from <= at and (self.effective_to is None or at < self.effective_to)
+
+
+@dataclass(frozen=True)
+class TaxRuleSnapshot:
+    tax_id: int
+    tenant_id: int
+    rate: Decimal
+    effective_from: datetime
+    effective_to: Optional[datetime]
+
+    def is_effective(self, at: datetime) -> bool:
+        return self.effective_from <= at and (self.effective_to is None or at < self.effective_to)
+
+
+# =========================================================
+# ✅ Cache state
+# (tenant_id, city_id, vehicle_category) -> configs, newest first
+# tenant_id -> tax rules, newest first
+# =========================================================
+_lock = threading.Lock()
+_version = 0
+_fare_configs: dict[tuple[int, int, VehicleCategoryEnum], tuple[float, list[FareConfigSnapshot]]] = {}
+_tax_rules: dict[int, tuple[float, list[TaxRuleSnapshot]]] = {}
+
+
+def get_pricing_version() -> int:
+    return _version
+
+
+def bump_pricing_version() -> int:
+    """
+    Invalidate every cached fare config / tax rule.
+    Called automatically when a session that wrote pricing rows commits;
+    call manually after committing bulk Core updates.
+    """
+    global _version
+    with _lock:
+        _version += 1
+        _fare_configs.clear()
+        _tax_rules.clear()
+        return _version
+
+
+def _is_fresh(loaded_at: float) -> bool:
+    # TTL bounds staleness for writes made by other worker processes
+    return time.monotonic() - loaded_at < settings.PRICING_CACHE_TTL_SECONDS
+
+
+def _load_city_fare_configs(db: Session, tenant_id: int, city_id: int, now: datetime):
+    """
+    One query loads every category for the city, so a single miss
+    warms the whole (tenant, city) and caches "no config" results too.
+    """
+    # a write committed while we query bumps the version: don't cache rows
+    # that may predate it
+    version = _version
+
+    rows = db.execute(
+        select(FareConfig)
+        .where(
+            FareConfig.tenant_id == tenant_id,
+            FareConfig.city_id == city_id,
+            FareConfig.is_active == True,
+            or_(
+                FareConfig.effective_to.is_(None),
+                FareConfig.effective_to > now
+            )
+        )
+        .order_by(FareConfig.effective_from.desc())
+    ).scalars().all()
+
+    grouped: dict[VehicleCategoryEnum, list[FareConfigSnapshot]] = {c: [] for c in VehicleCategoryEnum}
+    for row in rows:
+        grouped[row.vehicle_category].append(FareConfigSnapshot(
+            fare_config_id=row.fare_config_id,
+            tenant_id=row.tenant_id,
+            city_id=row.city_id,
+            vehicle_category=row.vehicle_category,
+            base_fare=row.base_fare,
+            per_km_rate=row.per_km_rate,
+            per_min_rate=row.per_min_rate,
+            minimum_fare=row.minimum_fare,
+            platform_commission_percent=row.platform_commission_percent,
+            effective_from=row.effective_from,
+            effective_to=row.effective_to,
+        ))
+
+    loaded_at = time.monotonic()
+    with _lock:
+        if _version == version:
+            for category, configs in grouped.items():
+                _fare_configs[(tenant_id, city_id, category)] = (loaded_at, configs)
+
+    return grouped
+
+
+def get_fare_config(
+    db: Session,
+    tenant_id: int,
+    city_id: int,
+    vehicle_category: VehicleCategoryEnum,
+    at: Optional[datetime] = None
+) -> Optional[FareConfigSnapshot]:
+    """
+    Returns the latest active config whose effective window contains `at`.
+    """
+    at = at or datetime.now(timezone.utc)
+
+    cached = _fare_configs.get((tenant_id, city_id, vehicle_category))
+    if cached and _is_fresh(cached[0]):
+        configs = cached[1]
+    else:
+        configs = _load_city_fare_configs(db, tenant_id, city_id, at)[vehicle_category]
+
+    for config in configs:
+        if config.is_effective(at):
+            return config
+    return None
+
+
+def get_city_fare_configs(
+    db: Session,
+    tenant_id: int,
+    city_id: int,
+    at: Optional[datetime] = None
+) -> dict[VehicleCategoryEnum, FareConfigSnapshot]:
+    """
+    Effective config per vehicle category (categories without one are omitted).
+    """
+    at = at or datetime.now(timezone.utc)
+
+    result = {}
+    for category in VehicleCategoryEnum:
+        config = get_fare_config(db, tenant_id, city_id, category, at)
+        if config:
+            result[category] = config
+    return result
+
+
+def get_tax_rule(
+    db: Session,
+    tenant_id: int,
+    at: Optional[datetime] = None
+) -> Optional[TaxRuleSnapshot]:
+    at = at or datetime.now(timezone.utc)
+
+    cached = _tax_rules.get(tenant_id)
+    if cached and _is_fresh(cached[0]):
+        rules = cached[1]
+    else:
+        version = _version
+        rows = db.execute(
+            select(TenantTaxRule)
+            .where(
+                TenantTaxRule.tenant_id == tenant_id,
+                or_(
+                    TenantTaxRule.effective_to.is_(None),
+                    TenantTaxRule.effective_to > at
+                )
+            )
+            .order_by(TenantTaxRule.effective_from.desc())
+        ).scalars().all()
+
+        rules = [
+            TaxRuleSnapshot(
+                tax_id=r.tax_id,
+                tenant_id=r.tenant_id,
+                rate=r.rate,
+                effective_from=r.effective_from,
+                effective_to=r.effective_to,
+            )
+            for r in rows
+        ]
+        with _lock:
+            if _version == version:
+                _tax_rules[tenant_id] = (time.monotonic(), rules)
+
+    for rule in rules:
+        if rule.is_effective(at):
+            return rule
+    return None
+
+
+# =========================================================
+# ✅ Invalidate when a session that wrote pricing rows commits
+# (bumping at flush would let readers re-cache uncommitted-era rows)
+# =========================================================
+_PRICING_MODELS = (FareConfig, TenantTaxRule)
+_DIRTY_KEY = "pricing_dirty"
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_pricing_dirty(session, flush_context):
+    if any(
+        isinstance(obj, _PRICING_MODELS)
+        for obj in (*session.new, *session.dirty, *session.deleted)
+    ):
+        session.info[_DIRTY_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_on_commit(session):
+    if session.info.pop(_DIRTY_KEY, False):
+        bump_pricing_version()
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_on_rollback(session):
+    session.info.pop(_DIRTY_KEY, None)
@@ -0,0 +1,304 @@
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import select, update, func, case, literal, and_, or_, true, bindparam
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.verification_queue import VerificationQueue
+from app.schemas.enums import ApprovalStatusEnum
+
+# (owner_id, verified_by) pairs handed to a rule's approve action
+Approvals = list[tuple[int, int]]
+
+
+@dataclass(frozen=True)
+class ReadinessRule:
+    """
+    What an owner (driver, vehicle, fleet, ...) must have before it is
+    auto-approved, and how to approve it. Registered by each workflow.
+    """
+    entity_type: str
+    label: str
+    document: type        # document model
+    owner_column: str     # owner FK on the document, e.g. "driver_id"
+    owner_key: object     # owner table PK column
+    owner_tenant: object
+    owner_status: object  # owner approval_status column
+    required: frozenset
+    approve: Callable[[Session, Approvals], None]
+
+    @property
+    def doc_owner(self):
+        return getattr(self.document, self.owner_column)
+
+
+RULES: dict[str, ReadinessRule] = {}
+
+
+def register_rule(rule: ReadinessRule):
+    RULES[rule.entity_type] = rule
+
+
+# =========================================================
+# ✅ Status from a loaded doc list (owner-facing status pages)
+# =========================================================
+def doc_status(entity_type: str, docs: list):
+    """
+    Returns (missing, all_uploaded, all_approved, approved_by_same_admin).
+    """
+    required = RULES[entity_type].required
+
+    uploaded_types = {d.document_type for d in docs}
+    missing = list(required - uploaded_types)
+
+    all_uploaded = len(missing) == 0
+    all_approved = all_uploaded and all(d.verification_status == ApprovalStatusEnum.APPROVED for d in docs)
+
+    verified_by_set = {d.verified_by for d in docs if d.verified_by is not None}
+    approved_by_same_admin = all_approved and len(verified_by_set) == 1
+
+    return missing, all_uploaded, all_approved, approved_by_same_admin
+
+
+def missing_types(db: Session, entity_type: str, owner_id: int) -> list:
+    rule = RULES[entity_type]
+    uploaded = set(db.execute(
+        select(rule.document.document_type).where(rule.doc_owner == owner_id)
+    ).scalars())
+    return list(rule.required - uploaded)
+
+
+# =========================================================
+# ✅ Full recount (backfill, bulk imports, tenant moves)
+# =========================================================
+def rebuild_counters(db: Session, entity_type: str, owner_ids: Optional[Iterable[int]] = None):
+    """
+    Recomputes the queue rows of the given owners from the document table
+    in one INSERT ... SELECT ... GROUP BY ... ON CONFLICT DO UPDATE.
+    owner_ids=None rebuilds every owner of that type. Does not commit.
+    """
+    rule = RULES[entity_type]
+    doc = rule.document
+
+    if owner_ids is not None:
+        owner_ids = list(owner_ids)
+        if not owner_ids:
+            return
+
+    # pending doc inserts / status changes must be visible to the SELECT
+    db.flush()
+
+    is_required = doc.document_type.in_(rule.required)
+
+    def count_docs(*conditions):
+        return func.count(func.distinct(doc.document_type)).filter(and_(is_required, *conditions))
+
+    uploaded = count_docs()
+    approved = count_docs(doc.verification_status == ApprovalStatusEnum.APPROVED)
+    rejected = count_docs(doc.verification_status == ApprovalStatusEnum.REJECTED)
+    ready = and_(uploaded == len(rule.required), approved + rejected < uploaded)
+
+    counts = (
+        select(
+            literal(entity_type).label("entity_type"),
+            rule.owner_key.label("entity_id"),
+            rule.owner_tenant.label("tenant_id"),
+            literal(len(rule.required)).label("required_count"),
+            uploaded.label("uploaded_count"),
+            approved.label("approved_count"),
+            rejected.label("rejected_count"),
+            ready.label("ready_for_review"),
+            case((ready, func.now())).label("ready_since"),
+            func.min(doc.verified_by).label("verified_by"),
+            (func.count(func.distinct(doc.verified_by)) > 1).label("mixed_verifiers"),
+            (rule.owner_status == ApprovalStatusEnum.APPROVED).label("owner_approved"),
+        )
+        .select_from(rule.owner_key.table)
+        .outerjoin(doc, rule.doc_owner == rule.owner_key)
+        .group_by(rule.owner_key, rule.owner_tenant, rule.owner_status)
+    )
+    if owner_ids is not None:
+        counts = counts.where(rule.owner_key.in_(owner_ids))
+
+    columns = [
+        "entity_type", "entity_id", "tenant_id", "required_count", "uploaded_count",
+        "approved_count", "rejected_count", "ready_for_review", "ready_since",
+        "verified_by", "mixed_verifiers", "owner_approved",
+    ]
+    stmt = insert(VerificationQueue).from_select(columns, counts)
+    db.execute(stmt.on_conflict_do_update(
+        constraint="uq_verification_queue_entity",
+        set_={
+            **{col: getattr(stmt.excluded, col) for col in columns if col not in ("entity_type", "entity_id", "ready_since")},
+            # keep the original wait time while the item stays ready
+            "ready_since": case(
+                (stmt.excluded.ready_for_review == true(),
+                 func.coalesce(VerificationQueue.ready_since, stmt.excluded.ready_since)),
+            ),
+            "updated_on": func.now(),
+        }
+    ))
+
+
+def get_states(db: Session, entity_type: str, owner_ids: Iterable[int]) -> dict[int, VerificationQueue]:
+    """
+    Counter rows for the owners, one query. Owners without a row yet
+    (docs from before the queue existed) are recounted once.
+    """
+    owner_ids = set(owner_ids)
+    stmt = select(VerificationQueue).where(VerificationQueue.entity_type == entity_type)
+
+    states = {
+        row.entity_id: row
+        for row in db.execute(stmt.where(VerificationQueue.entity_id.in_(owner_ids))).scalars()
+    }
+
+    unknown = owner_ids - states.keys()
+    if unknown:
+        rebuild_counters(db, entity_type, unknown)
+        states.update({
+            row.entity_id: row
+            for row in db.execute(stmt.where(VerificationQueue.entity_id.in_(unknown))).scalars()
+        })
+
+    return states
+
+
+# =========================================================
+# ✅ O(1) counter updates
+# =========================================================
+def _ready(uploaded, approved, rejected):
+    q = VerificationQueue
+    return and_(uploaded == q.required_count, approved + rejected < uploaded)
+
+
+def record_upload(db: Session, entity_type: str, owner_id: int, tenant_id: int, document_type):
+    rule = RULES[entity_type]
+    if document_type not in rule.required:
+        return
+
+    q = VerificationQueue
+    first_ready = len(rule.required) == 1
+    stmt = insert(q).values(
+        entity_type=entity_type,
+        entity_id=owner_id,
+        tenant_id=tenant_id,
+        required_count=len(rule.required),
+        uploaded_count=1,
+        ready_for_review=first_ready,
+        ready_since=func.now() if first_ready else None,
+    )
+
+    uploaded = q.uploaded_count + 1
+    ready = _ready(uploaded, q.approved_count, q.rejected_count)
+    db.execute(stmt.on_conflict_do_update(
+        constraint="uq_verification_queue_entity",
+        set_={
+            "tenant_id": stmt.excluded.tenant_id,
+            "uploaded_count": uploaded,
+            "ready_for_review": ready,
+            "ready_since": case((ready, func.coalesce(q.ready_since, func.now()))),
+            "updated_on": func.now(),
+        }
+    ))
+
+
+def _delta(status) -> tuple[int, int]:
+    return (
+        int(status == ApprovalStatusEnum.APPROVED),
+        int(status == ApprovalStatusEnum.REJECTED),
+    )
+
+
+def record_verifications(db: Session, entity_type: str, changes: Iterable[tuple], verified_by: int):
+    """
+    changes: (owner_id, document_type, old_status, new_status) per document.
+    Applies the net delta per owner with one executemany UPDATE.
+    old_status must be read from a row locked FOR UPDATE, or concurrent
+    verifications of one doc both count it. Owners must already have a
+    row (see get_states).
+    """
+    rule = RULES[entity_type]
+
+    deltas: dict[int, list[int]] = {}
+    for owner_id, document_type, old_status, new_status in changes:
+        d = deltas.setdefault(owner_id, [0, 0])
+        if document_type in rule.required:
+            (old_a, old_r), (new_a, new_r) = _delta(old_status), _delta(new_status)
+            d[0] += new_a - old_a
+            d[1] += new_r - old_r
+
+    if not deltas:
+        return
+
+    q = VerificationQueue.__table__
+    approved = q.c.approved_count + bindparam("b_approved")
+    rejected = q.c.rejected_count + bindparam("b_rejected")
+    ready = and_(q.c.uploaded_count == q.c.required_count, approved + rejected < q.c.uploaded_count)
+
+    db.execute(
+        update(q)
+        .where(q.c.entity_type == entity_type, q.c.entity_id == bindparam("b_owner_id"))
+        .values(
+            approved_count=approved,
+            rejected_count=rejected,
+            ready_for_review=ready,
+            ready_since=case((ready, func.coalesce(q.c.ready_since, func.now()))),
+            verified_by=func.coalesce(q.c.verified_by, verified_by),
+            mixed_verifiers=or_(
+                q.c.mixed_verifiers,
+                and_(q.c.verified_by.isnot(None), q.c.verified_by != verified_by)
+            ),
+            updated_on=func.now(),
+        ),
+        [
+            {"b_owner_id": owner_id, "b_approved": d[0], "b_rejected": d[1]}
+            for owner_id, d in deltas.items()
+        ]
+    )
+
+
+# =========================================================
+# ✅ Batched auto-approval
+# =========================================================
+def sweep(db: Session, entity_type: str, owner_ids: Optional[Iterable[int]] = None) -> list[int]:
+    """
+    Approves every owner whose required docs are all APPROVED by a single
+    admin: one SELECT on the counters, one set-based approve per type.
+    owner_ids=None sweeps the whole type. Returns approved owner ids.
+    """
+    rule = RULES[entity_type]
+    q = VerificationQueue
+
+    stmt = select(q.entity_id, q.verified_by).where(
+        q.entity_type == entity_type,
+        q.approved_count == q.required_count,
+        q.mixed_verifiers == False,
+        q.owner_approved == False,
+    )
+    if owner_ids is not None:
+        owner_ids = list(owner_ids)
+        if not owner_ids:
+            return []
+        stmt = stmt.where(q.entity_id.in_(owner_ids))
+
+    approvals = [tuple(row) for row in db.execute(stmt).all()]
+    if not approvals:
+        return []
+
+    rule.approve(db, approvals)
+
+    approved_ids = [owner_id for owner_id, _ in approvals]
+    db.execute(
+        update(q)
+        .where(q.entity_type == entity_type, q.entity_id.in_(approved_ids))
+        .values(owner_approved=True, updated_on=func.now())
+        .execution_options(synchronize_session=False)
+    )
+    return approved_ids
+
+
+# workflows register their rules on import; imported last so they can
+# import this module back
+from app.services import driver_workflow, vehicle_workflow, fleet_workflow  # noqa: E402,F401
@@ -0,0 +1,172 @@
+import threading
+import time
+from collections import Counter, OrderedDict
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.background import register_worker
+from app.core.config import settings
+from app.models.vehicle import Vehicle
+from app.schemas.enums import VehicleCategoryEnum
+from app.services.zone_index import zone_index
+
+SurgeKey = Tuple[int, VehicleCategoryEnum]  # (zone_id, vehicle_category)
+
+NO_SURGE = Decimal("1.0")
+SURGE_STEP = Decimal("0.1")
+
+
+class SurgeEngine:
+    """
+    Rolling supply/demand per (zone, vehicle category), kept in memory.
+
+    - demand = REQUESTED trips not yet assigned/cancelled, requested within the window
+    - supply = ONLINE drivers not on a trip, pinged within the window
+
+    Events update counters incrementally; recompute() expires old entries
+    and rebuilds the multiplier table that get_multiplier() reads in O(1).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+        # insertion order == timestamp order, so expiry pops from the front
+        self._open_trips: "OrderedDict[int, Tuple[SurgeKey, float]]" = OrderedDict()
+        self._idle_drivers: "OrderedDict[int, Tuple[SurgeKey, float]]" = OrderedDict()
+
+        self._demand: Counter = Counter()
+        self._supply: Counter = Counter()
+
+        self._driver_category: dict[int, VehicleCategoryEnum] = {}
+        self._multipliers: dict[SurgeKey, Decimal] = {}
+
+        self.last_recomputed_at: Optional[float] = None
+
+    # -----------------------------------------------------
+    # demand
+    # -----------------------------------------------------
+    def record_trip_requested(self, trip_id: int, zone_id: Optional[int], category: VehicleCategoryEnum):
+        if zone_id is None:
+            return
+        key = (zone_id, category)
+        with self._lock:
+            if trip_id in self._open_trips:
+                return
+            self._open_trips[trip_id] = (key, time.monotonic())
+            self._demand[key] += 1
+
+    def record_trip_closed(self, trip_id: int):
+        with self._lock:
+            entry = self._open_trips.pop(trip_id, None)
+            if entry:
+                self._demand[entry[0]] -= 1
+
+    # -----------------------------------------------------
+    # supply
+    # -----------------------------------------------------
+    def driver_category(self, driver_id: int) -> Optional[VehicleCategoryEnum]:
+        return self._driver_category.get(driver_id)
+
+    def record_driver_category(self, driver_id: int, category: VehicleCategoryEnum):
+        self._driver_category[driver_id] = category
+
+    def record_driver_idle(self, driver_id: int, zone_id: Optional[int]):
+        category = self._driver_category.get(driver_id)
+        if category is None:
+            return
+
+        with self._lock:
+            previous = self._idle_drivers.pop(driver_id, None)
+            if previous:
+                self._supply[previous[0]] -= 1
+
+            if zone_id is None:
+                return
+
+            key = (zone_id, category)
+            self._idle_drivers[driver_id] = (key, time.monotonic())
+            self._supply[key] += 1
+
+    def record_driver_unavailable(self, driver_id: int):
+        with self._lock:
+            entry = self._idle_drivers.pop(driver_id, None)
+            if entry:
+                self._supply[entry[0]] -= 1
+
+    # -----------------------------------------------------
+    # multipliers
+    # -----------------------------------------------------
+    def _expire(self, entries: OrderedDict, counts: Counter, cutoff: float):
+        while entries:
+            _, (key, ts) = next(iter(entries.items()))
+            if ts >= cutoff:
+                break
+            entries.popitem(last=False)
+            counts[key] -= 1
+
+    def recompute(self):
+        cutoff = time.monotonic() - settings.SURGE_WINDOW_SECONDS
+
+        with self._lock:
+            self._expire(self._open_trips, self._demand, cutoff)
+            self._expire(self._idle_drivers, self._supply, cutoff)
+            demand = +self._demand  # unary + drops zero/negative counts
+            supply = dict(self._supply)
+
+        sensitivity = Decimal(str(settings.SURGE_SENSITIVITY))
+        max_multiplier = Decimal(str(settings.SURGE_MAX_MULTIPLIER))
+
+        multipliers = {}
+        for key, open_trips in demand.items():
+            if open_trips < settings.SURGE_MIN_DEMAND:
+                continue
+
+            ratio = Decimal(open_trips) / Decimal(max(supply.get(key, 0), 1))
+            if ratio <= 1:
+                continue
+
+            multiplier = min(NO_SURGE + (ratio - 1) * sensitivity, max_multiplier)
+            multipliers[key] = multiplier.quantize(SURGE_STEP, rounding=ROUND_HALF_UP)
+
+        # ✅ single reference swap, readers never lock
+        self._multipliers = multipliers
+        self.last_recomputed_at = time.time()
+
+    def get_multiplier(self, zone_id: Optional[int], category: VehicleCategoryEnum) -> Decimal:
+        if not settings.SURGE_ENABLED or zone_id is None:
+            return NO_SURGE
+        return self._multipliers.get((zone_id, category), NO_SURGE)
+
+
+surge_engine = SurgeEngine()
+
+register_worker("surge", settings.SURGE_RECOMPUTE_SECONDS, surge_engine.recompute)
+
+
+def track_driver_location(
+    db: Session,
+    driver_id: int,
+    vehicle_id: Optional[int],
+    lat: float,
+    lng: float,
+    refresh_category: bool = False
+):
+    """
+    Location ping from an ONLINE driver -> idle supply in the zone under them.
+    Vehicle category is looked up once per driver (or per shift start with
+    refresh_category=True) and then kept in memory.
+    """
+    if refresh_category or surge_engine.driver_category(driver_id) is None:
+        if vehicle_id is None:
+            return
+        category = db.execute(
+            select(Vehicle.category).where(Vehicle.vehicle_id == vehicle_id)
+        ).scalar_one_or_none()
+        if category is None:
+            return
+        surge_engine.record_driver_category(driver_id, category)
+
+    surge_engine.record_driver_idle(driver_id, zone_index.find_zone_id(lat, lng))
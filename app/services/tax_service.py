@@ -1,16 +1,12 @@
-from sqlalchemy import select
+from decimal import Decimal
 
-from app.models.tenant_tax_rule import TenantTaxRule
+from app.services.pricing_cache import get_tax_rule
 
 
-def get_tax_amount(db, tenant_id, amount):
-    rule = db.execute(
-        select(TenantTaxRule)
-        .where(TenantTaxRule.tenant_id == tenant_id)
-        .order_by(TenantTaxRule.effective_from.desc())
-    ).scalar_one_or_none()
+def get_tax_amount(db, tenant_id, amount: Decimal) -> Decimal:
+    rule = get_tax_rule(db, tenant_id)
 
     if not rule:
-        return 0
+        return Decimal("0")
 
     return (amount * rule.rate) / 100
@@ -1,6 +1,9 @@
-from sqlalchemy import select
+from sqlalchemy import select, update, bindparam
+from sqlalchemy.dialects.postgresql import insert
 
+from app.models.core import City
 from app.models.tenant import TenantCity
+from app.services.geo_service import validate_polygon_geojson, polygon_from_geojson
 
 
 def tenant_operates_in_city(db, tenant_id: int, city_id: int) -> bool:
@@ -11,3 +14,105 @@ def tenant_operates_in_city(db, tenant_id: int, city_id: int) -> bool:
             TenantCity.is_active == True
         )
     ).scalar_one_or_none() is not None
+
+
+# =========================================================
+# ✅ Bulk onboarding: a fixed number of statements for N cities
+# =========================================================
+def bulk_onboard_cities(db, tenant_id: int, country_code: str, cities) -> tuple[list[City], list[int], list[str]]:
+    """
+    1) SELECT existing cities by name
+    2) INSERT new cities ... ON CONFLICT DO NOTHING RETURNING
+    3) fill missing boundaries of existing cities (one executemany)
+    4) INSERT tenant_city mappings ... ON CONFLICT DO NOTHING RETURNING
+
+    Returns (created_cities, mapped_city_ids, skipped_city_names).
+    Raises ValueError on an invalid boundary. Does not commit.
+    """
+    # ✅ normalise + de-duplicate (first occurrence wins), validate boundaries
+    requested = {}
+    for c in cities:
+        name = c.name.strip()
+        if name in requested:
+            continue
+        boundary = validate_polygon_geojson(c.boundary) if c.boundary else None
+        requested[name] = (c, boundary)
+
+    if not requested:
+        return [], [], []
+
+    # ✅ 1) existing cities
+    existing = {
+        city.name: city
+        for city in db.execute(
+            select(City).where(
+                City.country_code == country_code,
+                City.name.in_(requested.keys())
+            )
+        ).scalars()
+    }
+
+    # ✅ 2) new cities in one multi-row INSERT
+    created_cities: list[City] = []
+    new_rows = [
+        {
+            "country_code": country_code,
+            "name": name,
+            "timezone": c.timezone,
+            "currency": c.currency,
+            "boundary": polygon_from_geojson(boundary) if boundary else None,
+        }
+        for name, (c, boundary) in requested.items()
+        if name not in existing
+    ]
+    if new_rows:
+        created_cities = db.execute(
+            insert(City)
+            .values(new_rows)
+            .on_conflict_do_nothing(constraint="uq_city_country_name")
+            .returning(City)
+        ).scalars().all()
+
+        # lost a race with a concurrent onboarding -> pick those rows up
+        missing = {r["name"] for r in new_rows} - {city.name for city in created_cities}
+        if missing:
+            existing.update({
+                city.name: city
+                for city in db.execute(
+                    select(City).where(
+                        City.country_code == country_code,
+                        City.name.in_(missing)
+                    )
+                ).scalars()
+            })
+
+    # ✅ 3) boundaries for already-known cities (never overwrite one)
+    boundary_updates = [
+        {"b_city_id": existing[name].city_id, "b_geojson": boundary}
+        for name, (_, boundary) in requested.items()
+        if boundary and name in existing and existing[name].boundary is None
+    ]
+    if boundary_updates:
+        db.execute(
+            update(City.__table__)
+            .where(City.city_id == bindparam("b_city_id"), City.boundary.is_(None))
+            .values(boundary=polygon_from_geojson(bindparam("b_geojson"))),
+            boundary_updates
+        )
+
+    # ✅ 4) tenant mappings
+    city_ids = [city.city_id for city in created_cities] + [city.city_id for city in existing.values()]
+    mapped_city_ids = db.execute(
+        insert(TenantCity)
+        .values([
+            {"tenant_id": tenant_id, "city_id": city_id, "is_active": True}
+            for city_id in city_ids
+        ])
+        .on_conflict_do_nothing(constraint="uq_tenant_city")
+        .returning(TenantCity.city_id)
+    ).scalars().all()
+
+    mapped = set(mapped_city_ids)
+    skipped_city_names = [city.name for city in existing.values() if city.city_id not in mapped]
+
+    return created_cities, mapped_city_ids, skipped_city_names
@@ -5,6 +5,8 @@ from sqlalchemy import desc, select, and_
 from app.models.trip import Trip
 from app.models.driver_shift import DriverShift
 from app.schemas.enums import TripStatusEnum
+from app.services.surge_service import surge_engine
+from app.services.fleet_live import fleet_live
 
 
 def set_driver_shift_online(db: Session, driver_id: int):
@@ -23,6 +25,7 @@ def set_driver_shift_online(db: Session, driver_id: int):
     if shift:
         shift.status = "ONLINE"
         db.flush()
+        fleet_live.record_on_commit(db, driver_id, status="ONLINE")
 
 
 def set_driver_shift_on_trip(db: Session, driver_id: int):
@@ -41,6 +44,7 @@ def set_driver_shift_on_trip(db: Session, driver_id: int):
     if shift:
         shift.status = "ON_TRIP"
         db.flush()
+        fleet_live.record_on_commit(db, driver_id, status="ON_TRIP")
 
 
 
@@ -50,6 +54,8 @@ def cancel_trip(db: Session, trip: Trip, cancelled_by_user_id: int):
     trip.updated_by = cancelled_by_user_id
     trip.updated_on = datetime.now(timezone.utc)
 
+    surge_engine.record_trip_closed(trip.trip_id)
+
     # Driver goes back ONLINE if already assigned
     if trip.driver_id:
         set_driver_shift_online(db, trip.driver_id)
@@ -1,10 +1,11 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import select, and_
+from sqlalchemy import select, update, bindparam
 from datetime import datetime, timezone
 
 from app.models.vehicle_document import VehicleDocument
 from app.models.vehicle import Vehicle
 from app.schemas.enums import VehicleDocumentTypeEnum, ApprovalStatusEnum, VehicleStatusEnum
+from app.services.readiness_engine import ReadinessRule, Approvals, register_rule, doc_status, sweep
 
 REQUIRED_VEHICLE_DOCS = {
     VehicleDocumentTypeEnum.INSURANCE,
@@ -17,28 +18,33 @@ def get_vehicle_docs(db: Session, vehicle_id: int):
     ).scalars().all()
 
 def compute_vehicle_doc_status(docs: list[VehicleDocument]):
-    uploaded_types = {d.document_type for d in docs}
-    missing = list(REQUIRED_VEHICLE_DOCS - uploaded_types)
-
-    all_uploaded = len(missing) == 0
-    all_approved = all_uploaded and all(d.verification_status == ApprovalStatusEnum.APPROVED for d in docs)
-
-    verified_by_set = {d.verified_by for d in docs if d.verified_by is not None}
-    approved_by_same_admin = all_approved and len(verified_by_set) == 1
-
-    return missing, all_uploaded, all_approved, approved_by_same_admin
+    return doc_status("vehicle", docs)
 
 def auto_approve_vehicle_if_ready(db: Session, vehicle: Vehicle):
-    docs = get_vehicle_docs(db, vehicle.vehicle_id)
-    missing, all_uploaded, all_approved, approved_by_same_admin = compute_vehicle_doc_status(docs)
-
-    if not (all_uploaded and all_approved and approved_by_same_admin):
-        return False
+    return vehicle.vehicle_id in sweep(db, "vehicle", [vehicle.vehicle_id])
 
+def _approve_vehicles(db: Session, approvals: Approvals):
     # ✅ vehicle approved
-    vehicle.approval_status = ApprovalStatusEnum.APPROVED
-    vehicle.status = VehicleStatusEnum.ACTIVE
-    vehicle.verified_by = docs[0].verified_by
-    vehicle.verified_on = datetime.now(timezone.utc)
-
-    return True
+    db.execute(
+        update(Vehicle.__table__)
+        .where(Vehicle.vehicle_id == bindparam("b_vehicle_id"))
+        .values(
+            approval_status=ApprovalStatusEnum.APPROVED,
+            status=VehicleStatusEnum.ACTIVE,
+            verified_by=bindparam("b_verified_by"),
+            verified_on=datetime.now(timezone.utc),
+        ),
+        [{"b_vehicle_id": vehicle_id, "b_verified_by": verified_by} for vehicle_id, verified_by in approvals]
+    )
+
+register_rule(ReadinessRule(
+    entity_type="vehicle",
+    label="Vehicle",
+    document=VehicleDocument,
+    owner_column="vehicle_id",
+    owner_key=Vehicle.vehicle_id,
+    owner_tenant=Vehicle.tenant_id,
+    owner_status=Vehicle.approval_status,
+    required=frozenset(REQUIRED_VEHICLE_DOCS),
+    approve=_approve_vehicles,
+))
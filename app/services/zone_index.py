@@ -0,0 +1,151 @@
+import json
+import math
+import threading
+import time
+from typing import Optional, Tuple
+
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+
+from app.core.background import register_worker
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.core import Zone
+
+# ~1.1 km at the equator; each cell lists the zones whose bbox touches it
+CELL_DEG = 0.01
+
+
+def _cell(lat: float, lng: float) -> Tuple[int, int]:
+    return math.floor(lat / CELL_DEG), math.floor(lng / CELL_DEG)
+
+
+def _point_in_ring(lng: float, lat: float, ring: list) -> bool:
+    # ray casting, ring = [[lng, lat], ...]
+    inside = False
+    j = len(ring) - 1
+    for i in range(len(ring)):
+        xi, yi = ring[i][0], ring[i][1]
+        xj, yj = ring[j][0], ring[j][1]
+        if (yi > lat) != (yj > lat) and lng < (xj - xi) * (lat - yi) / (yj - yi) + xi:
+            inside = not inside
+        j = i
+    return inside
+
+
+class _ZoneShape:
+    __slots__ = ("zone_id", "city_id", "bbox", "rings")
+
+    def __init__(self, zone_id: int, city_id: int, rings: list):
+        self.zone_id = zone_id
+        self.city_id = city_id
+        self.rings = rings
+
+        outer = rings[0]
+        lngs = [p[0] for p in outer]
+        lats = [p[1] for p in outer]
+        self.bbox = (min(lngs), min(lats), max(lngs), max(lats))
+
+    def contains(self, lat: float, lng: float) -> bool:
+        min_lng, min_lat, max_lng, max_lat = self.bbox
+        if not (min_lng <= lng <= max_lng and min_lat <= lat <= max_lat):
+            return False
+        if not _point_in_ring(lng, lat, self.rings[0]):
+            return False
+        # holes
+        return not any(_point_in_ring(lng, lat, hole) for hole in self.rings[1:])
+
+
+class ZoneIndex:
+    """
+    In-process point -> zone lookup so hot paths (location pings, quotes)
+    never run ST_Contains against the DB.
+    """
+
+    def __init__(self):
+        self._cells: dict[Tuple[int, int], list[_ZoneShape]] = {}
+        self._lock = threading.Lock()
+        self.loaded_at: Optional[float] = None
+        self.zone_count = 0
+        self._stamp: Optional[tuple] = None
+
+    @property
+    def is_warm(self) -> bool:
+        return self.loaded_at is not None
+
+    @staticmethod
+    def _current_stamp(db: Session) -> tuple:
+        # changes whenever zones are added, removed or re-imported
+        return tuple(db.execute(
+            select(
+                func.count(Zone.zone_id),
+                func.max(Zone.zone_id),
+                func.max(func.coalesce(Zone.updated_on, Zone.created_on)),
+            )
+        ).one())
+
+    def refresh_if_changed(self, db: Session):
+        """
+        Reloads when the zone table changed (e.g. an import from another
+        process, like the CLI) or the index is older than
+        ZONE_INDEX_REFRESH_SECONDS. Otherwise one aggregate query.
+        """
+        stale = not self.is_warm or time.time() - self.loaded_at >= settings.ZONE_INDEX_REFRESH_SECONDS
+        if stale or self._current_stamp(db) != self._stamp:
+            self.load(db)
+
+    def load(self, db: Session):
+        stamp = self._current_stamp(db)
+        rows = db.execute(
+            select(Zone.zone_id, Zone.city_id, func.ST_AsGeoJSON(Zone.boundary))
+            .where(Zone.boundary.isnot(None))
+        ).all()
+
+        cells: dict[Tuple[int, int], list[_ZoneShape]] = {}
+        for zone_id, city_id, geojson in rows:
+            shape = _ZoneShape(zone_id, city_id, json.loads(geojson)["coordinates"])
+
+            min_lng, min_lat, max_lng, max_lat = shape.bbox
+            lat_lo, lng_lo = _cell(min_lat, min_lng)
+            lat_hi, lng_hi = _cell(max_lat, max_lng)
+            for a in range(lat_lo, lat_hi + 1):
+                for b in range(lng_lo, lng_hi + 1):
+                    cells.setdefault((a, b), []).append(shape)
+
+        # ✅ swap in one assignment; readers never see a half-built index
+        with self._lock:
+            self._cells = cells
+            self.zone_count = len(rows)
+            self.loaded_at = time.time()
+            self._stamp = stamp
+
+    def ensure_loaded(self, db: Session):
+        if not self.is_warm:
+            self.load(db)
+
+    def locate(self, lat: float, lng: float) -> Optional[Tuple[int, int]]:
+        """
+        Returns (city_id, zone_id) or None
+        """
+        for shape in self._cells.get(_cell(lat, lng), ()):
+            if shape.contains(lat, lng):
+                return shape.city_id, shape.zone_id
+        return None
+
+    def find_zone_id(self, lat: float, lng: float) -> Optional[int]:
+        found = self.locate(lat, lng)
+        return found[1] if found else None
+
+
+zone_index = ZoneIndex()
+
+
+def _refresh_zone_index():
+    db = SessionLocal()
+    try:
+        zone_index.refresh_if_changed(db)
+    finally:
+        db.close()
+
+
+register_worker("zone_index", settings.ZONE_INDEX_POLL_SECONDS, _refresh_zone_index)
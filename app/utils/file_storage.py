@@ -1,20 +1,95 @@
+import hashlib
 import os
 import uuid
+from dataclasses import dataclass
+from typing import Optional
+
+import anyio
 from fastapi import UploadFile
 from app.core.config import settings
 
 
-def save_upload_file(file: UploadFile, folder: str) -> str:
-    base_dir = settings.UPLOAD_BASE
+class UploadTooLarge(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class StoredFile:
+    path: str     # relative to the app root, e.g. uploads/blobs/ab/<sha256>.pdf
+    sha256: str   # hex digest of the content
+    size: int
+    created: bool  # False when identical content was already on disk
+
+
+BLOB_FOLDER = "blobs"
+THUMBNAIL_FOLDER = "thumbs"
+
+
+def blob_path(sha256: str, ext: str) -> str:
+    # two-level fan-out keeps directories small
+    return os.path.join(settings.UPLOAD_BASE, BLOB_FOLDER, sha256[:2], f"{sha256}{ext}")
+
+
+def thumbnail_path(sha256: str) -> str:
+    return os.path.join(settings.UPLOAD_BASE, THUMBNAIL_FOLDER, sha256[:2], f"{sha256}.jpg")
+
+
+def _remove_quietly(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _publish(tmp_path: str, final_path: str) -> bool:
+    os.makedirs(os.path.dirname(final_path), exist_ok=True)
+    try:
+        # same bytes already stored: keep the existing file, and mark it
+        # recently used so the orphan sweep leaves it to this upload
+        os.utime(final_path)
+    except FileNotFoundError:
+        pass
+    else:
+        os.remove(tmp_path)
+        return False
+    os.replace(tmp_path, final_path)
+    return True
+
+
+async def save_upload_file(file: UploadFile, max_bytes: Optional[int] = None) -> StoredFile:
+    """
+    Streams the upload to disk in UPLOAD_CHUNK_SIZE pieces with async file
+    I/O, hashing as it goes, then moves it to its content address
+    (blob_path). Identical content is stored once.
+    Raises UploadTooLarge once more than max_bytes have been read.
+    """
+    max_bytes = max_bytes or settings.UPLOAD_MAX_BYTES
+    tmp_dir = os.path.join(settings.UPLOAD_BASE, BLOB_FOLDER, ".tmp")
+    await anyio.to_thread.run_sync(lambda: os.makedirs(tmp_dir, exist_ok=True))
+
+    ext = os.path.splitext(file.filename or "")[-1].lower()
+    tmp_path = os.path.join(tmp_dir, f"{uuid.uuid4().hex}.part")
 
-    os.makedirs(os.path.join(base_dir, folder), exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
 
-    ext = os.path.splitext(file.filename)[-1]
-    safe_name = f"{uuid.uuid4().hex}{ext}"
+    try:
+        async with await anyio.open_file(tmp_path, "wb") as out:
+            while chunk := await file.read(settings.UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(f"File exceeds {max_bytes} bytes")
+                digest.update(chunk)
+                await out.write(chunk)
 
-    relative_path = os.path.join(base_dir, folder, safe_name)
+            await out.flush()
+            await anyio.to_thread.run_sync(os.fsync, out.wrapped.fileno())
 
-    with open(relative_path, "wb") as f:
-        f.write(file.file.read())
+        sha256 = digest.hexdigest()
+        final_path = blob_path(sha256, ext)
+        created = await anyio.to_thread.run_sync(_publish, tmp_path, final_path)
+    except BaseException:
+        await anyio.to_thread.run_sync(_remove_quietly, tmp_path)
+        raise
 
-    return relative_path
+    return StoredFile(path=final_path, sha256=sha256, size=size, created=created)
@@ -7,7 +7,8 @@ def create_access_token(data: dict):
     expire = datetime.utcnow() + timedelta(
         minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
     )
-    to_encode.update({"exp": expire})
+    # ✅ epoch lets stateless auth invalidate every outstanding token at once
+    to_encode.update({"exp": expire, "epoch": settings.AUTH_SESSION_EPOCH})
     return jwt.encode(
         to_encode,
         settings.JWT_SECRET_KEY,
@@ -24,4 +25,56 @@ def decode_access_token(token: str) -> dict:
         )
         return payload
     except JWTError:
-        return {}
\ No newline at end of file
+        return {}
+
+
+# =========================================================
+# ✅ Signed fare quotes (accepted back by /trips/request)
+# =========================================================
+def create_quote_token(data: dict) -> tuple[str, datetime]:
+    to_encode = data.copy()
+    expire = datetime.utcnow() + timedelta(
+        minutes=settings.QUOTE_TOKEN_EXPIRE_MINUTES
+    )
+    to_encode.update({"exp": expire, "typ": "quote"})
+    token = jwt.encode(
+        to_encode,
+        settings.JWT_SECRET_KEY,
+        algorithm=settings.JWT_ALGORITHM
+    )
+    return token, expire
+
+
+def decode_quote_token(token: str) -> dict:
+    payload = decode_access_token(token)
+    if payload.get("typ") != "quote":
+        return {}
+    return payload
+
+
+# =========================================================
+# ✅ Refresh tokens (exchanged at /auth/refresh, never sent to other routes)
+# =========================================================
+def create_refresh_token(data: dict) -> tuple[str, datetime]:
+    to_encode = data.copy()
+    expire = datetime.utcnow() + timedelta(
+        days=settings.REFRESH_TOKEN_EXPIRE_DAYS
+    )
+    to_encode.update({"exp": expire, "typ": "refresh"})
+    token = jwt.encode(
+        to_encode,
+        settings.JWT_SECRET_KEY,
+        algorithm=settings.JWT_ALGORITHM
+    )
+    return token, expire
+
+
+def decode_refresh_token(token: str) -> dict:
+    payload = decode_access_token(token)
+    if payload.get("typ") != "refresh":
+        return {}
+    return payload
+
+
+def is_current_epoch(payload: dict) -> bool:
+    return payload.get("epoch") == settings.AUTH_SESSION_EPOCH
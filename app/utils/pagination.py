@@ -0,0 +1,138 @@
+import base64
+import json
+from datetime import date, datetime, time
+from typing import Literal, Optional, Sequence
+
+from fastapi import HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+STREAM_BATCH_SIZE = 500
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+# =========================================================
+# ✅ Opaque cursors: base64(JSON of the last row's sort key)
+# =========================================================
+_TEMPORAL = {"dt": datetime, "d": date, "t": time}
+
+
+def _encode_value(value):
+    # datetime before date: datetime is a date subclass
+    for tag, kind in _TEMPORAL.items():
+        if isinstance(value, kind):
+            return {tag: value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict) and len(value) == 1:
+        tag, raw = next(iter(value.items()))
+        if tag in _TEMPORAL:
+            return _TEMPORAL[tag].fromisoformat(raw)
+    return value
+
+
+def encode_cursor(values: Sequence) -> str:
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = [_decode_value(v) for v in json.loads(raw)]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+class PageParams:
+    """
+    Query params shared by list endpoints: ?cursor=&limit=&format=json|ndjson
+    """
+
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(None, description=f"Value of the previous page's {NEXT_CURSOR_HEADER} header"),
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        format: Literal["json", "ndjson"] = Query("json", description="ndjson streams every row from the cursor on"),
+    ):
+        self.cursor = cursor
+        self.limit = limit
+        self.format = format
+
+
+def _key_values(obj, keys) -> list:
+    # entity rows expose the key columns as attributes; single-column
+    # selects (e.g. ids) are the value itself
+    if len(keys) == 1 and not hasattr(obj, keys[0].key):
+        return [obj]
+    return [getattr(obj, col.key) for col in keys]
+
+
+def _serialize(obj, schema: Optional[type[BaseModel]]) -> str:
+    if schema is None:
+        return json.dumps(_encode_value(obj))
+    return schema.model_validate(obj).model_dump_json()
+
+
+# =========================================================
+# ✅ Keyset pagination
+# =========================================================
+def paginate(
+    db: Session,
+    stmt,
+    keys: Sequence,
+    page: PageParams,
+    response: Response,
+    schema: Optional[type[BaseModel]] = None,
+    descending: bool = False,
+):
+    """
+    `keys` must be a unique, stable sort key (end with the primary key).
+    Applies ORDER BY keys + WHERE (keys) > cursor, so every page is an
+    index range scan instead of OFFSET.
+
+    format=json   -> one page (list), X-Next-Cursor header if more rows exist
+    format=ndjson -> streams all remaining rows from a server-side cursor
+    """
+    keys = list(keys)
+    stmt = stmt.order_by(*[k.desc() if descending else k.asc() for k in keys])
+
+    if page.cursor:
+        values = decode_cursor(page.cursor, len(keys))
+        key_tuple, value_tuple = tuple_(*keys), tuple_(*values)
+        stmt = stmt.where(key_tuple < value_tuple if descending else key_tuple > value_tuple)
+
+    if page.format == "ndjson":
+        return StreamingResponse(_stream_ndjson(stmt, schema), media_type="application/x-ndjson")
+
+    rows = db.execute(stmt.limit(page.limit + 1)).scalars().all()
+
+    if len(rows) > page.limit:
+        rows = rows[:page.limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(_key_values(rows[-1], keys))
+
+    return rows
+
+
+def _stream_ndjson(stmt, schema: Optional[type[BaseModel]]):
+    # own session: the request-scoped one is closed before the body is sent
+    db = SessionLocal()
+    try:
+        result = db.execute(stmt.execution_options(yield_per=STREAM_BATCH_SIZE)).scalars()
+        for obj in result:
+            yield _serialize(obj, schema) + "\n"
+    finally:
+        db.close()
@@ -0,0 +1,74 @@
+import os
+import re
+from urllib.parse import quote
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from app.core.config import settings
+from app.utils.file_storage import BLOB_FOLDER, THUMBNAIL_FOLDER
+
+_CONTENT_ADDRESSED = re.compile(r"^([0-9a-f]{64})(\.[A-Za-z0-9]+)?$")
+
+# blob / thumbnail names never change content: cache forever
+IMMUTABLE_CACHE = f"private, max-age={settings.UPLOADS_CACHE_MAX_AGE}, immutable"
+# older uuid-named files: always revalidate (cheap 304 via ETag)
+REVALIDATE_CACHE = "private, no-cache"
+
+
+class UploadStaticFiles(StaticFiles):
+    """
+    /uploads with content-hash ETags and cache headers.
+
+    - uploads/blobs/..., uploads/thumbs/...: strong ETag = SHA-256 from the
+      file name, immutable caching
+    - anything else: Starlette's stat-based ETag, revalidated every time
+    - If-None-Match / If-Modified-Since -> 304, Range requests and
+      http.response.pathsend (zero-copy) come from FileResponse
+    - UPLOADS_ACCEL_REDIRECT_PREFIX set: reply with X-Accel-Redirect and let
+      nginx send the bytes
+    """
+
+    def _relative(self, full_path) -> str:
+        return os.path.relpath(full_path, os.path.realpath(self.directory)).replace(os.sep, "/")
+
+    def _cache_headers(self, relative: str) -> tuple[str | None, str]:
+        folder, _, name = relative.partition("/")
+        match = _CONTENT_ADDRESSED.match(os.path.basename(name))
+
+        if folder in (BLOB_FOLDER, THUMBNAIL_FOLDER) and match:
+            suffix = "-thumb" if folder == THUMBNAIL_FOLDER else ""
+            return f'"{match.group(1)}{suffix}"', IMMUTABLE_CACHE
+        return None, REVALIDATE_CACHE
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        relative = self._relative(full_path)
+        etag, cache_control = self._cache_headers(relative)
+
+        response = FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+        if etag:
+            response.headers["etag"] = etag
+        response.headers["cache-control"] = cache_control
+
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+
+        if settings.UPLOADS_ACCEL_REDIRECT_PREFIX:
+            headers = {
+                key: response.headers[key]
+                for key in ("etag", "cache-control", "last-modified", "content-type")
+                if key in response.headers
+            }
+            headers["x-accel-redirect"] = settings.UPLOADS_ACCEL_REDIRECT_PREFIX.rstrip("/") + "/" + quote(relative)
+            return Response(status_code=status_code, headers=headers)
+
+        return response
@@ -0,0 +1,21 @@
+import os
+
+# kept import-light: runs inside the thumbnail process pool workers
+
+
+def render_thumbnail(src: str, dst: str, size: int) -> str:
+    """
+    Writes a JPEG preview no larger than size x size. Returns dst.
+    Pillow is only needed here, in the worker processes.
+    """
+    from PIL import Image
+
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    tmp = f"{dst}.part"
+
+    with Image.open(src) as img:
+        img.thumbnail((size, size))
+        img.convert("RGB").save(tmp, "JPEG", quality=80, optimize=True)
+
+    os.replace(tmp, dst)
+    return dst